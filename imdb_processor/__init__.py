@@ -0,0 +1,43 @@
+# Пакет импортируется без pandas/numpy/requests: классы загружаются при первом обращении
+
+__version__ = "0.2.0"
+
+_EXPORTS = {
+    "FileManager": "files",
+    "DataReader": "reader",
+    "ParallelTSVReader": "reader",
+    "ExternalJoiner": "external",
+    "ExternalSorter": "external",
+    "SharedFrame": "shared",
+    "map_shared_frame": "shared",
+    "compact_titles": "titles",
+    "restore_titles": "titles",
+    "GenreIndex": "processor",
+    "YearIndex": "processor",
+    "DataProcessor": "processor",
+    "AggregateCube": "cube",
+    "EpisodeRollup": "episodes",
+    "AsyncWriter": "writer",
+    "ParallelCSVWriter": "writer",
+    "BackgroundLoader": "background",
+    "get_engine": "engines",
+    "SnapshotStore": "snapshots",
+    "SQLiteDataset": "sqlstore",
+    "SamplePreview": "preview",
+    "ArrowIPCServer": "ipc",
+    "ArrowIPCClient": "ipc",
+    "write_ipc_file": "ipc",
+    "IMDBDataPipeline": "pipeline",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,71 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+class BackgroundLoader:
+    """
+    Загрузка данных в фоновом потоке, пока пользователь отвечает на первые вопросы меню.
+    load(progress) выполняется сразу; progress(num_bytes, total_bytes) сообщает о разобранных байтах.
+    result() - ожидание будущего результата: пока загрузка идет, выводится строка прогресса
+    (процент, если загрузка сообщает объем, иначе прошедшее время); ошибка загрузки поднимается здесь.
+    """
+
+    def __init__(self, load, interval=0.25, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.done_bytes = 0
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._finished = None
+        self._reported = False
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="imdb-loader")
+        self.future = pool.submit(self._load, load)
+        pool.shutdown(wait=False)
+
+    def _load(self, load):
+        try:
+            return load(self.progress)
+        finally:
+            self._finished = time.perf_counter()
+
+    def progress(self, num_bytes, total_bytes):
+        with self._lock:
+            self.done_bytes += num_bytes
+            self.total_bytes = total_bytes
+
+    def status(self):
+        elapsed = (self._finished or time.perf_counter()) - self._started
+        with self._lock:
+            done, total = self.done_bytes, self.total_bytes
+        if not total:
+            return f"Загрузка данных: {elapsed:.1f} с"
+        # 100% - только после объединения и индексов, а не после разбора последней части
+        share = 1.0 if self.future.done() else min(done / total, 0.99)
+        return (f"Загрузка данных: {share:.0%} ({done / 1024 / 1024:.1f} из {total / 1024 / 1024:.1f} MB), "
+                f"{elapsed:.1f} с")
+
+    def result(self):
+        if self._reported:
+            return self.future.result()
+        self._reported = True
+        if self.future.done():
+            print(self.status(), file=self.stream, flush=True)
+        else:
+            # В терминале строка обновляется на месте, в файл или канал выводится один раз
+            interactive = self.stream.isatty()
+            if not interactive:
+                print("Ожидание загрузки данных...", file=self.stream, flush=True)
+            while True:
+                try:
+                    self.future.result(timeout=self.interval)
+                    break
+                except TimeoutError:
+                    if interactive:
+                        print("\r" + self.status(), end="", file=self.stream, flush=True)
+                except Exception:
+                    break
+            print(("\r" if interactive else "") + self.status(), file=self.stream, flush=True)
+        return self.future.result()
@@ -0,0 +1,463 @@
+import argparse
+import os
+
+from . import __version__, config
+
+# Команды импортируют pandas/requests только внутри обработчиков: --help и справочные
+# команды не должны платить за загрузку тяжелых библиотек (см. bench.IMPORT_TIME_BUDGET_MS)
+
+
+def cmd_run(args):
+    from .engines import get_engine
+    from .memory import MemoryBudget
+    from .pipeline import IMDBDataPipeline
+
+    budget = MemoryBudget.parse(args.max_memory) if args.max_memory else None
+    pipeline = IMDBDataPipeline(args.raw, args.result, config.URLS, config.EXTRA_URLS, args.memory_budget_mb,
+                                budget, get_engine(args.engine), args.format)
+    try:
+        return _run_pipeline(pipeline, args)
+    finally:
+        if budget is not None:
+            budget.report()
+
+
+def _run_pipeline(pipeline, args):
+    if args.pipelined and pipeline.budget is None:
+        pipeline.run(pipeline.update_and_load())
+        return 0
+    if args.pipelined:
+        # Конвейер разбирает данные прямо в память и не может перейти на чтение порциями
+        print("С --max-memory конвейерный режим не используется: файлы загружаются, затем читаются в бюджете.")
+        pipeline.update_data(ask=False)
+    elif not args.skip_update:
+        pipeline.update_data()
+    if args.preview and not pipeline.preview():
+        return 0
+    pipeline.run()
+    return 0
+
+
+def cmd_update(args):
+    from .pipeline import IMDBDataPipeline
+
+    pipeline = IMDBDataPipeline(args.raw, config.RESULT_FOLDER, config.URLS, config.EXTRA_URLS)
+    pipeline.update_data(ask=False, include_extra=args.extra)
+    if args.snapshot:
+        from .snapshots import SnapshotStore
+
+        print(f"Снимок {SnapshotStore(args.snapshots).add(args.raw)['date']} сохранен в {args.snapshots}.")
+    return 0
+
+
+def cmd_silver(args):
+    from .layers import bronze_to_silver
+
+    bronze_to_silver(args.bronze, args.silver)
+    return 0
+
+
+def cmd_transform(args):
+    from .layers import transform
+
+    transform(args.bronze, args.result, args.min_votes)
+    return 0
+
+
+def cmd_search(args):
+    from .search import TitleSearchIndex
+
+    results = TitleSearchIndex.open_or_build(args.raw).search(" ".join(args.query), args.limit)
+    print(results.to_string(index=False) if len(results) else "Ничего не найдено.")
+    return 0
+
+
+def cmd_cube(args):
+    from .cube import AggregateCube
+
+    where, by = {}, list(args.by)
+    if args.genre and len(args.genre) > 1 and 'genre' not in by:
+        # Несколько жанров без группировки по жанру посчитали бы титул несколько раз
+        by.append('genre')
+    if args.type:
+        where['titleType'] = args.type
+    if args.genre:
+        where['genre'] = args.genre
+    if args.years:
+        where['startYear'] = tuple(args.years)
+    cube = AggregateCube.open_or_build(args.raw)
+    print(cube.query(by, where, args.min_votes).to_string(index=False))
+    return 0
+
+
+def cmd_episodes(args):
+    import time
+
+    from .episodes import EpisodeRollup
+    from .processor import DataProcessor
+    from .reader import DataReader
+
+    data = DataReader.load_data(args.raw)
+    episodes = EpisodeRollup.load_episodes(os.path.join(args.raw, "title_episode.tsv"))
+    start = time.perf_counter()
+    series, seasons = EpisodeRollup.build(episodes, data, args.min_votes)
+    print(f"Эпизодов: {len(episodes)}, сериалов: {len(series)}, сезонов: {len(seasons)}; "
+          f"сводки за {time.perf_counter() - start:.2f} с")
+    os.makedirs(args.result, exist_ok=True)
+    processor = DataProcessor(args.result)
+    processor.save_to_csv(series, "series_rollup.csv")
+    processor.save_to_csv(seasons, "season_rollup.csv")
+    print(series.nlargest(args.limit, 'numVotes').to_string(index=False))
+    return 0
+
+
+def cmd_top(args):
+    from .processor import DataProcessor
+    from .reader import DataReader
+
+    if not 0.1 <= args.level <= 99.9:
+        print("Неверный уровень: ожидается значение от 0.1 до 99.9.")
+        return 2
+    os.makedirs(args.result, exist_ok=True)
+    top_records = DataReader.load_top_records(args.raw, args.level, args.type)
+    filename = f"top_{args.level}_percent_{args.type or 'all_types'}.csv"
+    DataProcessor(args.result).save_to_csv(top_records, filename)
+    print(f"Найдено {len(top_records)} записей ТОП-{args.level} для типа {args.type or 'all_types'}.")
+    return 0
+
+
+def cmd_grouped(args):
+    from .processor import DataProcessor
+    from .reader import DataReader
+
+    processor = DataProcessor(args.result, min_votes=args.min_votes)
+    result = processor.get_grouped_top(DataReader.load_data(args.raw), args.by, top_n=args.top_n,
+                                       top_level=args.top_level, rank_by=args.rank_by)
+    os.makedirs(args.result, exist_ok=True)
+    limit = f"{args.top_n}" if args.top_n is not None else f"{args.top_level}_percent"
+    processor.save_to_csv(result, f"grouped_top_{limit}_by_{'_'.join(args.by)}.csv")
+    print(f"Групп: {result.groupby(args.by).ngroups}, записей: {len(result)}.")
+    return 0
+
+
+def cmd_genres(args):
+    from .processor import DataProcessor
+    from .reader import DataReader
+
+    processor = DataProcessor(args.result)
+    data = DataReader.load_data(args.raw)
+    if args.type:
+        data = processor.filter_by_type(data, args.type)
+    os.makedirs(args.result, exist_ok=True)
+    suffix = f"{'_'.join(args.genres)}_{args.type or 'all_types'}"
+    if args.top is not None:
+        result = processor.get_top_by_genre(data, args.top, args.genres)
+        processor.save_to_csv(result, f"genre_top_{args.top}_{suffix}.csv")
+    else:
+        result = processor.filter_by_genre(data, args.genres, args.mode)
+        processor.save_to_csv(result, f"genre_{args.mode}_{suffix}.csv")
+    print(f"Найдено записей: {len(result)}.")
+    return 0
+
+
+def cmd_years(args):
+    from .processor import DataProcessor
+    from .reader import DataReader
+
+    processor = DataProcessor(args.result)
+    data = DataReader.load_data(args.raw)
+    if args.rollup:
+        print(processor.year_rollup(data, args.rollup, args.type).to_string(index=False))
+        return 0
+    result = processor.filter_by_years(data, args.first, args.last, args.running)
+    if args.type:
+        result = processor.filter_by_type(result, args.type)
+    os.makedirs(args.result, exist_ok=True)
+    span = f"{args.first or ''}-{args.last or ''}"
+    processor.save_to_csv(result, f"years_{span}{'_running' if args.running else ''}_{args.type or 'all_types'}.csv")
+    print(f"Найдено записей: {len(result)}.")
+    return 0
+
+
+def cmd_sql(args):
+    import time
+
+    from .sqlstore import SQLiteDataset
+
+    dataset = SQLiteDataset.open_or_build(args.raw)
+    start = time.perf_counter()
+    result = dataset.query(args.query)
+    print(result.to_string(index=False, max_rows=args.limit))
+    print(f"{len(result)} строк за {(time.perf_counter() - start) * 1000:.1f} мс")
+    return 0
+
+
+def cmd_serve(args):
+    from .engines import get_engine
+    from .ipc import ArrowIPCServer
+    from .processor import DataProcessor
+    from .reader import DataReader
+    from .titles import compact_titles
+
+    engine = get_engine(args.engine)
+    processor = DataProcessor(config.RESULT_FOLDER)
+    processor.engine = engine
+    data = DataReader.load_data(args.raw, engine=engine)
+    if processor.is_frame(data):
+        # Данные сервера хранятся компактно, ipc восстанавливает originalTitle в каждом ответе
+        data = compact_titles(data)
+    server = ArrowIPCServer(data, processor, args.address)
+    message = f"Сервер Arrow IPC слушает {args.address} (запросы: all, type:<тип>, top:<уровень>[:<тип>])."
+    try:
+        server.serve(args.max_requests, ready=lambda: print(message, flush=True))
+    except KeyboardInterrupt:
+        print("Сервер остановлен.")
+    return 0
+
+
+def cmd_fetch(args):
+    import time
+
+    from .ipc import ArrowIPCClient
+
+    client = ArrowIPCClient(args.address)
+    start = time.perf_counter()
+    table = client.read_file(args.query) if args.file else client.fetch(args.query)
+    seconds = time.perf_counter() - start
+    print(table.slice(0, args.limit).to_pandas().to_string(index=False))
+    print(f"{table.num_rows} строк, {table.nbytes / 1024 / 1024:.1f} MB за {seconds * 1000:.1f} мс")
+    return 0
+
+
+def cmd_snapshot(args):
+    from .snapshots import SnapshotStore
+
+    store = SnapshotStore(args.snapshots)
+    if args.action == "add":
+        snapshot = store.add(args.raw, args.date)
+        for group, stats in snapshot["groups"].items():
+            print(f"{snapshot['date']} {group}: {stats['rows']} строк, изменено {stats['upserts']}, "
+                  f"удалено {stats['deletes']}")
+    elif args.action == "list":
+        for snapshot in store.meta["snapshots"]:
+            print(snapshot["date"] + "  " + ", ".join(f"{group}: +{stats['upserts']} -{stats['deletes']}"
+                                                     for group, stats in snapshot["groups"].items()))
+        stored, full = store.storage()
+        if full:
+            print(f"На диске {stored / 1024 / 1024:.1f} MB против {full / 1024 / 1024:.1f} MB полных копий "
+                  f"({stored / full:.0%}).")
+    elif args.action == "restore":
+        for path in store.restore(args.date, args.to):
+            print(f"Восстановлен файл: {path}")
+    elif args.action == "diff":
+        changes = store.rating_changes(args.first, args.second)
+        print(f"Изменились рейтинг или голоса у {len(changes)} титулов.")
+        shown = changes.head(args.top)
+        titles = store.as_of(args.second, "title_basics", shown['tconst'])[['tconst', 'primaryTitle']]
+        print(shown.merge(titles, on='tconst', how='left').to_string(index=False))
+    return 0
+
+
+def cmd_datasets(args):
+    for name, url in {**config.URLS, **config.EXTRA_URLS}.items():
+        path = os.path.join(args.raw, f"{name}.tsv")
+        state = f"{os.path.getsize(path) / 1024 / 1024:.1f} MB" if os.path.exists(path) else "не загружен"
+        print(f"{name:<18} {state:<12} {url}")
+    return 0
+
+
+def cmd_bench(args):
+    from . import bench
+
+    return bench.run(args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="imdb-processor", description="Обработка открытых наборов данных IMDb.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    run = commands.add_parser("run", help="интерактивная обработка: загрузка, фильтры, ТОП файлы")
+    run.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    run.add_argument("--result", default=config.RESULT_FOLDER, help="папка результатов")
+    run.add_argument("--memory-budget-mb", type=int, default=config.MEMORY_BUDGET_MB,
+                     help="бюджет памяти для внешних соединений")
+    run.add_argument("--max-memory", help="бюджет памяти процесса (например 2G, 512M): размер порций, "
+                                           "внешние соединения и чтение с диска, если данные не помещаются")
+    run.add_argument("--engine", choices=["pandas", "pyarrow", "arrow", "sqlite"], default="pandas",
+                     help="движок: pandas (парсер C), pyarrow (многопоточный разбор Arrow), arrow (вычисления Arrow), "
+                          "sqlite (запросы к индексированной базе Raw/imdb.sqlite)")
+    run.add_argument("--skip-update", action="store_true", help="не предлагать обновление исходных файлов")
+    run.add_argument("--pipelined", action="store_true",
+                     help="загрузить, распаковать и разобрать файлы одновременно (всегда обновляет Raw/)")
+    run.add_argument("--format", choices=["csv", "arrow"], default="csv",
+                     help="формат файлов результатов: csv или arrow (Arrow IPC для чтения через memory_map)")
+    run.add_argument("--preview", action="store_true",
+                     help="до полной загрузки оценить по выборке число записей и порог ТОП, затем предложить "
+                          "точную обработку (без --pipelined)")
+    run.set_defaults(handler=cmd_run)
+
+    update = commands.add_parser("update", help="загрузить и распаковать исходные файлы без вопросов")
+    update.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    update.add_argument("--extra", action="store_true", help="загрузить также principals, akas, name.basics и title.episode")
+    update.add_argument("--snapshot", action="store_true", help="сохранить загруженные файлы как снимок на сегодня")
+    update.add_argument("--snapshots", default=config.SNAPSHOT_FOLDER, help="папка снимков")
+    update.set_defaults(handler=cmd_update)
+
+    silver = commands.add_parser("silver", help="bronze TSV -> silver CSV (IMDB-1)")
+    silver.add_argument("--bronze", default=config.BRONZE_FOLDER)
+    silver.add_argument("--silver", default=config.SILVER_FOLDER)
+    silver.set_defaults(handler=cmd_silver)
+
+    transform = commands.add_parser("transform", help="фильмы, эпизоды и ТОП-30 из bronze (IMDB-2)")
+    transform.add_argument("--bronze", default=config.BRONZE_FOLDER)
+    transform.add_argument("--result", default=config.TRANSFORM_FOLDER)
+    transform.add_argument("--min-votes", type=int, default=25000, help="m во взвешенном рейтинге")
+    transform.set_defaults(handler=cmd_transform)
+
+    search = commands.add_parser("search", help="поиск названий по словам (индекс строится при первом вызове)")
+    search.add_argument("query", nargs="+", help="слова названия; последнее может быть началом слова")
+    search.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    search.add_argument("--limit", type=int, default=10)
+    search.set_defaults(handler=cmd_search)
+
+    cube = commands.add_parser("cube", help="сводки по типу, году и жанру из куба агрегатов")
+    cube.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    cube.add_argument("--by", nargs="*", default=["titleType"], choices=["titleType", "startYear", "decade", "genre"],
+                      help="измерения группировки")
+    cube.add_argument("--type", nargs="+", help="отбор по titleType")
+    cube.add_argument("--genre", nargs="+", help="отбор по жанрам")
+    cube.add_argument("--years", nargs=2, type=int, metavar=("FIRST", "LAST"), help="диапазон startYear")
+    cube.add_argument("--min-votes", type=int, default=25000, help="m во взвешенном рейтинге")
+    cube.set_defaults(handler=cmd_cube)
+
+    episodes = commands.add_parser("episodes", help="сводки по сериалам и сезонам (нужен title_episode.tsv)")
+    episodes.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    episodes.add_argument("--result", default=config.RESULT_FOLDER, help="папка результатов")
+    episodes.add_argument("--min-votes", type=int, default=25000, help="m во взвешенном рейтинге")
+    episodes.add_argument("--limit", type=int, default=10, help="сколько сериалов показать")
+    episodes.set_defaults(handler=cmd_episodes)
+
+    top = commands.add_parser("top", help="ТОП файл без загрузки всех данных (поздняя материализация)")
+    top.add_argument("level", type=float, help="ТОП уровень, от 0.1 до 99.9")
+    top.add_argument("--type", help="titleType; по умолчанию все типы")
+    top.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    top.add_argument("--result", default=config.RESULT_FOLDER, help="папка результатов")
+    top.set_defaults(handler=cmd_top)
+
+    grouped = commands.add_parser("grouped", help="ТОП-N или ТОП-процент внутри каждой группы (тип, жанр, десятилетие)")
+    grouped.add_argument("by", nargs="+", choices=["titleType", "genre", "decade"], help="ключи группировки")
+    grouped_limit = grouped.add_mutually_exclusive_group(required=True)
+    grouped_limit.add_argument("--top-n", type=int, help="сколько записей в каждой группе")
+    grouped_limit.add_argument("--top-level", type=float, help="процент записей каждой группы")
+    grouped.add_argument("--rank-by", choices=["weightedRating", "averageRating"], default="weightedRating")
+    grouped.add_argument("--min-votes", type=int, default=25000, help="m во взвешенном рейтинге")
+    grouped.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    grouped.add_argument("--result", default=config.RESULT_FOLDER, help="папка результатов")
+    grouped.set_defaults(handler=cmd_grouped)
+
+    genres = commands.add_parser("genres", help="отбор по жанрам (индекс жанров) или ТОП-N каждого жанра")
+    genres.add_argument("genres", nargs="+", help="жанры, например Drama Romance")
+    genres.add_argument("--mode", choices=["any", "all"], default="any",
+                        help="any - хотя бы один из жанров, all - все жанры")
+    genres.add_argument("--top", type=int, help="вместо отбора - ТОП-N по рейтингу для каждого жанра")
+    genres.add_argument("--type", help="titleType; по умолчанию все типы")
+    genres.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    genres.add_argument("--result", default=config.RESULT_FOLDER, help="папка результатов")
+    genres.set_defaults(handler=cmd_genres)
+
+    years = commands.add_parser("years", help="отбор по диапазону лет (индекс годов) или сводка по годам")
+    years.add_argument("--from", dest="first", type=int, help="первый год диапазона")
+    years.add_argument("--to", dest="last", type=int, help="последний год диапазона")
+    years.add_argument("--running", action="store_true", help="сериалы, выходившие хотя бы в один год диапазона")
+    years.add_argument("--rollup", choices=["decade", "year"],
+                       help="вместо отбора - число титулов и средний рейтинг по годам или десятилетиям")
+    years.add_argument("--type", help="titleType; по умолчанию все типы")
+    years.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    years.add_argument("--result", default=config.RESULT_FOLDER, help="папка результатов")
+    years.set_defaults(handler=cmd_years)
+
+    sql = commands.add_parser("sql", help="запрос SQL к объединенным данным (база Raw/imdb.sqlite, таблица titles)")
+    sql.add_argument("query", help='например: SELECT titleType, COUNT(*) FROM titles GROUP BY titleType')
+    sql.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    sql.add_argument("--limit", type=int, default=50, help="сколько строк результата показать")
+    sql.set_defaults(handler=cmd_sql)
+
+    serve = commands.add_parser("serve", help="сервер результатов: отбор и ТОП потоком Arrow IPC через сокет")
+    serve.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    serve.add_argument("--address", default=config.IPC_ADDRESS, help="путь сокета Unix или host:port")
+    serve.add_argument("--engine", choices=["pandas", "pyarrow", "arrow", "sqlite"], default="pandas")
+    serve.add_argument("--max-requests", type=int, help="завершить после стольких запросов")
+    serve.set_defaults(handler=cmd_serve)
+
+    fetch = commands.add_parser("fetch", help="клиент Arrow IPC: запрос к серверу результатов или чтение файла .arrow")
+    fetch.add_argument("query", help="all, type:movie, top:10:movie или путь к файлу .arrow (с --file)")
+    fetch.add_argument("--address", default=config.IPC_ADDRESS, help="путь сокета Unix или host:port")
+    fetch.add_argument("--file", action="store_true", help="query - файл .arrow, читается через memory_map")
+    fetch.add_argument("--limit", type=int, default=10, help="сколько строк показать")
+    fetch.set_defaults(handler=cmd_fetch)
+
+    snapshot = commands.add_parser("snapshot", help="версии исходных файлов по датам: изменения вместо копий")
+    snapshot.add_argument("--snapshots", default=config.SNAPSHOT_FOLDER, help="папка снимков")
+    snapshot.set_defaults(handler=cmd_snapshot)
+    snapshot_commands = snapshot.add_subparsers(dest="action", metavar="action", required=True)
+    snapshot_add = snapshot_commands.add_parser("add", help="сохранить текущие исходные файлы как снимок")
+    snapshot_add.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    snapshot_add.add_argument("--date", help="дата снимка YYYY-MM-DD, по умолчанию сегодня")
+    snapshot_commands.add_parser("list", help="снимки и занимаемое место")
+    snapshot_restore = snapshot_commands.add_parser("restore", help="исходные файлы на дату")
+    snapshot_restore.add_argument("date", help="YYYY-MM-DD: последний снимок не позже этой даты")
+    snapshot_restore.add_argument("--to", default=config.RAW_FOLDER, help="папка для восстановленных файлов")
+    snapshot_diff = snapshot_commands.add_parser("diff", help="изменения рейтингов и голосов между датами")
+    snapshot_diff.add_argument("first")
+    snapshot_diff.add_argument("second")
+    snapshot_diff.add_argument("--top", type=int, default=20, help="сколько титулов показать")
+
+    datasets = commands.add_parser("datasets", help="список наборов данных и их состояние")
+    datasets.add_argument("--raw", default=config.RAW_FOLDER, help="папка исходных файлов")
+    datasets.set_defaults(handler=cmd_datasets)
+
+    bench = commands.add_parser("bench", help="замеры производительности")
+    bench_commands = bench.add_subparsers(dest="bench", metavar="bench", required=True)
+    bench_import = bench_commands.add_parser("import", help="время запуска CLI против бюджета")
+    bench_import.add_argument("--repeat", type=int, default=5)
+    bench_pipeline = bench_commands.add_parser(
+        "pipeline", help="конвейер загрузка/распаковка/разбор против последовательного режима (локальный сервер)")
+    bench_pipeline.add_argument("--rows", type=int, default=300_000)
+    bench_pipeline.add_argument("--rate-mb", type=float, default=5.0, help="скорость локального сервера, MB/s")
+    bench_gzip = bench_commands.add_parser(
+        "gzip", help="распаковка gzip (потоки для многочленных архивов, isal) против gzip.open")
+    bench_gzip.add_argument("--rows", type=int, default=1_000_000)
+    bench_gzip.add_argument("--threads", type=int, default=None)
+    bench_gzip.add_argument("--member-mb", type=int, default=4, help="размер члена в многочленном архиве, MB")
+    bench_csv = bench_commands.add_parser("csv", help="параллельная запись CSV: время и побайтное совпадение")
+    bench_csv.add_argument("--rows", type=int, default=1_000_000)
+    bench_csv.add_argument("--workers", type=int, default=None)
+    bench_engines = bench_commands.add_parser("engines", help="движки pandas, pyarrow и arrow: время и совпадение файлов")
+    bench_engines.add_argument("--rows", type=int, default=1_000_000)
+    bench_engines.add_argument("--top-level", type=float, default=10.0)
+    bench_late = bench_commands.add_parser("late", help="ТОП с поздней материализацией против get_top_records")
+    bench_late.add_argument("--rows", type=int, default=1_000_000)
+    bench_late.add_argument("--top-level", type=float, default=10.0)
+    bench_late.add_argument("--type", default="movie")
+    bench_preview = bench_commands.add_parser("preview", help="оценки по выборке против точных значений и время")
+    bench_preview.add_argument("--rows", type=int, default=1_000_000)
+    bench_preview.add_argument("--top-level", type=float, default=10.0)
+    bench_preview.add_argument("--sample-mb", type=float, default=4)
+    bench_ipc = bench_commands.add_parser("ipc", help="Arrow IPC (файл memory_map и сокет) против записи и чтения CSV")
+    bench_ipc.add_argument("--rows", type=int, default=1_000_000)
+    bench_sqlite = bench_commands.add_parser("sqlite", help="загрузка в SQLite и задержка запросов против pandas")
+    bench_sqlite.add_argument("--rows", type=int, default=1_000_000)
+    bench_sqlite.add_argument("--top-level", type=float, default=10.0)
+    bench.set_defaults(handler=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "handler", None):
+        parser.print_help()
+        return 0
+    return args.handler(args)
@@ -0,0 +1,25 @@
+# Настройки по умолчанию. Модуль не импортирует тяжелые библиотеки: его читает CLI при запуске.
+
+RAW_FOLDER = "Raw"
+RESULT_FOLDER = "Result_ETL"
+MEMORY_BUDGET_MB = 1024
+
+# Папки слоев обработки (bronze -> silver, bronze -> result_transform)
+BRONZE_FOLDER = "bronze"
+SILVER_FOLDER = "silver"
+TRANSFORM_FOLDER = "result_transform"
+# Хранилище версий исходных файлов по датам (вне Raw/, которую cleanup удаляет)
+SNAPSHOT_FOLDER = "Snapshots"
+# Адрес сервера результатов Arrow IPC: путь сокета Unix или host:port
+IPC_ADDRESS = "imdb_results.sock"
+
+URLS = {
+    "title_basics": "https://datasets.imdbws.com/title.basics.tsv.gz",
+    "title_ratings": "https://datasets.imdbws.com/title.ratings.tsv.gz",
+}
+EXTRA_URLS = {
+    "title_principals": "https://datasets.imdbws.com/title.principals.tsv.gz",
+    "title_akas": "https://datasets.imdbws.com/title.akas.tsv.gz",
+    "name_basics": "https://datasets.imdbws.com/name.basics.tsv.gz",
+    "title_episode": "https://datasets.imdbws.com/title.episode.tsv.gz",
+}
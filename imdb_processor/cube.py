@@ -0,0 +1,187 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .files import FileManager
+from .processor import GenreIndex
+
+CUBE_VERSION = 1
+# Ключ ячейки: (код типа + 1) * YEAR_BASE + (год + 1); год -1 - startYear не указан
+YEAR_BASE = 10_000
+
+
+class AggregateCube:
+    """
+    Материализованные агрегаты по titleType x startYear x жанр, построенные один раз для выгрузки.
+    В каждой ячейке хранятся суммы: число титулов, сумма рейтингов, сумма голосов и сумма
+    рейтинг * голоса; из них без обращения к строкам считаются средний, средневзвешенный по голосам
+    и байесовский рейтинг любой свертки. Ячейки с genre = -1 - итоги по всем жанрам, в них
+    титул с несколькими жанрами учтен один раз.
+    """
+
+    MEASURES = ("count", "rating_sum", "votes_sum", "rating_votes_sum")
+    DIMENSIONS = ("type_code", "year", "genre_code")
+
+    def __init__(self, folder, meta, arrays=None):
+        self.folder = folder
+        self.meta = meta
+        self._arrays = arrays
+        self._cells = None
+
+    @staticmethod
+    def source_files(raw_folder):
+        return [os.path.join(raw_folder, "title_basics.tsv"), os.path.join(raw_folder, "title_ratings.tsv")]
+
+    @classmethod
+    def open(cls, folder):
+        try:
+            with open(os.path.join(folder, "meta.json"), encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+        return cls(folder, meta) if meta.get("version") == CUBE_VERSION else None
+
+    @classmethod
+    def open_or_build(cls, raw_folder, data=None, genre_index=None, folder_name="aggregate_cube"):
+        # Куб пересобирается, если исходные файлы изменились после его построения
+        folder = os.path.join(raw_folder, folder_name)
+        fingerprint = FileManager.fingerprint(cls.source_files(raw_folder))
+        cube = cls.open(folder)
+        if cube is not None and cube.meta["fingerprint"] == fingerprint:
+            return cube
+        if data is None:
+            from .reader import DataReader
+
+            data = DataReader.load_data(raw_folder)
+        return cls.build(data, folder, fingerprint, genre_index)
+
+    @classmethod
+    def build(cls, data, folder, fingerprint=None, genre_index=None):
+        genre_index = genre_index or GenreIndex.build(data)
+        type_codes, types = pd.factorize(data['titleType'])
+        years = pd.to_numeric(data['startYear'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+        keys = (type_codes.astype(np.int64) + 1) * YEAR_BASE + years + 1
+        codes, cell_keys = pd.factorize(keys)
+
+        ratings = np.nan_to_num(data['averageRating'].to_numpy(dtype=np.float64))
+        votes = data['numVotes'].to_numpy(dtype=np.float64)
+        weights = {"count": None, "rating_sum": ratings, "votes_sum": votes, "rating_votes_sum": ratings * votes}
+
+        # Одна свертка на все данные (genre = -1) и по одной на каждый жанр по битовой маске
+        masks = genre_index.masks_for(data)
+        selections = [(-1, None)] + [(i, (masks & genre_index.bits[genre]) != 0)
+                                     for i, genre in enumerate(genre_index.genres)]
+        parts = {name: [] for name in cls.DIMENSIONS + cls.MEASURES}
+        for genre_code, selected in selections:
+            selected_codes = codes if selected is None else codes[selected]
+            counts = np.bincount(selected_codes, minlength=len(cell_keys))
+            present = np.flatnonzero(counts)
+            parts["type_code"].append(cell_keys[present] // YEAR_BASE - 1)
+            parts["year"].append(cell_keys[present] % YEAR_BASE - 1)
+            parts["genre_code"].append(np.full(len(present), genre_code))
+            for name, weight in weights.items():
+                if weight is None:
+                    parts[name].append(counts[present])
+                else:
+                    sums = np.bincount(selected_codes, weights=weight if selected is None else weight[selected],
+                                       minlength=len(cell_keys))
+                    parts[name].append(sums[present])
+
+        dtypes = {"type_code": np.int16, "year": np.int16, "genre_code": np.int8, "count": np.int64,
+                  "rating_sum": np.float64, "votes_sum": np.float64, "rating_votes_sum": np.float64}
+        arrays = {name: np.concatenate(values).astype(dtypes[name]) for name, values in parts.items()}
+
+        temp_folder = f"{folder}.tmp"
+        shutil.rmtree(temp_folder, ignore_errors=True)
+        os.makedirs(temp_folder)
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_folder, f"{name}.npy"), array)
+        meta = {"version": CUBE_VERSION, "fingerprint": fingerprint, "rows": len(data),
+                "types": [str(title_type) for title_type in types], "genres": list(genre_index.genres)}
+        with open(os.path.join(temp_folder, "meta.json"), "w", encoding="utf-8") as meta_file:
+            json.dump(meta, meta_file)
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(temp_folder, folder)
+        print(f"Куб агрегатов построен: {len(arrays['count'])} ячеек для {len(data)} строк.")
+        return cls(folder, meta, arrays)
+
+    @property
+    def cells(self):
+        # Ячейки куба как небольшая таблица: десятки тысяч строк вместо миллионов
+        if self._cells is None:
+            arrays = self._arrays or {name: np.load(os.path.join(self.folder, f"{name}.npy"))
+                                      for name in self.DIMENSIONS + self.MEASURES}
+            types = np.array(self.meta["types"] + [None], dtype=object)
+            genres = np.array(self.meta["genres"] + [None], dtype=object)
+            years = pd.array(arrays["year"], dtype="Int64")
+            years[arrays["year"] < 0] = pd.NA
+            self._cells = pd.DataFrame({
+                "titleType": types[arrays["type_code"]],
+                "startYear": years,
+                "decade": years // 10 * 10,
+                "genre": genres[arrays["genre_code"]],
+                "all_genres": arrays["genre_code"] < 0,
+                **{name: arrays[name] for name in self.MEASURES},
+            })
+        return self._cells
+
+    def query(self, by=(), where=None, min_votes=25000):
+        """
+        Свертка куба: by - измерения группировки (titleType, startYear, decade, genre),
+        where - срез: {'titleType': 'movie' или список, 'startYear': 1994 или (1990, 1999),
+        'decade': 1990, 'genre': 'Drama' или список}.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        where = dict(where or {})
+        unknown = set(by) | set(where)
+        unknown -= {"titleType", "startYear", "decade", "genre"}
+        if unknown:
+            raise ValueError(f"Неизвестные измерения куба: {', '.join(sorted(unknown))}")
+
+        cells = self.cells
+        genres = where.pop("genre", None)
+        if isinstance(genres, str):
+            genres = [genres]
+        if "genre" in by or genres is not None:
+            if "genre" not in by and len(genres) > 1:
+                raise ValueError("Титул с несколькими жанрами попадет в сумму несколько раз: "
+                                 "добавьте genre в группировку или укажите один жанр.")
+            cells = cells[~cells["all_genres"]]
+            if genres is not None:
+                cells = cells[cells["genre"].isin(genres)]
+        else:
+            cells = cells[cells["all_genres"]]
+
+        for name, value in where.items():
+            column = cells[name]
+            if isinstance(value, tuple):
+                cells = cells[(column >= value[0]).fillna(False) & (column <= value[1]).fillna(False)]
+            elif isinstance(value, list):
+                cells = cells[column.isin(value)]
+            else:
+                cells = cells[(column == value).fillna(False)]
+
+        if by:
+            totals = cells.groupby(by, dropna=False)[list(self.MEASURES)].sum().reset_index()
+        else:
+            totals = cells[list(self.MEASURES)].sum().to_frame().T
+        return self._measures(totals, by, min_votes)
+
+    def _measures(self, totals, by, min_votes):
+        # Байесовский рейтинг свертки: средневзвешенный по голосам рейтинг группы, сжатый к среднему C
+        overall = self.cells[self.cells["all_genres"]]
+        mean_rating = overall["rating_sum"].sum() / max(overall["count"].sum(), 1)
+        count = totals["count"].astype(np.int64)
+        votes = totals["votes_sum"]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = totals[by].assign(
+                count=count,
+                averageRating=totals["rating_sum"] / count,
+                numVotes=votes.astype(np.int64),
+                voteWeightedRating=totals["rating_votes_sum"] / votes,
+                weightedRating=(totals["rating_votes_sum"] + min_votes * mean_rating) / (votes + min_votes),
+            )
+        return result[result["count"] > 0].reset_index(drop=True)
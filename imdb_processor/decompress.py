@@ -0,0 +1,135 @@
+import gzip
+import mmap
+import os
+import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+try:
+    # Необязательное ускорение: inflate из Intel ISA-L с чтением в отдельном потоке
+    from isal import igzip_threaded
+except ImportError:
+    igzip_threaded = None
+
+# 16 + MAX_WBITS - zlib разбирает заголовок gzip и проверяет CRC32 и длину в конце члена
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class ParallelGzipDecompressor:
+    """
+    Распаковка gzip. Архивы из нескольких членов распаковываются в нескольких потоках:
+    zlib отпускает GIL во время inflate, поэтому потоки работают параллельно.
+
+    Архив из нескольких gzip-членов (bgzip, pigz --independent, склеенные .gz) распаковывается
+    спекулятивно: файл делится на диапазоны, в каждом ищется сигнатура gzip, и от нее члены
+    распаковываются независимо. Результат собирается проходом от начала файла: часть диапазона
+    используется, только если его старт совпал с реальной границей члена, иначе члены распаковываются
+    последовательно. Проверка CRC32 каждого члена гарантирует побайтовое совпадение с gzip.open.
+
+    Архив из одного члена (как все файлы IMDb) параллельно не распаковывается: поток deflate
+    нельзя начать с середины. Для него единственное ускорение - inflate из isal, если он установлен,
+    иначе это обычный gzip.open.
+    """
+
+    MAGIC = b"\x1f\x8b\x08"
+    PROBE_BYTES = 64 * 1024
+
+    def __init__(self, threads=None, block_size=4 * 1024 * 1024):
+        self.threads = threads or os.cpu_count() or 1
+        self.block_size = block_size
+
+    def extract(self, source_path, dest_path):
+        with open(source_path, "rb") as source:
+            if os.fstat(source.fileno()).st_size == 0:
+                raise EOFError(f"Пустой архив: {source_path}")
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:3] != self.MAGIC:
+                    raise ValueError(f"Файл не является gzip архивом: {source_path}")
+                splits = self.member_splits(data)
+                if splits:
+                    self._extract_members(data, splits, dest_path)
+                    return
+        self._extract_stream(source_path, dest_path)
+
+    def member_splits(self, data):
+        # Стартовые позиции для потоков: первая сигнатура после каждой границы диапазона,
+        # от которой действительно распаковываются данные
+        size = len(data)
+        splits = []
+        for k in range(1, self.threads):
+            position = data.find(self.MAGIC, max(size * k // self.threads, splits[-1] + 1 if splits else 1))
+            while position != -1 and not self._looks_like_member(data, position):
+                position = data.find(self.MAGIC, position + 1)
+            if position == -1:
+                break
+            if not splits or position > splits[-1]:
+                splits.append(position)
+        return splits
+
+    def _looks_like_member(self, data, position):
+        try:
+            zlib.decompressobj(GZIP_WBITS).decompress(data[position:position + self.PROBE_BYTES], 1)
+            return True
+        except zlib.error:
+            return False
+
+    def _inflate_members(self, data, position, output, until):
+        # Распаковка членов подряд с позиции position, пока не будет достигнута граница until;
+        # возвращает позицию после последнего распакованного члена
+        size = len(data)
+        while position < until and position < size:
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+            while not decompressor.eof:
+                if position >= size:
+                    raise EOFError("Архив оборвался до конца gzip потока.")
+                block = data[position:position + self.block_size]
+                output.write(decompressor.decompress(block))
+                position += len(block) - len(decompressor.unused_data)
+            # Как и модуль gzip, пропускаем нулевое выравнивание после члена
+            while position < size and data[position] == 0:
+                position += 1
+        return position
+
+    def _extract_members(self, data, splits, dest_path):
+        size = len(data)
+        bounds = splits + [size]
+
+        def speculate(k):
+            part_path = f"{dest_path}.part{k}"
+            try:
+                with open(part_path, "wb") as part:
+                    end = self._inflate_members(data, bounds[k], part, bounds[k + 1])
+                return bounds[k], end, part_path
+            except (zlib.error, EOFError):
+                os.remove(part_path)
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(splits)) as pool:
+            parts = {part[0]: part for part in pool.map(speculate, range(len(splits))) if part}
+        try:
+            with open(dest_path, "wb") as output:
+                # Первый диапазон распаковывается здесь же, затем стыкуются подтвержденные части
+                position = self._inflate_members(data, 0, output, splits[0])
+                while position < size:
+                    if position in parts:
+                        _, end, part_path = parts.pop(position)
+                        with open(part_path, "rb") as part:
+                            shutil.copyfileobj(part, output, self.block_size)
+                        os.remove(part_path)
+                        position = end
+                    else:
+                        next_start = min((start for start in parts if start > position), default=size)
+                        position = self._inflate_members(data, position, output, next_start)
+        finally:
+            for _, _, part_path in parts.values():
+                os.remove(part_path)
+
+    def _extract_stream(self, source_path, dest_path):
+        # Один член не делится между потоками: без isal это обычный gzip.open
+        if igzip_threaded is not None:
+            opener = partial(igzip_threaded.open, threads=1)
+        else:
+            opener = gzip.open
+        with opener(source_path, "rb") as f_in, open(dest_path, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out, self.block_size)
@@ -0,0 +1,151 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .reader import IMDB_TEXT_COLUMNS, DataReader
+from .titles import compact_titles
+
+# Значения, которые pandas по умолчанию читает как пропуск (read_csv, na_values): движки Arrow
+# используют тот же список, чтобы пропуски совпадали
+PANDAS_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+
+def _require_pyarrow(purpose="Движки pyarrow и arrow требуют"):
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(f"{purpose} пакет pyarrow: pip install imdb-processor[arrow]") from None
+    return pyarrow
+
+
+def read_tsv_arrow(path):
+    """
+    Многопоточный разбор TSV IMDb читателем Arrow. Кавычки отключены (как QUOTE_NONE у pandas),
+    текстовые колонки читаются строками, пропуски - по списку pandas.
+    """
+    pa = _require_pyarrow()
+    from pyarrow import csv as pa_csv
+
+    with open(path, encoding="utf-8") as file:
+        names = file.readline().rstrip("\r\n").split("\t")
+    column_types = {name: pa.string() for name in IMDB_TEXT_COLUMNS if name in names}
+    return pa_csv.read_csv(
+        path,
+        parse_options=pa_csv.ParseOptions(delimiter="\t", quote_char=False),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types, null_values=PANDAS_NA_VALUES,
+                                              strings_can_be_null=True, quoted_strings_can_be_null=True),
+    )
+
+
+class PandasEngine:
+    """
+    Движок по умолчанию: разбор парсером C pandas в пуле процессов (ParallelTSVReader), вычисления - pandas.
+    """
+
+    name = "pandas"
+    needs_pyarrow = False
+
+    def load(self, raw_folder):
+        return DataReader.load_data(raw_folder)
+
+    def is_native(self, data):
+        # Данные в формате движка, которые DataProcessor передает ему, а не обрабатывает как DataFrame
+        return False
+
+
+class PyArrowParserEngine(PandasEngine):
+    """
+    Разбор многопоточным читателем Arrow, дальше обычный DataFrame pandas.
+    pd.read_csv(engine="pyarrow") не поддерживает quoting, а в названиях IMDb встречаются
+    непарные кавычки, поэтому читатель Arrow вызывается напрямую с отключенными кавычками.
+    """
+
+    name = "pyarrow"
+    needs_pyarrow = True
+
+    def load(self, raw_folder):
+        basics_df = read_tsv_arrow(os.path.join(raw_folder, "title_basics.tsv")).to_pandas()
+        ratings_df = read_tsv_arrow(os.path.join(raw_folder, "title_ratings.tsv")).to_pandas()
+        return compact_titles(pd.merge(basics_df, ratings_df, on='tconst', how='inner'), diff=False)
+
+
+class ArrowEngine:
+    """
+    Вычисления на таблицах Arrow (pyarrow.compute): разбор, соединение, фильтр по типу и ТОП-выборка
+    выполняются без pandas, DataFrame создается только порциями при записи CSV.
+    Порядок строк и выбор ТОПа совпадают с путем pandas, поэтому совпадают и файлы результатов.
+    """
+
+    name = "arrow"
+    needs_pyarrow = True
+    ROW_COLUMN = "__row"
+
+    def load(self, raw_folder):
+        pa = _require_pyarrow()
+        basics = read_tsv_arrow(os.path.join(raw_folder, "title_basics.tsv"))
+        ratings = read_tsv_arrow(os.path.join(raw_folder, "title_ratings.tsv"))
+        # Соединение Arrow не сохраняет порядок строк: он восстанавливается по номеру строки basics,
+        # как у inner merge pandas
+        basics = basics.append_column(self.ROW_COLUMN, pa.array(np.arange(len(basics))))
+        joined = basics.join(ratings, "tconst", join_type="inner", use_threads=True)
+        return joined.sort_by(self.ROW_COLUMN).drop_columns([self.ROW_COLUMN])
+
+    def is_native(self, data):
+        return type(data).__module__.startswith("pyarrow")
+
+    def filter_by_type(self, data, selected_type):
+        import pyarrow.compute as pc
+
+        return data.filter(pc.equal(data['titleType'], selected_type))
+
+    def unique(self, data, column):
+        import pyarrow.compute as pc
+
+        return np.array(pc.unique(data[column]).to_pylist(), dtype=object)
+
+    def top_positions(self, data, top_level, threshold_start):
+        # Устойчивая сортировка по возрастанию рейтинга без пропусков, затем срез от порога
+        import pyarrow.compute as pc
+
+        values = data['averageRating']
+        known = pc.indices_nonzero(pc.is_valid(values))
+        order = known.take(pc.sort_indices(values.take(known), sort_keys=[("", "ascending")]))
+        sorted_values = values.take(order).to_numpy()
+        start = threshold_start(sorted_values, top_level, len(data))
+        return order[start:]
+
+    def to_pandas(self, data, columns=None):
+        return (data if columns is None else data.select(list(columns))).to_pandas()
+
+    def iter_frames(self, data, chunk_rows):
+        for batch in data.to_batches(max_chunksize=chunk_rows):
+            yield batch.to_pandas()
+
+
+class SQLiteEngine(PandasEngine):
+    """
+    Данные в индексированной базе SQLite (sqlstore.SQLiteDataset): база строится один раз для выгрузки,
+    дальше отбор и ТОП выполняются запросами без загрузки данных в память.
+    """
+
+    name = "sqlite"
+
+    def load(self, raw_folder):
+        from .sqlstore import SQLiteDataset
+
+        return SQLiteDataset.open_or_build(raw_folder)
+
+
+ENGINES = {engine.name: engine for engine in (PandasEngine, PyArrowParserEngine, ArrowEngine, SQLiteEngine)}
+
+
+def get_engine(name=None):
+    if name is None or name == PandasEngine.name:
+        return PandasEngine()
+    if name not in ENGINES:
+        raise ValueError(f"Неизвестный движок: {name}. Доступны: {', '.join(ENGINES)}")
+    if ENGINES[name].needs_pyarrow:
+        _require_pyarrow()
+    return ENGINES[name]()
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from .reader import ParallelTSVReader
+
+
+class EpisodeRollup:
+    """
+    Сводки по сериалам и сезонам из title.episode (parentTconst, seasonNumber, episodeNumber)
+    и рейтингов эпизодов. Сериалы кодируются целыми числами (pd.factorize), сезон - ключом из кода
+    сериала и номера сезона; суммы считаются np.bincount, лучший и худший эпизоды - сортировкой
+    np.lexsort по (группа, рейтинг, голоса). Циклов Python по группам нет.
+    """
+
+    EPISODE_TEXT_COLUMNS = ("tconst", "parentTconst", "seasonNumber", "episodeNumber")
+
+    @classmethod
+    def load_episodes(cls, path):
+        # Номера сезона и эпизода - целые с пропусками ('\N' в файле IMDb)
+        episodes = ParallelTSVReader().read(path, dtype={name: str for name in cls.EPISODE_TEXT_COLUMNS})
+        for column in ("seasonNumber", "episodeNumber"):
+            episodes[column] = pd.to_numeric(episodes[column], errors='coerce').astype('Int64')
+        return episodes
+
+    @classmethod
+    def build(cls, episodes, data, min_votes=25000):
+        """
+        Возвращает (series, seasons). data - объединенные данные (tconst, primaryTitle, averageRating,
+        numVotes): из них берутся рейтинги эпизодов и названия сериалов. Эпизоды без рейтинга
+        учитываются в числе эпизодов, но не в рейтингах.
+        """
+        episodes = episodes[episodes['parentTconst'].notna()]
+        # Целые ключи (tt0944947 -> 944947): поиск рейтингов и группировка без хэширования строк
+        title_ids = pd.Index(cls._numbers(data['tconst']))
+        positions = title_ids.get_indexer(cls._numbers(episodes['tconst']))
+        rated = positions >= 0
+        ratings = np.full(len(episodes), np.nan)
+        ratings[rated] = data['averageRating'].to_numpy(dtype=np.float64)[positions[rated]]
+        votes = np.full(len(episodes), np.nan)
+        votes[rated] = data['numVotes'].to_numpy(dtype=np.float64)[positions[rated]]
+        mean_rating = np.nanmean(ratings) if rated.any() else 0.0
+        # Оцененные эпизоды по возрастанию (рейтинг, голоса) и (рейтинг, -голоса): одна сортировка на обе
+        # свертки; лучший эпизод группы - последний в первом порядке, худший - первый во втором
+        # (ключ - ранг рейтинга * span + голоса, целое число вместо сортировки по двум колонкам)
+        known = np.flatnonzero(rated)
+        rating_ranks = np.unique(ratings[known], return_inverse=True)[1].astype(np.int64)
+        known_votes = votes[known].astype(np.int64)
+        span = int(known_votes.max(initial=0)) + 1
+        orders = (known[np.argsort(rating_ranks * span + known_votes, kind='stable')],
+                  known[np.argsort(rating_ranks * span + (span - 1 - known_votes), kind='stable')])
+
+        parent_ids = cls._numbers(episodes['parentTconst'])
+        series_codes, series_ids = pd.factorize(parent_ids)
+        # Текст tconst сериала - из первой строки его эпизодов
+        first_rows = np.full(len(series_ids), len(episodes))
+        np.minimum.at(first_rows, series_codes, np.arange(len(episodes)))
+        series_tconsts = episodes['parentTconst'].to_numpy(dtype=object)[first_rows]
+        season_numbers = episodes['seasonNumber'].fillna(-1).to_numpy(dtype=np.int64)
+        # Ключ сезона: код сериала * base + (номер сезона + 1); 0 - сезон не указан
+        base = max(int(season_numbers.max(initial=-1)) + 2, 1)
+        season_groups, season_codes = np.unique(series_codes.astype(np.int64) * base + season_numbers + 1,
+                                                return_inverse=True)
+
+        tconsts = episodes['tconst']
+        series = cls._aggregate(series_codes, len(series_ids), tconsts, ratings, votes, orders, min_votes,
+                                mean_rating)
+        known_seasons = season_groups[season_groups % base != 0] // base
+        series.insert(0, 'seasons', np.bincount(known_seasons, minlength=len(series_ids)))
+        # Название сериала; сериал без строки в данных (нет рейтинга) получает пропуск
+        series.insert(0, 'seriesTitle', data['primaryTitle'].array.take(title_ids.get_indexer(series_ids),
+                                                                        allow_fill=True))
+        series.insert(0, 'parentTconst', series_tconsts)
+
+        seasons = cls._aggregate(season_codes, len(season_groups), tconsts, ratings, votes, orders, min_votes,
+                                 mean_rating)
+        seasons.insert(0, 'seasonNumber', pd.array(season_groups % base - 1, dtype='Int64'))
+        seasons['seasonNumber'] = seasons['seasonNumber'].mask(seasons['seasonNumber'] < 0)
+        seasons.insert(0, 'parentTconst', series_tconsts[season_groups // base])
+        return series, seasons
+
+    @staticmethod
+    def _numbers(tconsts):
+        digits = tconsts.str.slice(2)
+        if isinstance(digits.dtype, pd.StringDtype) and digits.dtype.storage == "pyarrow":
+            # Разбор чисел в Arrow, без промежуточных объектов Python
+            return digits.astype("int64[pyarrow]").to_numpy(dtype=np.int64)
+        return digits.astype(np.int64).to_numpy()
+
+    @staticmethod
+    def _aggregate(codes, size, tconsts, ratings, votes, orders, min_votes, mean_rating):
+        known = ~np.isnan(ratings)
+        known_codes = codes[known]
+        count = np.bincount(codes, minlength=size)
+        rated = np.bincount(known_codes, minlength=size)
+        rating_sum = np.bincount(known_codes, weights=ratings[known], minlength=size)
+        votes_sum = np.bincount(known_codes, weights=votes[known], minlength=size)
+        rating_votes_sum = np.bincount(known_codes, weights=ratings[known] * votes[known], minlength=size)
+
+        # Номер лучшего эпизода группы в общем порядке - максимум, худшего - минимум (ufunc.at без циклов)
+        best_order, worst_order = orders
+        best_rank = np.full(size, -1)
+        np.maximum.at(best_rank, codes[best_order], np.arange(len(best_order)))
+        worst_rank = np.full(size, len(worst_order))
+        np.minimum.at(worst_rank, codes[worst_order], np.arange(len(worst_order)))
+        best = best_order[best_rank[best_rank >= 0]]
+        worst = worst_order[worst_rank[worst_rank < len(worst_order)]]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frame = pd.DataFrame({
+                'episodes': count,
+                'ratedEpisodes': rated,
+                'averageRating': rating_sum / rated,
+                'numVotes': votes_sum.astype(np.int64),
+                'voteWeightedRating': rating_votes_sum / votes_sum,
+                'weightedRating': np.where(rated > 0, (rating_votes_sum + min_votes * mean_rating)
+                                           / (votes_sum + min_votes), np.nan),
+            })
+        for label, chosen in (('best', best), ('worst', worst)):
+            episode = np.full(size, None, dtype=object)
+            episode[codes[chosen]] = tconsts.take(chosen).to_numpy(dtype=object)
+            rating = np.full(size, np.nan)
+            rating[codes[chosen]] = ratings[chosen]
+            frame[f'{label}Episode'] = episode
+            frame[f'{label}Rating'] = rating
+        return frame
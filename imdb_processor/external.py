@@ -0,0 +1,271 @@
+import csv
+import math
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+
+class ExternalJoiner:
+    """
+    Соединение таблиц, не помещающихся в память: секционированное хеш-соединение (Grace hash join).
+    Обе стороны разбиваются по хешу ключа на секции на диске, после чего секции соединяются по одной
+    в пределах заданного бюджета памяти. Источник - путь к TSV файлу IMDb, CSV файлу или DataFrame.
+    """
+
+    # Во сколько раз DataFrame в памяти больше исходного текста (грубая оценка для строковых данных)
+    MEMORY_FACTOR = 3
+    # Разные ключи хеширования для повторного разбиения слишком больших секций
+    HASH_KEYS = ("0123456789123456", "imdb-processor-1", "imdb-processor-2", "imdb-processor-3")
+
+    def __init__(self, temp_folder, memory_budget_mb=1024):
+        self.temp_folder = temp_folder
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+
+    def check_or_create_temp_folder(self):
+        if not os.path.exists(self.temp_folder):
+            os.makedirs(self.temp_folder)
+
+    def chunk_rows(self, row_bytes=200):
+        # Размер порции чтения: не больше четверти бюджета памяти
+        return max(10_000, int(self.memory_budget / 4 / (row_bytes * self.MEMORY_FACTOR)))
+
+    def estimate_size(self, source):
+        if isinstance(source, pd.DataFrame):
+            return int(source.memory_usage(deep=True).sum())
+        return os.path.getsize(source) * self.MEMORY_FACTOR
+
+    def iter_chunks(self, source):
+        chunksize = self.chunk_rows()
+        if isinstance(source, pd.DataFrame):
+            for start in range(0, len(source), chunksize):
+                yield source.iloc[start:start + chunksize]
+        elif source.endswith(".tsv"):
+            # Файлы IMDb: кавычки не экранируют значения, поэтому quoting отключен
+            yield from pd.read_csv(source, sep='\t', quoting=csv.QUOTE_NONE, dtype=str, chunksize=chunksize)
+        else:
+            yield from pd.read_csv(source, dtype=str, chunksize=chunksize)
+
+    def join(self, left, right, on, output_path, right_on=None, how='inner'):
+        """
+        left - потоковая сторона (может быть сколь угодно большой), right - сторона построения хеш-таблицы.
+        Результат записывается в CSV output_path; порядок строк - по секциям, а не по исходным файлам.
+        """
+        if how not in ("inner", "left"):
+            raise ValueError(f"Неподдерживаемый тип соединения: {how}")
+        right_on = right_on or on
+        self.check_or_create_temp_folder()
+
+        with open(output_path, "w", encoding="utf-8", newline="") as output:
+            if self.estimate_size(right) <= self.memory_budget / 2:
+                if isinstance(right, pd.DataFrame):
+                    right_df = right
+                else:
+                    right_df = pd.concat(self.iter_chunks(right), ignore_index=True)
+                header = True
+                for chunk in self.iter_chunks(left):
+                    header = self._write(output, chunk.merge(right_df, left_on=on, right_on=right_on, how=how), header)
+                return output_path
+
+            num_partitions = max(2, math.ceil(self.estimate_size(right) / (self.memory_budget / 2)))
+            right_columns = self._columns(right)
+            left_parts = self._partition(self.iter_chunks(left), on, num_partitions, "left", depth=0)
+            right_parts = self._partition(self.iter_chunks(right), right_on, num_partitions, "right", depth=0)
+            self._join_partitions(left_parts, right_parts, on, right_on, right_columns, how, output, depth=0)
+        return output_path
+
+    def _join_partitions(self, left_parts, right_parts, on, right_on, right_columns, how, output, depth):
+        header = output.tell() == 0
+        try:
+            for left_part, right_part in zip(left_parts, right_parts):
+                if not os.path.exists(left_part):
+                    continue
+                right_size = os.path.getsize(right_part) * self.MEMORY_FACTOR if os.path.exists(right_part) else 0
+                if right_size > self.memory_budget / 2 and depth + 1 < len(self.HASH_KEYS):
+                    # Секция все еще слишком большая (перекос ключей) - разбиваем ее повторно другим хешем
+                    num_partitions = max(2, math.ceil(right_size / (self.memory_budget / 2)))
+                    sub_left = self._partition(self._read_partition(left_part), on, num_partitions,
+                                               f"left{depth + 1}", depth + 1)
+                    sub_right = self._partition(self._read_partition(right_part), right_on, num_partitions,
+                                                f"right{depth + 1}", depth + 1)
+                    self._join_partitions(sub_left, sub_right, on, right_on, right_columns, how, output, depth + 1)
+                    header = output.tell() == 0
+                    continue
+
+                if os.path.exists(right_part):
+                    right_df = pd.concat(self._read_partition(right_part), ignore_index=True)
+                else:
+                    right_df = pd.DataFrame(columns=right_columns, dtype=object)
+                for chunk in self._read_partition(left_part):
+                    header = self._write(output, chunk.merge(right_df, left_on=on, right_on=right_on, how=how),
+                                         header)
+        finally:
+            for path in left_parts + right_parts:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _partition(self, chunks, key, num_partitions, side, depth):
+        paths = [os.path.join(self.temp_folder, f"{side}_{depth}_{i}.pkl") for i in range(num_partitions)]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        for chunk in chunks:
+            # Хеш считается по object-массиву, чтобы ключи str и object из разных источников совпадали
+            hashes = pd.util.hash_array(chunk[key].to_numpy(dtype=object), hash_key=self.HASH_KEYS[depth])
+            parts = (hashes % np.uint64(num_partitions)).astype(np.int64)
+            for part, group in chunk.groupby(parts, sort=False):
+                with open(paths[part], "ab") as f:
+                    pickle.dump(group, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return paths
+
+    @staticmethod
+    def _read_partition(path):
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def _columns(self, source):
+        if isinstance(source, pd.DataFrame):
+            return list(source.columns)
+        return list(next(self.iter_chunks(source)).columns)
+
+    @staticmethod
+    def _write(output, frame, header):
+        if len(frame) or header:
+            frame.to_csv(output, index=False, header=header)
+            return False
+        return header
+
+
+class ExternalSorter:
+    """
+    Внешняя сортировка: порции данных накапливаются в пределах бюджета памяти, сортируются
+    и выгружаются на диск как отсортированные серии, после чего серии сливаются k-путевым слиянием.
+    Слияние выдает отсортированные порции, которые можно сразу передавать в запись.
+    Серия удаляется, когда дочитана; серии, чтение которых не началось или было прервано
+    (слияние не доведено до конца, ошибка у потребителя), удаляет close() или выход из with.
+    """
+
+    MAX_FAN_IN = 16
+
+    def __init__(self, temp_folder, memory_budget_mb=1024):
+        self.temp_folder = temp_folder
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._run_counter = 0
+        self._run_paths = set()
+
+    def close(self):
+        for path in list(self._run_paths):
+            self._remove_run(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def sort(self, chunks, by, ascending=True):
+        runs, _ = self.spill_runs(chunks, by, ascending)
+        return self.merge(runs, by, ascending)
+
+    def spill_runs(self, chunks, by, ascending=True):
+        # Возвращает пути к сериям и пустой кадр со схемой данных (для заголовка пустого результата)
+        if not os.path.exists(self.temp_folder):
+            os.makedirs(self.temp_folder)
+        runs, buffer, buffer_bytes, empty = [], [], 0, None
+        missing = []
+        for chunk in chunks:
+            if empty is None:
+                empty = chunk.iloc[0:0]
+            # Пустые ключи идут в конец результата, как na_position='last' в sort_values
+            is_missing = chunk[by].isna().to_numpy()
+            if is_missing.any():
+                missing.append(chunk[is_missing])
+                chunk = chunk[~is_missing]
+            buffer.append(chunk)
+            buffer_bytes += int(chunk.memory_usage(deep=True).sum())
+            if buffer_bytes >= self.memory_budget / 2:
+                runs.append(self._write_run(pd.concat(buffer).sort_values(by, ascending=ascending, kind='stable')))
+                buffer, buffer_bytes = [], 0
+        if buffer:
+            runs.append(self._write_run(pd.concat(buffer).sort_values(by, ascending=ascending, kind='stable')))
+        if missing:
+            runs.append(("missing", self._write_run(pd.concat(missing))))
+        return runs, empty
+
+    def merge(self, runs, by, ascending=True):
+        missing = [run[1] for run in runs if isinstance(run, tuple)]
+        runs = [run for run in runs if not isinstance(run, tuple)]
+        # При большом числе серий слияние выполняется в несколько проходов, чтобы в памяти
+        # одновременно было не больше MAX_FAN_IN блоков
+        while len(runs) > self.MAX_FAN_IN:
+            groups = [runs[i:i + self.MAX_FAN_IN] for i in range(0, len(runs), self.MAX_FAN_IN)]
+            runs = [self._write_run(self._merge_runs(group, by, ascending), sorted_chunks=True) for group in groups]
+        yield from self._merge_runs(runs, by, ascending)
+        for path in missing:
+            yield from self._read_run(path)
+
+    def _merge_runs(self, runs, by, ascending):
+        readers = [self._read_run(path) for path in runs]
+        blocks = [next(reader, None) for reader in readers]
+        while True:
+            active = [i for i, block in enumerate(blocks) if block is not None]
+            if not active:
+                return
+            # Все строки не дальше минимального последнего ключа среди текущих блоков можно выдать:
+            # в оставшихся частях серий ключи только дальше. Серии идут в порядке исходных данных,
+            # поэтому равные ключи упорядочены по (ключ, номер серии): строки, равные границе, выдаются
+            # только из серий не позже той, где граница достигнута, и ничьи сохраняют исходный порядок
+            last_keys = [blocks[i][by].iloc[-1] for i in active]
+            bound = min(last_keys) if ascending else max(last_keys)
+            bound_run = min(i for i, key in zip(active, last_keys) if key == bound)
+            pieces = []
+            for i in active:
+                keys = blocks[i][by].to_numpy()
+                with_bound = i <= bound_run
+                if ascending:
+                    cut = int(np.searchsorted(keys, bound, side='right' if with_bound else 'left'))
+                else:
+                    cut = len(keys) - int(np.searchsorted(keys[::-1], bound, side='left' if with_bound else 'right'))
+                pieces.append(blocks[i].iloc[:cut])
+                blocks[i] = blocks[i].iloc[cut:]
+                while blocks[i] is not None and not len(blocks[i]):
+                    blocks[i] = next(readers[i], None)
+            yield pd.concat(pieces).sort_values(by, ascending=ascending, kind='stable')
+
+    def _write_run(self, data, sorted_chunks=False):
+        self._run_counter += 1
+        path = os.path.join(self.temp_folder, f"run_{os.getpid()}_{self._run_counter}.pkl")
+        chunks = data if sorted_chunks else self._blocks(data)
+        self._run_paths.add(path)
+        with open(path, "wb") as f:
+            for chunk in chunks:
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def _blocks(self, data):
+        # Блок серии - доля бюджета, чтобы MAX_FAN_IN блоков при слиянии помещались в память
+        row_bytes = max(1, int(data.memory_usage(deep=True).sum()) // max(1, len(data)))
+        block_rows = max(1_000, int(self.memory_budget / (4 * self.MAX_FAN_IN) / row_bytes))
+        for start in range(0, len(data), block_rows):
+            yield data.iloc[start:start + block_rows]
+
+    def _read_run(self, path):
+        try:
+            with open(path, "rb") as f:
+                while True:
+                    try:
+                        yield pickle.load(f)
+                    except EOFError:
+                        return
+        finally:
+            self._remove_run(path)
+
+    def _remove_run(self, path):
+        self._run_paths.discard(path)
+        if os.path.exists(path):
+            os.remove(path)
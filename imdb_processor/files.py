@@ -0,0 +1,56 @@
+import gzip
+import os
+import shutil
+
+from .decompress import ParallelGzipDecompressor
+
+
+class FileManager:
+    """
+    Класс для работы с файлами: проверка, создание, загрузка и распаковка.
+    """
+
+    @staticmethod
+    def check_or_create_folder(folder_path):
+        if not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+
+    @staticmethod
+    def fingerprint(paths):
+        # Отпечаток набора файлов по размеру и времени изменения: быстро и без чтения содержимого
+        fingerprint = []
+        for path in paths:
+            if os.path.exists(path):
+                stat = os.stat(path)
+                fingerprint.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+        return fingerprint
+
+    @staticmethod
+    def download_file(url, dest_path):
+        # requests импортируется только при загрузке, чтобы не замедлять запуск CLI
+        import requests
+
+        print(f"Загрузка файла из {url}...")
+        response = requests.get(url, stream=True)
+        if response.status_code == 200:
+            with open(dest_path, "wb") as file:
+                shutil.copyfileobj(response.raw, file)
+            print(f"Файл сохранен: {dest_path}")
+        else:
+            raise Exception(f"Ошибка загрузки файла: {url}, код ответа {response.status_code}")
+
+    @staticmethod
+    def extract_gzip(source_path, dest_path, parallel=True):
+        print(f"Распаковка файла {source_path}...")
+        if parallel:
+            try:
+                ParallelGzipDecompressor().extract(source_path, dest_path)
+                print(f"Файл распакован: {dest_path}")
+                return
+            except Exception as e:
+                # Любая ошибка - повтор обычным способом, он же сообщит о поврежденном архиве
+                print(f"Ускоренная распаковка не удалась ({e}), используется gzip.open.")
+        with gzip.open(source_path, "rb") as f_in:
+            with open(dest_path, "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out)
+        print(f"Файл распакован: {dest_path}")
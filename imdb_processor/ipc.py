@@ -0,0 +1,179 @@
+import os
+import socket
+from contextlib import contextmanager
+
+from .engines import _require_pyarrow
+from .titles import restore_titles
+
+
+def _pyarrow():
+    return _require_pyarrow("Вывод Arrow IPC требует")
+
+
+def _schema_and_batches(chunks, empty=None):
+    # Схема берется из первой порции (или пустого кадра), остальные порции приводятся к ней
+    pa = _pyarrow()
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        if empty is None:
+            raise ValueError("Нет ни одной порции и пустого кадра для схемы Arrow.")
+        first = empty
+    first = restore_titles(first)
+    schema = pa.Schema.from_pandas(first, preserve_index=False)
+
+    def batches():
+        if len(first):
+            yield pa.RecordBatch.from_pandas(first, schema=schema, preserve_index=False)
+        for chunk in chunks:
+            yield pa.RecordBatch.from_pandas(restore_titles(chunk), schema=schema, preserve_index=False)
+
+    return schema, batches()
+
+
+def write_ipc_file(chunks, path, empty=None):
+    """
+    Файл Arrow IPC (формат с произвольным доступом): порции DataFrame записываются пакетами
+    RecordBatch. Потребитель открывает файл через memory_map и читает колонки без копирования
+    и без разбора. Файл пишется во временный и заменяет целевой целиком. Возвращает число строк.
+    """
+    pa = _pyarrow()
+    schema, batches = _schema_and_batches(chunks, empty)
+    temp_path = path + ".tmp"
+    rows = 0
+    try:
+        with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return rows
+
+
+def write_ipc_stream(chunks, sink, empty=None):
+    # Поток Arrow IPC в файловый объект (например сокет): пакеты уходят по мере формирования
+    pa = _pyarrow()
+    schema, batches = _schema_and_batches(chunks, empty)
+    rows = 0
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def _socket(address):
+    # host:port - TCP (например на Windows), иначе путь сокета Unix
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return socket.socket(socket.AF_INET, socket.SOCK_STREAM), (host or "127.0.0.1", int(port))
+    return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM), address
+
+
+class ArrowIPCServer:
+    """
+    Локальный сервер результатов: клиент передает строку запроса, сервер отвечает строкой состояния
+    ("OK" или "ERR сообщение") и потоком Arrow IPC, пакеты которого отправляются по мере формирования.
+    Запросы: all, type:<titleType>, top:<уровень>[:<titleType>]. Данные загружаются один раз,
+    отбор и ТОП выполняет DataProcessor, поэтому работают и данные на диске, и таблицы движков.
+    """
+
+    def __init__(self, data, processor, address):
+        self.data = data
+        self.processor = processor
+        self.address = address
+
+    def resolve(self, query):
+        kind, _, argument = query.partition(":")
+        if kind == "all" and not argument:
+            return self.data
+        if kind == "type" and argument:
+            return self.processor.filter_by_type(self.data, argument, compact=True)
+        if kind == "top" and argument:
+            level, _, title_type = argument.partition(":")
+            target = self.processor.filter_by_type(self.data, title_type, compact=True) if title_type else self.data
+            return self.processor.get_top_records(target, float(level), compact=True)
+        raise ValueError(f"Неизвестный запрос: {query}")
+
+    def serve(self, max_requests=None, ready=None):
+        # max_requests - завершить после стольких запросов (None - обслуживать до прерывания);
+        # ready() вызывается, когда сокет уже принимает соединения
+        listener, address = _socket(self.address)
+        if listener.family == socket.AF_UNIX and os.path.exists(address):
+            os.remove(address)
+        served = 0
+        try:
+            listener.bind(address)
+            listener.listen()
+            if ready is not None:
+                ready()
+            while max_requests is None or served < max_requests:
+                connection, _ = listener.accept()
+                try:
+                    with connection:
+                        self._handle(connection)
+                except OSError as e:
+                    # Ошибка одного соединения (клиент отключился, не дочитав ответ) не останавливает сервер
+                    print(f"Соединение прервано: {e}")
+                served += 1
+        finally:
+            listener.close()
+            if listener.family == socket.AF_UNIX and os.path.exists(address):
+                os.remove(address)
+        return served
+
+    def _handle(self, connection):
+        # Ответ буферизуется в makefile: разрыв может проявиться и при закрытии файла (последний flush),
+        # поэтому ошибки соединения обрабатывает serve для всего обработчика
+        with connection.makefile("rb") as requests, connection.makefile("wb") as responses:
+            query = requests.readline().decode("utf-8").strip()
+            try:
+                chunks, empty = self.processor.iter_chunks(self.resolve(query))
+            except Exception as e:
+                responses.write(f"ERR {e}\n".encode("utf-8"))
+                return
+            responses.write(b"OK\n")
+            write_ipc_stream(chunks, responses, empty)
+
+
+class ArrowIPCClient:
+    """
+    Клиент результатов в формате Arrow IPC: запросы к ArrowIPCServer и чтение файлов .arrow.
+    Файл отображается в память (memory_map), и таблица ссылается на его страницы без копирования;
+    поток из сокета читается пакетами без разбора текста.
+    """
+
+    def __init__(self, address=None):
+        self.address = address
+
+    @staticmethod
+    def read_file(path):
+        pa = _pyarrow()
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    @contextmanager
+    def _stream(self, query):
+        pa = _pyarrow()
+        connection, address = _socket(self.address)
+        with connection:
+            connection.connect(address)
+            connection.sendall(query.encode("utf-8") + b"\n")
+            with connection.makefile("rb") as responses:
+                status = responses.readline().decode("utf-8").rstrip("\n")
+                if status != "OK":
+                    raise ValueError(status[4:] if status.startswith("ERR ") else "Сервер закрыл соединение.")
+                yield pa.ipc.open_stream(responses)
+
+    def iter_batches(self, query):
+        # Пакеты по мере получения, без накопления всего результата
+        with self._stream(query) as reader:
+            yield from reader
+
+    def fetch(self, query):
+        with self._stream(query) as reader:
+            return reader.read_all()
@@ -0,0 +1,130 @@
+# Связанные задачи: IMDB-1 (bronze_to_silver), IMDB-2 (transform)
+# Подробнее: https://github.com/IhorKhUa/IMDB-Processor/issues/8, https://github.com/IhorKhUa/IMDB-Processor/issues/7
+
+import os
+from functools import partial
+
+import pandas as pd
+
+from .episodes import EpisodeRollup
+from .processor import DataProcessor
+from .titles import compact_titles, restore_titles
+from .writer import AsyncWriter, ParallelCSVWriter
+
+
+def bronze_to_silver(bronze_dir="bronze", silver_dir="silver", raw_dir="raw", gold_dir="Gold_but_empty"):
+    # Создание папок, если их нет (папка gold остается пустой: JSON файлы не создаются)
+    for directory in [raw_dir, bronze_dir, silver_dir, gold_dir]:
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+            print(f"Папка '{directory}' была создана.")
+        else:
+            print(f"Папка '{directory}' уже существует.")
+
+    # Обработка файлов в папке bronze
+    for file_name in os.listdir(bronze_dir):
+        if not file_name.endswith('.tsv'):
+            continue
+        file_path = os.path.join(bronze_dir, file_name)
+        print(f"Чтение данных из {file_path}...")
+
+        try:
+            df = pd.read_csv(file_path, sep='\t', low_memory=False)
+            print(f"Данные успешно загружены из {file_path}.")
+
+            # Пример обработки данных: добавим столбец с количеством строк
+            df['row_count'] = df.shape[0]
+
+            # Приведение типов для возможных смешанных данных
+            if df.shape[1] > 4:
+                df.iloc[:, 4] = df.iloc[:, 4].astype(str)
+                print("Типы данных в столбце 4 успешно приведены к строковому типу.")
+
+            silver_file_path = os.path.join(silver_dir, file_name.replace('.tsv', '.csv'))
+            df.to_csv(silver_file_path, index=False)
+            print(f"Данные сохранены в {silver_file_path}.")
+            print(f"JSON файлы не создаются, так как папка '{gold_dir}' остается пустой.")
+
+        except Exception as e:
+            print(f"Ошибка при обработке файла {file_name}: {e}")
+
+
+def transform(bronze_dir="bronze", result_dir="result_transform", min_votes=25000):
+    if not os.path.exists(result_dir):
+        os.makedirs(result_dir)
+        print(f"Папка '{result_dir}' была создана.")
+    else:
+        print(f"Папка '{result_dir}' уже существует.")
+
+    ratings_file = os.path.join(bronze_dir, "title.ratings.tsv")
+    basics_file = os.path.join(bronze_dir, "title.basics.tsv")
+    processor = DataProcessor(result_dir, min_votes=min_votes)
+    processor.csv_writer = ParallelCSVWriter()
+
+    try:
+        print(f"Чтение данных из {ratings_file}...")
+        ratings_df = pd.read_csv(ratings_file, sep='\t', low_memory=False)
+        print("Данные о рейтингах успешно загружены.")
+
+        print(f"Чтение данных из {basics_file}...")
+        basics_df = pd.read_csv(basics_file, sep='\t', low_memory=False)
+        print("Данные о базовых характеристиках успешно загружены.")
+
+        print("Объединение данных...")
+        merged_df = compact_titles(pd.merge(basics_df, ratings_df, on='tconst', how='inner'))
+
+        # Независимые файлы пишутся в фоне, пока считаются следующие выборки и печатается предпросмотр
+        with AsyncWriter() as writer:
+            def save(frame, filename, message):
+                output_file = os.path.join(result_dir, filename)
+                writer.submit(output_file, partial(processor.write_csv, frame), message.format(output_file))
+
+            movies_df = processor.filter_by_type(merged_df, 'movie', compact=True)
+            print(f"Найдено {len(movies_df)} фильмов.")
+            save(movies_df, "movies.csv", "Все фильмы сохранены в {}.")
+
+            episodes_df = processor.filter_by_type(merged_df, 'tvEpisode', compact=True)
+            print(f"Найдено {len(episodes_df)} эпизодов.")
+            save(episodes_df, "episodes.csv", "Эпизоды сохранены в {}.")
+
+            # Сортировка по рейтингу ТОП-30, выбор первых 30 строк
+            top_movies_df = movies_df.sort_values(['averageRating', 'numVotes'], ascending=[False, False]).head(30)
+            print("ТОП-30 - первые 30 фильмов успешно отобраны.")
+            save(top_movies_df, "top_movies_30_first_line.csv", "ТОП-30 фильмов по первым строкам сохранён в {}.")
+
+            # Сортировка по рейтингу ТОП-30, выбор 30 первых рейтинговых значений;
+            # originalTitle восстанавливается только для отобранных строк, перед сортировкой по нему
+            top_movies2_df = restore_titles(movies_df.nlargest(30, 'averageRating', keep='all')).sort_values(
+                by='originalTitle', ascending=True)
+            print("ТОП-30 - 30 фильмов по среднему баллу успешно отобраны.")
+            save(top_movies2_df, "top_movies_30_avg_rating.csv", "ТОП-30 фильмов по рейтингу сохранён в {}.")
+
+            # Сортировка по взвешенному рейтингу IMDb, чтобы фильм с 10.0 и 5 голосами не обгонял классику
+            top_movies3_df = movies_df.assign(weightedRating=processor.weighted_rating(movies_df)).nlargest(
+                30, 'weightedRating')
+            print("ТОП-30 - 30 фильмов по взвешенному рейтингу успешно отобраны.")
+            save(top_movies3_df, "top_movies_30_weighted_rating.csv",
+                 "ТОП-30 фильмов по взвешенному рейтингу сохранён в {}.")
+
+            # Сводки по сериалам и сезонам, если в bronze есть title.episode
+            episode_file = os.path.join(bronze_dir, "title.episode.tsv")
+            if os.path.exists(episode_file):
+                series_df, seasons_df = EpisodeRollup.build(EpisodeRollup.load_episodes(episode_file), merged_df,
+                                                            min_votes)
+                print(f"Сводки: {len(series_df)} сериалов, {len(seasons_df)} сезонов.")
+                save(series_df, "series_rollup.csv", "Сводка по сериалам сохранена в {}.")
+                save(seasons_df, "season_rollup.csv", "Сводка по сезонам сохранена в {}.")
+
+            previews = [
+                ("Первые 10 фильмов:", movies_df),
+                ("Первые 10 эпизодов:", episodes_df),
+                ("Первые 10 фильмов из ТОП-30 по строкам:", top_movies_df),
+                ("Первые 10 фильмов из ТОП-30 по рейтингу:", top_movies2_df),
+                ("Первые 10 фильмов из ТОП-30 по взвешенному рейтингу:", top_movies3_df),
+            ]
+            for title, frame in previews:
+                print(f"\n{title}")
+                print(restore_titles(frame.head(10)).to_string(index=False))
+
+    except Exception as e:
+        print(f"Ошибка при обработке файлов: {e}")
@@ -0,0 +1,121 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:
+    # Windows: пиковое потребление памяти не измеряется
+    resource = None
+
+
+class MemoryBudget:
+    """
+    Бюджет памяти процесса (--max-memory). Из него выводятся размер порций чтения и записи,
+    бюджет внешних соединений и сортировки, а также решение, загружать ли данные целиком
+    или читать их порциями с выгрузкой на диск. В конце работы пиковое потребление (RSS)
+    сравнивается с бюджетом.
+    """
+
+    UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    # Доли свободной части бюджета: одна порция данных и внешние соединения/сортировка
+    CHUNK_SHARE = 0.05
+    SPILL_SHARE = 0.5
+    # Во сколько раз DataFrame в памяти больше исходного текста (как ExternalJoiner.MEMORY_FACTOR)
+    MEMORY_FACTOR = 3
+    # Во время merge в памяти одновременно исходные таблицы, результат и временные копии
+    MERGE_FACTOR = 2.5
+    # Процесс пула разбора до начала работы: интерпретатор с pandas
+    WORKER_RSS = 64 * 1024 ** 2
+
+    def __init__(self, limit_bytes):
+        self.limit_bytes = int(limit_bytes)
+        # Пик процессов пула, работавших одновременно с основным: число процессов x пик самого большого
+        self.pool_peak_bytes = 0
+
+    @classmethod
+    def parse(cls, text):
+        # '2G', '512M', '1.5g'; число без единицы - мегабайты
+        text = str(text).strip().upper().removesuffix("B")
+        unit = cls.UNITS.get(text[-1:], None)
+        try:
+            value = float(text[:-1] if unit else text)
+        except ValueError:
+            raise ValueError(f"Неверный размер памяти: {text}") from None
+        return cls(value * (unit or cls.UNITS["M"]))
+
+    @property
+    def limit_mb(self):
+        return self.limit_bytes / 1024 / 1024
+
+    def available_bytes(self):
+        # Свободная часть бюджета: уже занятое процессом (интерпретатор, pandas) не распределяется
+        return max(self.limit_bytes - self.current_rss(), self.limit_bytes // 10)
+
+    @property
+    def spill_budget_mb(self):
+        # Бюджет для ExternalJoiner и ExternalSorter (их параметр memory_budget_mb)
+        return max(16, int(self.available_bytes() * self.SPILL_SHARE / 1024 / 1024))
+
+    def estimate_load(self, paths):
+        return sum(os.path.getsize(path) for path in paths) * self.MEMORY_FACTOR * self.MERGE_FACTOR
+
+    def fits(self, estimated_bytes):
+        return estimated_bytes <= self.limit_bytes - self.current_rss()
+
+    @classmethod
+    def row_bytes(cls, path, sample_bytes=1024 * 1024):
+        # Средний размер строки в памяти по первому мегабайту файла
+        with open(path, "rb") as file:
+            sample = file.read(sample_bytes)
+        return max(1, len(sample) // max(1, sample.count(b"\n"))) * cls.MEMORY_FACTOR
+
+    def chunk_rows(self, path, minimum=10_000):
+        return max(minimum, int(self.available_bytes() * self.CHUNK_SHARE / self.row_bytes(path)))
+
+    def shard_bytes(self):
+        # Наибольший диапазон исходного файла, который разбирается за раз (одна порция данных)
+        return max(1024 * 1024, int(self.available_bytes() * self.CHUNK_SHARE / self.MEMORY_FACTOR))
+
+    def pool_workers(self, workers, shard_bytes, reserved_bytes):
+        # Сколько процессов пула разбора помещается в бюджет рядом с основным процессом, которому
+        # нужно reserved_bytes. Процесс держит интерпретатор, разобранный диапазон и его копию
+        # для передачи основному процессу. 1 - разбор в основном процессе, без пула
+        free = self.limit_bytes - self.current_rss() - reserved_bytes
+        per_worker = self.WORKER_RSS + 2 * shard_bytes * self.MEMORY_FACTOR
+        return max(1, min(workers, int(free // per_worker)))
+
+    def record_pool(self, workers, peak_bytes):
+        self.pool_peak_bytes = max(self.pool_peak_bytes, workers * peak_bytes)
+
+    @staticmethod
+    def current_rss():
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    @staticmethod
+    def peak_rss():
+        # (основной процесс, самый большой из завершенных дочерних процессов) в байтах
+        if resource is None:
+            return None, None
+        scale = 1 if sys.platform == "darwin" else 1024
+        return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+    def report(self):
+        # Процессы пула разбора запускает сервер forkserver, поэтому RUSAGE_CHILDREN их не видит:
+        # их пик сообщают сами процессы (record_pool). Пики основного и дочерних процессов складываются
+        own, children = self.peak_rss()
+        if own is None:
+            print(f"Пиковое потребление памяти не измеряется на этой платформе (бюджет {self.limit_mb:.0f} MB).")
+            return True
+        children = max(children, self.pool_peak_bytes)
+        total = own + children
+        within = total <= self.limit_bytes
+        print(f"Пиковое потребление памяти: {total / 1024 / 1024:.0f} MB из {self.limit_mb:.0f} MB "
+              f"({total / self.limit_bytes:.0%} бюджета) - {'в пределах бюджета' if within else 'бюджет превышен'}.")
+        if children:
+            print(f"Из них дочерние процессы (пул разбора): до {children / 1024 / 1024:.0f} MB.")
+        return within
@@ -0,0 +1,394 @@
+import os
+import shutil
+
+from .files import FileManager
+from .processor import DataProcessor
+from .reader import ChunkedDataset, DataReader
+from .titles import compact_titles
+from .writer import AsyncWriter, ParallelCSVWriter
+
+
+class IMDBDataPipeline:
+    """
+    Основной класс для управления процессом обработки данных.
+    """
+
+    def __init__(self, raw_folder, result_folder, urls, extra_urls=None, memory_budget_mb=1024, budget=None,
+                 engine=None, output_format="csv"):
+        # budget (MemoryBudget, --max-memory) задает и бюджет внешних соединений, и размер порций
+        if budget is not None:
+            memory_budget_mb = budget.spill_budget_mb
+        self.file_manager = FileManager()
+        self.data_reader = DataReader()
+        self.data_processor = DataProcessor(result_folder, memory_budget_mb=memory_budget_mb)
+        # Файлы меню пишутся в фоне, пока пользователь выбирает следующее действие. С бюджетом памяти -
+        # порциями write_chunk_rows: ParallelCSVWriter копирует весь кадр в разделяемую память
+        if budget is None:
+            self.data_processor.writer = AsyncWriter(deferred=True)
+            self.data_processor.csv_writer = ParallelCSVWriter()
+        else:
+            # ТОП-выгрузки сортируются внешней сортировкой с сериями в папке исходных файлов
+            self.data_processor.sort_folder = os.path.join(raw_folder, "sort")
+        # Движок разбора и вычислений (engines.get_engine); None - pandas
+        self.data_processor.engine = engine
+        # Формат выгрузок меню: csv или arrow (файлы Arrow IPC)
+        self.data_processor.output_format = output_format
+        self.raw_folder = raw_folder
+        self.result_folder = result_folder
+        self.urls = urls
+        self.extra_urls = extra_urls or {}
+        self.memory_budget_mb = memory_budget_mb
+        self.budget = budget
+        self.title_index = None
+
+    def prompt(self, message):
+        # Сообщения фоновых записей печатаются между вопросами, а не поверх вводимой строки
+        if self.data_processor.writer is not None:
+            self.data_processor.writer.print_messages()
+        return input(message)
+
+    def update_data(self, ask=True, include_extra=False):
+        # ask=False - обновление без вопросов (команда update), include_extra - загрузить и extra_urls
+        if ask and os.path.exists(self.raw_folder):
+            choice = self.prompt("Предыдущие исходные файлы существуют. Обновить (Yes - 1/No - 0): ").strip().lower()
+            if choice == "0":
+                return
+
+        self.file_manager.check_or_create_folder(self.raw_folder)
+
+        urls = dict(self.urls)
+        if self.extra_urls and ask:
+            choice = self.prompt(
+                f"Загрузить дополнительные наборы ({', '.join(self.extra_urls)})? (Yes - 1/No - 0): ").strip().lower()
+            include_extra = choice in ["yes", "1"]
+        if include_extra:
+            urls.update(self.extra_urls)
+
+        for name, url in urls.items():
+            compressed_file_path = os.path.join(self.raw_folder, f"{name}.tsv.gz")
+            extracted_file_path = os.path.join(self.raw_folder, f"{name}.tsv")
+
+            self.file_manager.download_file(url, compressed_file_path)
+            self.file_manager.extract_gzip(compressed_file_path, extracted_file_path)
+
+            if os.path.exists(compressed_file_path):
+                os.remove(compressed_file_path)
+                print(f"Удален архив: {compressed_file_path}")
+
+    def create_joined_files(self, data):
+        # Состав и альтернативные названия соединяются с данными фильмов внешним соединением на диске
+        jobs = {
+            "title_principals": ("principals_joined.csv", self.data_reader.join_principals),
+            "title_akas": ("akas_joined.csv", self.data_reader.join_akas),
+        }
+        if not isinstance(data, ChunkedDataset):
+            # ChunkedDataset соединяется прямо из файла, таблица движка переводится в DataFrame
+            data = self.data_processor.to_frame(data)
+        for name, (filename, join) in jobs.items():
+            if not os.path.exists(os.path.join(self.raw_folder, f"{name}.tsv")):
+                print(f"Исходный файл {name}.tsv не загружен, пропуск.")
+                continue
+            output_path = os.path.join(self.result_folder, filename)
+            if os.path.exists(output_path):
+                print(f"Файл {output_path} уже существует, пропуск сохранения.")
+                continue
+            join(self.raw_folder, data, output_path, self.memory_budget_mb)
+            print(f"Результаты соединения сохранены в {output_path}.")
+
+    def create_episode_files(self, data):
+        # Сводки по сериалам и сезонам из title.episode и рейтингов эпизодов
+        from .episodes import EpisodeRollup
+
+        episodes_file = os.path.join(self.raw_folder, "title_episode.tsv")
+        if not os.path.exists(episodes_file):
+            print("Исходный файл title_episode.tsv не загружен, пропуск.")
+            return
+        if not self.data_processor.is_frame(data):
+            data = self.data_processor.to_frame(data, ['tconst', 'primaryTitle', 'averageRating', 'numVotes'])
+        series, seasons = EpisodeRollup.build(EpisodeRollup.load_episodes(episodes_file), data,
+                                              self.data_processor.min_votes)
+        print(f"Сериалов: {len(series)}, сезонов: {len(seasons)}.")
+        self.data_processor.save_to_csv(series, "series_rollup.csv")
+        self.data_processor.save_to_csv(seasons, "season_rollup.csv")
+
+    def search_titles(self, data, limit=10):
+        # Индекс строится при первом поиске и сохраняется в папке исходных файлов
+        from .search import TitleSearchIndex
+
+        if self.title_index is None:
+            if not self.data_processor.is_frame(data):
+                # Для индекса достаточно узкой проекции данных
+                data = self.data_processor.to_frame(data, ['tconst', 'titleType', 'primaryTitle', 'originalTitle',
+                                                           'startYear', 'averageRating', 'numVotes'])
+            self.title_index = TitleSearchIndex.open_or_build(self.raw_folder, data)
+        while True:
+            query = self.prompt("Введите название (пустая строка - выход из поиска): ").strip()
+            if not query:
+                return
+            results = self.title_index.search(query, limit)
+            if results.empty:
+                print("Ничего не найдено.")
+            else:
+                print(results.to_string(index=False))
+
+    def preview(self):
+        """
+        Быстрая оценка по выборке до полной загрузки: число записей по типам и порог ТОП с границами
+        95% интервала. Возвращает True, если пользователь выбрал точную обработку.
+        """
+        import time
+
+        from .preview import SamplePreview
+
+        start = time.perf_counter()
+        preview = SamplePreview(self.raw_folder).load()
+        print(f"Оценка по выборке ({len(preview.sample)} записей, {preview.sampled_share:.1%} файла "
+              f"title_basics.tsv) за {time.perf_counter() - start:.2f} с"
+              f"{' (файл прочитан целиком, оценки точные)' if preview.exact else ''}:")
+        counts = preview.counts()
+        print(counts.to_string(index=False))
+        types = list(counts['titleType'][1:])
+        while True:
+            title_type = self.prompt("Тип для оценки ТОП (пустая строка - все типы, 0 - завершить оценку): ").strip()
+            if title_type == "0":
+                break
+            if title_type and title_type not in types:
+                print("Неизвестный тип. Попробуйте снова.")
+                continue
+            try:
+                top_level = float(self.prompt("Укажите ТОП уровень, от 0.1 до 99.9: "))
+            except ValueError:
+                print("Неверный ввод. Попробуйте снова.")
+                continue
+            if top_level < 0.1 or top_level > 99.9:
+                print("Неверный уровень. Попробуйте снова.")
+                continue
+            top = preview.top(top_level, title_type or None)
+            if top is None:
+                print("В выборке нет записей с рейтингом.")
+                continue
+            print(f"ТОП-{top_level} ({title_type or 'all_types'}): порог averageRating ~ {top['threshold']} "
+                  f"[{top['threshold_low']}; {top['threshold_high']}], записей ~ {top['count']} "
+                  f"[{top['count_low']}; {top['count_high']}].")
+        choice = self.prompt("Выполнить точную обработку? (Yes - 1/No - 0): ").strip().lower()
+        return choice in ["yes", "1"]
+
+    def update_and_load(self):
+        # Конвейерный режим: загрузка, распаковка и разбор идут одновременно, без промежуточного .gz
+        self.file_manager.check_or_create_folder(self.raw_folder)
+        return self.data_reader.load_data_pipelined(self.urls, self.raw_folder)
+
+    def load_and_index(self, data=None, progress=None):
+        # Загрузка данных (если они не получены заранее в конвейерном режиме), индекс жанров и список типов
+        if data is None:
+            data = self.data_reader.load_data(self.raw_folder, budget=self.budget,
+                                              engine=self.data_processor.engine, progress=progress)
+        if self.budget is not None:
+            self.data_processor.write_chunk_rows = self.budget.chunk_rows(
+                os.path.join(self.raw_folder, "title_basics.tsv"))
+        if self.data_processor.is_frame(data):
+            # Кадр живет все время работы меню: originalTitle хранится только там, где отличается,
+            # выгрузки DataProcessor восстанавливают колонку сами
+            data = compact_titles(data)
+            self.data_processor.build_genre_index(data)
+        return data, self.data_processor.unique_values(data, 'titleType')
+
+    def run(self, data=None):
+        from .background import BackgroundLoader
+
+        # Данные загружаются в фоне, пока пользователь отвечает на вопросы; действия с данными ждут загрузку
+        loader = BackgroundLoader(lambda progress: self.load_and_index(data, progress))
+        try:
+            selected_type = None
+            filtered_data = None
+
+            # Проверка существования папки с результатами
+            if os.path.exists(self.result_folder):
+                choice = self.prompt(
+                    "Сохранить пользовательские файлы предыдущего формирования (Yes - 1/No - 0): ").strip().lower()
+                if choice in ["no", "0"]:
+                    shutil.rmtree(self.result_folder)
+                    print(f"Очищена папка: {self.result_folder}")
+
+            # Создаем папку результатов, если её нет
+            self.result_folder = os.path.abspath(self.result_folder)  # Преобразуем путь в абсолютный
+            self.file_manager.check_or_create_folder(self.result_folder)
+            #print(f"Папка для результатов успешно создана: {self.result_folder}")
+
+            # Первичный запрос о формировании файла без разделения по типам
+            while True:
+                choice = self.prompt(
+                    "Вы хотите сформировать файл без разделения по типам? (Yes - 1/No - 0): ").strip().lower()
+                if choice in ["yes", "1"]:
+                    data, unique_types = loader.result()
+                    #print("Формирование файла all_types_filtered.csv...")
+                    all_file_path = os.path.join(self.result_folder,
+                                                 self.data_processor.output_name("all_types_filtered.csv"))
+                    if os.path.exists(all_file_path):
+                        print(f"Файл {all_file_path} уже существует, пропуск сохранения.")
+                    else:
+                        self.data_processor.save_to_csv(data, all_file_path)
+                        #print(f"Результат сохранены")
+                        #print(f"Результаты сохранены в {all_file_path}.")
+                    break
+                elif choice in ["no", "0"]:
+                    break
+                else:
+                    print("Неверный выбор. Пожалуйста, введите 'Yes' или 'No'.")
+
+            # Основной цикл для дополнительных действий
+            while True:
+                choice = self.prompt("Вы хотите выполнить другие действия? (Yes - 1/No - 0): ").strip().lower()
+                if choice in ["yes", "1"]:
+                    print("Доступные действия:")
+                    print("1 - Дополнительно сформировать файл по ТОП категориям")
+                    print("2 - Дополнительно сформировать новый файл по типу фильмов")
+                    print("3 - Сформировать файлы состава и альтернативных названий")
+                    print("4 - Поиск по названию")
+                    print("5 - Сформировать сводки по сериалам и сезонам")
+                    action = self.prompt("Выберите действие (1/2/3/4/5): ").strip()
+                    if action in ["1", "2", "3", "4", "5"]:
+                        data, unique_types = loader.result()
+
+                    if action == "1":
+                        # Вызов метода create_top_file для формирования ТОП файла
+                        self.create_top_file(data, filtered_data, selected_type)
+
+                    elif action == "2":
+                        # Фильтрация данных по типу фильмов
+                        while True:
+                            print("\nДоступные типы фильмов:")
+                            for idx, title_type in enumerate(unique_types, start=1):
+                                print(f"{idx}. {title_type}")
+
+                            try:
+                                selected_choice = int(self.prompt("\nВыберите номер типа для фильтрации: "))
+                                if 1 <= selected_choice <= len(unique_types):
+                                    selected_type = unique_types[selected_choice - 1]
+                                    filtered_data = self.data_processor.filter_by_type(data, selected_type, compact=True)
+                                    print(f"Фильтр данных: {selected_type}, записей: {len(filtered_data)}")
+                                    filtered_file_path = os.path.join(
+                                        self.result_folder, self.data_processor.output_name(f"{selected_type}_filtered.csv"))
+
+                                    # Проверка существования файла перед сохранением
+                                    if os.path.exists(filtered_file_path):
+                                        print(f"Файл {filtered_file_path} уже существует, пропуск сохранения.")
+                                    else:
+                                        self.data_processor.save_to_csv(filtered_data, filtered_file_path)
+                                        #print(f"Результаты сохранены 2")
+                                        #print(f"Результаты сохранены в {filtered_file_path}.")
+                                    break
+                                else:
+                                    raise ValueError("Выбран некорректный номер.")
+                            except ValueError as e:
+                                print(f"Неверный выбор: {e}. Попробуйте снова.")
+
+                    elif action == "3":
+                        self.create_joined_files(data)
+
+                    elif action == "4":
+                        self.search_titles(data)
+
+                    elif action == "5":
+                        self.create_episode_files(data)
+
+                    else:
+                        print("Неверный выбор. Пожалуйста, выберите 1, 2, 3, 4 или 5.")
+                elif choice in ["no", "0"]:
+                    print("Завершение программы.")
+                    # Барьер: загрузка и фоновые записи завершены до подсчета файлов и удаления исходных
+                    loader.result()
+                    self.finish_writes()
+                    self.cleanup()
+                    return
+                else:
+                    print("Неверный выбор. Пожалуйста, введите 'Yes' или 'No'.")
+
+        except Exception as e:
+            print(f"Ошибка: {e}")
+        finally:
+            # Записи, начатые до ошибки, тоже дожидаются: файлы не обрываются при выходе
+            self.finish_writes()
+
+    def finish_writes(self):
+        # Барьер фоновых записей: ошибка записи не прерывает завершение, каждый незаписанный файл называется
+        try:
+            self.data_processor.wait_writes()
+        except Exception:
+            for path, error in self.data_processor.writer.failures:
+                print(f"Файл не записан: {path} ({error})")
+
+    def cleanup(self):
+        while True:
+            save_choice = self.prompt(
+                f"Вы хотите удалить директорию: {self.raw_folder} и хранящиеся в ней исходные файлы? (Yes - 1/No - 0): ").strip().lower()
+            if save_choice == "1":
+                for file_name in os.listdir(self.raw_folder):
+                    file_path = os.path.join(self.raw_folder, file_name)
+                    if os.path.isdir(file_path):
+                        shutil.rmtree(file_path)
+                    else:
+                        os.remove(file_path)
+                    print(f"Удален исходный файл: {file_path}")
+                os.rmdir(self.raw_folder)
+                print(f"Удалена директория: {self.raw_folder}")
+                print(f"Формирование {len(os.listdir(self.result_folder))} файлов завершено.")
+                break
+            elif save_choice == "0":
+                print(f"Формирование {len(os.listdir(self.result_folder))} файлов завершено.")
+                break
+            else:
+                print("Неверный выбор. Повторите ввод.")
+
+    def perform_additional_actions(self, data, filtered_data):
+        while True:
+            next_action = self.prompt("Вы хотите выполнить другие действия? (Yes - 1/No - 0): ").strip().lower()
+            if next_action in ["yes", "1"]:
+                print("\nДоступные действия:")
+                print("1 - Дополнительно сформировать файл ТОП категории")
+                print("2 - Сформировать новый файл по типу фильмов")
+                action_choice = self.prompt("Выберите действие (1/2): ").strip()
+
+                if action_choice == "1":
+                    self.create_top_file(data, filtered_data)
+                elif action_choice == "2":
+                    return  # Выход из метода для завершения программы
+                else:
+                    print("Неверный выбор. Попробуйте снова.")
+            elif next_action in ["no", "0"]:
+                print("Завершение программы.")
+                self.finish_writes()
+                self.cleanup()  # Вызов метода cleanup()
+                return  # Выход из метода
+            else:
+                print("Неверный ввод. Пожалуйста, введите 'Yes' или 'No'.")
+
+    def create_top_file(self, data, filtered_data, selected_type=None):
+        if selected_type is None and filtered_data is not None:
+            selected_type = filtered_data['titleType'].iloc[0]
+        while True:
+            try:
+                all_or_selected = int(self.prompt("1 - Сформировать файл по выбранной категории, 2 - по всему файлу: "))
+                if all_or_selected == 1 and filtered_data is not None:
+                    target_data = filtered_data
+                    print(f"Будет выполнена обработка для категории: {selected_type}")
+                elif all_or_selected == 2:
+                    target_data = data
+                    print("Будет выполнена обработка для всех данных.")
+                else:
+                    print("Некорректный выбор. Попробуйте снова.")
+                    continue
+
+                top_level = float(self.prompt("Укажите ТОП уровень, от 0.1 до 99.9: "))
+                if top_level < 0.1 or top_level > 99.9:
+                    print("Неверный уровень. Программа завершена.")
+                    return
+
+                print(f"Будет сформирован файл с ТОП-{top_level} записей.")
+                filename = f"top_{top_level}_percent_{'all_types' if all_or_selected == 2 else selected_type}.csv"
+                top_count = self.data_processor.save_top_records(target_data, top_level, filename)
+                print(
+                    f"Найдено {top_count} записей ТОП-{top_level} для типа {'all_types' if all_or_selected == 2 else selected_type}.")
+                break
+            except ValueError:
+                print("Неверный ввод. Попробуйте снова.")
@@ -0,0 +1,133 @@
+import csv
+import io
+import os
+import random
+
+import numpy as np
+import pandas as pd
+
+from .reader import ParallelTSVReader
+
+
+class SamplePreview:
+    """
+    Быстрая оценка по выборке до полной загрузки: title.basics читается блоками строк
+    (по одному блоку из каждой из blocks равных частей файла), рейтинги - целиком (файл небольшой).
+    Число строк оценивается отношением к байтам: всего строк ~ размер файла * (строк в выборке /
+    байт в выборке); границы - 95% доверительный интервал оценки отношения по блокам (блок - кластер).
+    Если файл меньше двух объемов выборки, он читается целиком и оценки точные.
+    """
+
+    Z = 1.96
+
+    def __init__(self, raw_folder, sample_mb=16, blocks=256, seed=None):
+        self.raw_folder = raw_folder
+        self.sample_bytes = int(sample_mb * 1024 * 1024)
+        self.blocks = blocks
+        self.seed = seed
+        self.sample = None
+        self.block_bytes = None
+        self.total_bytes = 0
+        self.exact = False
+
+    def load(self):
+        basics_file = os.path.join(self.raw_folder, "title_basics.tsv")
+        with open(basics_file, "rb") as f:
+            header = f.readline()
+            data_start = f.tell()
+            self.total_bytes = os.path.getsize(basics_file) - data_start
+            # Выборка больше половины файла не дает выигрыша: файл читается целиком
+            self.exact = self.total_bytes <= 2 * self.sample_bytes
+            if self.exact:
+                chunks = [f.read()]
+            else:
+                chunks = self._read_blocks(f, data_start)
+        self.block_bytes = np.array([len(chunk) for chunk in chunks], dtype=np.float64)
+        block_rows = [chunk.count(b"\n") + (1 if chunk and not chunk.endswith(b"\n") else 0) for chunk in chunks]
+
+        basics = pd.read_csv(io.BytesIO(header + b"".join(chunk if chunk.endswith(b"\n") else chunk + b"\n"
+                                                           for chunk in chunks if chunk)),
+                             sep='\t', quoting=csv.QUOTE_NONE, usecols=['tconst', 'titleType'], dtype=str)
+        basics['block'] = np.repeat(np.arange(len(chunks)), block_rows)
+        ratings = ParallelTSVReader().read(os.path.join(self.raw_folder, "title_ratings.tsv"))
+        self.sample = pd.merge(basics, ratings[['tconst', 'averageRating']], on='tconst', how='inner')
+        return self
+
+    def _read_blocks(self, f, data_start):
+        # Блок - строки, начинающиеся в окне [start, start + block_size) случайного места своей части файла
+        block_size = max(self.sample_bytes // self.blocks, 1)
+        stratum = self.total_bytes / self.blocks
+        rnd = random.Random(self.seed)
+        chunks = []
+        for i in range(self.blocks):
+            start = data_start + int(i * stratum + rnd.random() * max(stratum - block_size, 0))
+            # Строка, начатая до окна, относится к предыдущему блоку
+            f.seek(start - 1)
+            f.readline()
+            begin = f.tell()
+            chunk = f.read(max(start + block_size - begin, 0))
+            if chunk and not chunk.endswith(b"\n"):
+                chunk += f.readline()
+            chunks.append(chunk)
+        return chunks
+
+    @property
+    def sampled_share(self):
+        return float(self.block_bytes.sum()) / self.total_bytes if self.total_bytes else 1.0
+
+    def _estimate(self, mask):
+        # Оценка числа строк объединенных данных с условием mask и полуширина доверительного интервала
+        per_block = np.bincount(self.sample['block'].to_numpy()[mask], minlength=len(self.block_bytes))
+        sampled = self.block_bytes.sum()
+        ratio = per_block.sum() / sampled if sampled else 0.0
+        estimate = ratio * self.total_bytes
+        if self.exact or len(self.block_bytes) < 2:
+            return estimate, 0.0
+        residuals = per_block - ratio * self.block_bytes
+        variance = ((1 - sampled / self.total_bytes) * residuals.var(ddof=1)
+                    / (len(self.block_bytes) * self.block_bytes.mean() ** 2))
+        return estimate, self.Z * np.sqrt(variance) * self.total_bytes
+
+    def _mask(self, title_type=None):
+        if title_type is None:
+            return np.ones(len(self.sample), dtype=bool)
+        return (self.sample['titleType'] == title_type).to_numpy()
+
+    def counts(self):
+        # Оценка числа записей по типам и всего, с границами интервала
+        rows = []
+        for title_type in [None] + sorted(self.sample['titleType'].dropna().unique()):
+            estimate, margin = self._estimate(self._mask(title_type))
+            rows.append((title_type or "все типы", round(estimate), max(round(estimate - margin), 0),
+                         round(estimate + margin)))
+        return pd.DataFrame(rows, columns=['titleType', 'estimate', 'low', 'high'])
+
+    def top(self, top_level, title_type=None):
+        """
+        Оценка порога ТОП-top_level% (как в DataProcessor.get_top_records: n-е по величине значение
+        averageRating, ничьи входят) и числа записей ТОП. Интервал порога - по порядковым статистикам
+        выборки с поправкой на кластерный отбор (эффект плана по индикатору попадания в ТОП).
+        """
+        mask = self._mask(title_type)
+        values = np.sort(self.sample['averageRating'].to_numpy(dtype=np.float64)[mask])
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return None
+        share = top_level / 100
+        num_top = max(int(len(values) * share), 1)
+        threshold = values[len(values) - num_top]
+        count, count_margin = self._estimate(mask & (self.sample['averageRating'] >= threshold).to_numpy())
+
+        low = high = threshold
+        if not self.exact:
+            total, _ = self._estimate(mask)
+            in_top = count / total if total else 0.0
+            binomial = in_top * (1 - in_top) / len(values)
+            design = ((count_margin / self.Z / total) ** 2 / binomial) if binomial and total else 1.0
+            error = self.Z * np.sqrt(share * (1 - share) * max(design, 1.0) / len(values))
+            low = np.quantile(values, min(1 - share + error, 1.0), method='inverted_cdf')
+            high = np.quantile(values, max(1 - share - error, 0.0), method='inverted_cdf')
+            low, high = min(low, high), max(low, high)
+        return {"threshold": float(threshold), "threshold_low": float(low), "threshold_high": float(high),
+                "count": round(count), "count_low": max(round(count - count_margin), 0),
+                "count_high": round(count + count_margin)}
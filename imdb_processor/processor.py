@@ -0,0 +1,573 @@
+import os
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .external import ExternalSorter
+from .reader import ChunkedDataset
+from .sqlstore import SQLiteDataset
+from .titles import ORIGINAL_DIFF, restore_titles
+
+# Данные на диске, которые читаются порциями и фильтруются через where
+DISK_DATASETS = (ChunkedDataset, SQLiteDataset)
+
+
+class RowIndex:
+    """
+    Основа индексов по строкам набора данных (жанры, годы). Индекс годится для самого набора
+    и для его подмножеств (filter_by_type и т.п.): строки находятся по меткам индекса, а совпадение
+    tconst подтверждает, что это строки того же набора, а не другого кадра с такими же метками.
+    """
+
+    def __init__(self, data):
+        self.index = data.index
+        self._source = weakref.ref(data)
+
+    def covers(self, data):
+        if data.index is self.index:
+            return True
+        source = self._source()
+        if source is None or 'tconst' not in data.columns:
+            return False
+        positions = self.index.get_indexer(data.index)
+        if (positions < 0).any():
+            return False
+        return np.array_equal(source['tconst'].iloc[positions].to_numpy(dtype=object),
+                              data['tconst'].to_numpy(dtype=object))
+
+    def positions(self, data):
+        # Позиции строк data в наборе, по которому построен индекс
+        if not self.covers(data):
+            raise ValueError("Данные не принадлежат набору, по которому построен индекс.")
+        return self.index.get_indexer(data.index)
+
+
+class GenreIndex(RowIndex):
+    """
+    Словарь жанров и битовая маска жанров для каждой строки объединенных данных.
+    Строки жанров ('Drama,Romance') разбираются один раз для каждой уникальной комбинации,
+    после чего фильтрация сводится к побитовым операциям над массивом uint64.
+    """
+
+    MISSING = "\\N"
+
+    def __init__(self, genres, masks, data):
+        super().__init__(data)
+        self.genres = genres
+        self.bits = {genre: np.uint64(1) << np.uint64(i) for i, genre in enumerate(genres)}
+        self.masks = masks
+
+    @classmethod
+    def build(cls, data):
+        codes, combinations = pd.factorize(data['genres'], sort=False)
+
+        genres = sorted({
+            genre
+            for combination in combinations
+            if isinstance(combination, str) and combination != cls.MISSING
+            for genre in combination.split(',')
+        })
+        if len(genres) > 64:
+            raise ValueError(f"Слишком много жанров для маски uint64: {len(genres)}")
+        positions = {genre: i for i, genre in enumerate(genres)}
+
+        # Маска считается для каждой уникальной комбинации, а не для каждой строки
+        combination_masks = np.zeros(len(combinations) + 1, dtype=np.uint64)
+        for i, combination in enumerate(combinations):
+            if isinstance(combination, str) and combination != cls.MISSING:
+                for genre in combination.split(','):
+                    combination_masks[i] |= np.uint64(1) << np.uint64(positions[genre])
+
+        # Код -1 (пустое значение) попадает на последний, нулевой элемент
+        masks = combination_masks[codes]
+        return cls(genres, masks, data)
+
+    def mask_for(self, genres):
+        if isinstance(genres, str):
+            genres = [genres]
+        mask = np.uint64(0)
+        for genre in genres:
+            if genre not in self.bits:
+                raise ValueError(f"Неизвестный жанр: {genre}")
+            mask |= self.bits[genre]
+        return mask
+
+    def masks_for(self, data):
+        # Для подмножества строк (например, после filter_by_type) маски выбираются по меткам индекса
+        if data.index is self.index:
+            return self.masks
+        return self.masks[self.positions(data)]
+
+    def select(self, data, genres, mode='any'):
+        mask = self.mask_for(genres)
+        row_masks = self.masks_for(data) & mask
+        if mode == 'any':
+            return row_masks != 0
+        if mode == 'all':
+            return row_masks == mask
+        raise ValueError(f"Неизвестный режим фильтрации: {mode}")
+
+
+class YearIndex(RowIndex):
+    """
+    Строки, отсортированные по startYear: фильтр по диапазону лет - два бинарных поиска.
+    Для сериалов хранится интервал выхода [startYear, endYear]; сериал без endYear считается
+    идущим до сих пор, остальные титулы - вышедшими в год startYear.
+    При построении считаются сводки по годам (число титулов и средний рейтинг для каждого titleType).
+    """
+
+    SERIES_TYPES = ('tvSeries', 'tvMiniSeries')
+
+    def __init__(self, order, starts, ends, data, rollup):
+        super().__init__(data)
+        self.order = order
+        self.starts = starts
+        self.ends = ends
+        self.rollup = rollup
+
+    @classmethod
+    def build(cls, data):
+        starts = pd.to_numeric(data['startYear'], errors='coerce').to_numpy(dtype=np.float64)
+        ends = pd.to_numeric(data['endYear'], errors='coerce').to_numpy(dtype=np.float64)
+        series = data['titleType'].isin(cls.SERIES_TYPES).to_numpy()
+        ends = np.where(np.isnan(ends), np.where(series, np.inf, starts), ends)
+
+        # Пустые startYear уходят в конец порядка и в диапазоны не попадают
+        order = np.argsort(starts, kind='stable')
+        known = ~np.isnan(starts)
+        rollup = pd.DataFrame({
+            'titleType': data['titleType'].to_numpy()[known],
+            'startYear': starts[known].astype(np.int64),
+            'averageRating': data['averageRating'].to_numpy(dtype=np.float64)[known],
+        }).groupby(['titleType', 'startYear']).agg(count=('averageRating', 'size'),
+                                                   ratingSum=('averageRating', 'sum'),
+                                                   ratingCount=('averageRating', 'count')).reset_index()
+        return cls(order, starts[order], ends[order], data, rollup)
+
+    def rows(self, first=None, last=None, running=False):
+        # Номера строк (в исходном порядке) с startYear в [first, last];
+        # running=True - титулы, выходившие хотя бы в один год диапазона
+        lower = 0
+        if first is not None and not running:
+            lower = np.searchsorted(self.starts, first, side='left')
+        upper = np.searchsorted(self.starts, np.inf if last is None else last, side='right')
+        rows = self.order[lower:upper]
+        if running and first is not None:
+            # Окончание проверяется только в префиксе, отобранном бинарным поиском по началу
+            rows = rows[self.ends[lower:upper] >= first]
+        return np.sort(rows)
+
+    def select(self, data, first=None, last=None, running=False):
+        rows = self.rows(first, last, running)
+        mask = np.zeros(len(self.index), dtype=bool)
+        mask[rows] = True
+        if data.index is self.index:
+            return mask
+        return mask[self.positions(data)]
+
+    def summary(self, by='decade', title_type=None):
+        rollup = self.rollup
+        if title_type is not None:
+            rollup = rollup[rollup['titleType'] == title_type]
+        if by == 'decade':
+            rollup = rollup.assign(decade=rollup['startYear'] // 10 * 10)
+        elif by != 'year':
+            raise ValueError(f"Неизвестный уровень сводки: {by}")
+        key = 'decade' if by == 'decade' else 'startYear'
+        summary = rollup.groupby(['titleType', key], as_index=False)[['count', 'ratingSum', 'ratingCount']].sum()
+        summary['averageRating'] = summary['ratingSum'] / summary['ratingCount']
+        return summary[['titleType', key, 'count', 'averageRating']]
+
+
+class DataProcessor:
+    """
+    Класс для обработки данных: фильтрация, выборка топов, сохранение в CSV.
+    """
+
+    GROUP_KEYS = ('titleType', 'genre', 'decade')
+
+    def __init__(self, result_folder, min_votes=25000, memory_budget_mb=1024):
+        self.result_folder = result_folder
+        self.min_votes = min_votes
+        self.memory_budget_mb = memory_budget_mb
+        self.genre_index = None
+        self.year_index = None
+        self._top_cache = {}
+        self.write_chunk_rows = 200_000
+        # AsyncWriter для фоновой записи save_to_csv; None - запись сразу
+        self.writer = None
+        # ParallelCSVWriter для больших кадров; None - DataFrame.to_csv
+        self.csv_writer = None
+        # Движок (engines.get_engine), данные которого обрабатываются им самим, например таблицы Arrow
+        self.engine = None
+        # Формат выгрузок: "csv" или "arrow" (файлы Arrow IPC .arrow для чтения через memory_map)
+        self.output_format = "csv"
+        # Папка серий внешней сортировки: если задана (бюджет памяти), ТОП-выгрузки кадров сортируются
+        # ExternalSorter в пределах memory_budget_mb, а не перестановкой всего кадра в памяти
+        self.sort_folder = None
+
+    def _native(self, data):
+        return self.engine is not None and self.engine.is_native(data)
+
+    def is_frame(self, data):
+        # Обычный DataFrame в памяти (не данные на диске и не таблица движка)
+        return not isinstance(data, DISK_DATASETS) and not self._native(data)
+
+    def unique_values(self, data, column):
+        if isinstance(data, DISK_DATASETS):
+            return data.unique(column)
+        if self._native(data):
+            return self.engine.unique(data, column)
+        return data[column].unique()
+
+    def to_frame(self, data, columns=None):
+        # DataFrame для операций, которые есть только в pandas (поиск, соединения)
+        if isinstance(data, DISK_DATASETS):
+            return data.read(columns)
+        if self._native(data):
+            return self.engine.to_pandas(data, columns)
+        return data if columns is None else data[list(columns)]
+
+    def filter_by_type(self, data, selected_type, compact=False):
+        # compact=True - кадр с компактными названиями (originalTitle_diff) отдается как есть, для тех,
+        # кто пишет результат через DataProcessor; иначе наружу возвращается полная колонка originalTitle
+        if isinstance(data, DISK_DATASETS):
+            return data.where('titleType', selected_type)
+        if self._native(data):
+            return self.engine.filter_by_type(data, selected_type)
+        filtered = data[data['titleType'] == selected_type]
+        return filtered if compact else restore_titles(filtered)
+
+    def build_genre_index(self, data):
+        self.genre_index = GenreIndex.build(data)
+        return self.genre_index
+
+    def _get_genre_index(self, data):
+        # Индекс другого набора (перезагрузка, кадр другого движка) перестраивается, а не применяется по меткам
+        if self.genre_index is None or not self.genre_index.covers(data):
+            self.build_genre_index(data)
+        return self.genre_index
+
+    def filter_by_genre(self, data, genres, mode='any'):
+        # mode='any' - хотя бы один из жанров, mode='all' - все перечисленные жанры
+        return restore_titles(data[self._get_genre_index(data).select(data, genres, mode)])
+
+    def build_year_index(self, data):
+        self.year_index = YearIndex.build(data)
+        return self.year_index
+
+    def _get_year_index(self, data):
+        if self.year_index is None or not self.year_index.covers(data):
+            self.build_year_index(data)
+        return self.year_index
+
+    def filter_by_years(self, data, first=None, last=None, running=False):
+        # running=True - сериалы, выходившие в диапазоне (например, "сериалы, шедшие в 2010")
+        year_index = self._get_year_index(data)
+        if data.index is year_index.index:
+            return restore_titles(data.iloc[year_index.rows(first, last, running)])
+        return restore_titles(data[year_index.select(data, first, last, running)])
+
+    def year_rollup(self, data, by='decade', title_type=None):
+        # Число титулов и средний рейтинг по годам или десятилетиям для каждого titleType
+        return self._get_year_index(data).summary(by, title_type)
+
+    def get_top_by_genre(self, data, top_n, genres=None):
+        genre_index = self._get_genre_index(data)
+        genres = genre_index.genres if genres is None else genres
+        if isinstance(genres, str):
+            genres = [genres]
+
+        # Одна сортировка по рейтингу, затем для каждого жанра - срез по маске
+        order = np.lexsort((-data['numVotes'].to_numpy(), -data['averageRating'].to_numpy()))
+        ordered_masks = genre_index.masks_for(data)[order]
+
+        frames = []
+        for genre in genres:
+            positions = order[(ordered_masks & genre_index.mask_for(genre)) != 0][:top_n]
+            frames.append(data.iloc[positions].assign(genre=genre))
+        if not frames:
+            return restore_titles(data.iloc[0:0]).assign(genre=pd.Series(dtype=object))
+        return restore_titles(pd.concat(frames))
+
+    def weighted_rating(self, data, min_votes=None):
+        # Байесовский рейтинг IMDb: WR = v / (v + m) * R + m / (v + m) * C,
+        # где C - средний рейтинг по данным, m - минимальное число голосов
+        min_votes = self.min_votes if min_votes is None else min_votes
+        ratings = data['averageRating'].to_numpy(dtype=np.float64)
+        votes = data['numVotes'].to_numpy(dtype=np.float64)
+        mean_rating = np.nanmean(ratings) if len(ratings) else 0.0
+        weighted = (votes * ratings + min_votes * mean_rating) / (votes + min_votes)
+        return pd.Series(weighted, index=data.index, name='weightedRating')
+
+    def _sorted_permutation(self, data, rank_by):
+        # Перестановка строк по возрастанию рейтинга считается один раз для каждого набора данных
+        # и живет, пока жив сам DataFrame (ссылка слабая, данные не удерживаются в памяти)
+        key = (id(data), rank_by, self.min_votes)
+        cached = self._top_cache.get(key)
+        if cached is not None and cached[0]() is data:
+            return cached[1], cached[2]
+
+        if rank_by == 'weightedRating':
+            values = self.weighted_rating(data).to_numpy()
+        else:
+            values = data[rank_by].to_numpy(dtype=np.float64)
+        positions = np.flatnonzero(~np.isnan(values))
+        order = positions[np.argsort(values[positions], kind='stable')]
+        sorted_values = values[order]
+
+        def forget(ref, key=key):
+            if self._top_cache.get(key, (None,))[0] is ref:
+                del self._top_cache[key]
+
+        self._top_cache[key] = (weakref.ref(data, forget), order, sorted_values)
+        return order, sorted_values
+
+    @staticmethod
+    def _top_threshold_start(sorted_values, top_level, total):
+        # Начало ТОП-выборки в отсортированных по возрастанию значениях с учетом ничьих (keep='all')
+        num_top_records = min(int((total * top_level) / 100), len(sorted_values))
+        if num_top_records <= 0:
+            return len(sorted_values)
+        threshold = sorted_values[len(sorted_values) - num_top_records]
+        return int(np.searchsorted(sorted_values, threshold, side='left'))
+
+    def _top_slice(self, data, top_level, rank_by):
+        # То же, что nlargest(n, keep='all') + sort_values по возрастанию, но как срез
+        # закэшированной перестановки: граница ничьих находится бинарным поиском
+        order, sorted_values = self._sorted_permutation(data, rank_by)
+        start = self._top_threshold_start(sorted_values, top_level, len(data))
+        return order[start:], sorted_values[start:]
+
+    def get_top_records(self, data, top_level, rank_by='averageRating', compact=False):
+        if isinstance(data, SQLiteDataset):
+            if rank_by != 'averageRating':
+                raise ValueError("В базе SQLite ТОП считается только по averageRating.")
+            return data.top(top_level).read()
+        if self._native(data):
+            if rank_by != 'averageRating':
+                raise ValueError(f"Движок {self.engine.name} считает ТОП только по averageRating.")
+            return data.take(self.engine.top_positions(data, top_level, self._top_threshold_start))
+        positions, values = self._top_slice(data, top_level, rank_by)
+        top_records = data.iloc[positions]
+        if rank_by == 'weightedRating':
+            top_records = top_records.assign(weightedRating=values)
+        return top_records if compact else restore_titles(top_records)
+
+    def save_top_records(self, data, top_level, filename, rank_by='averageRating'):
+        # ТОП-выборка пишется порциями прямо из перестановки, без копии всей выборки в памяти
+        if isinstance(data, SQLiteDataset):
+            if rank_by != 'averageRating':
+                raise ValueError("В базе SQLite ТОП считается только по averageRating.")
+            top_records = data.top(top_level)
+            self.save_csv_chunks(top_records.iter_chunks(), filename, top_records.empty())
+            return len(top_records)
+        if isinstance(data, ChunkedDataset):
+            if rank_by != 'averageRating':
+                raise ValueError("Для данных на диске ТОП считается только по averageRating.")
+            with ExternalSorter(os.path.join(os.path.dirname(data.path), "sort"), self.memory_budget_mb) as sorter:
+                return self.save_top_records_external(data.iter_chunks(), top_level, filename, sorter)
+        if self.sort_folder is not None and self.is_frame(data):
+            chunks, empty = self.iter_chunks(data)
+            if rank_by == 'weightedRating':
+                # Взвешенный рейтинг зависит от среднего по всем данным, поэтому считается до разбиения
+                values = self.weighted_rating(data).to_numpy()
+                chunks = (chunk.assign(weightedRating=values[start:start + len(chunk)])
+                          for start, chunk in zip(range(0, len(data), self.write_chunk_rows), chunks))
+                empty = empty.assign(weightedRating=values[:0])
+            with ExternalSorter(self.sort_folder, self.memory_budget_mb) as sorter:
+                return self.save_top_records_external(chunks, top_level, filename, sorter, rank_by, empty)
+        if self._native(data):
+            top_records = self.get_top_records(data, top_level, rank_by, compact=True)
+            self.save_csv_chunks(self.engine.iter_frames(top_records, self.write_chunk_rows), filename,
+                                 self.engine.to_pandas(top_records.slice(0, 0)))
+            return len(top_records)
+        positions, values = self._top_slice(data, top_level, rank_by)
+
+        def chunks():
+            for start in range(0, len(positions), self.write_chunk_rows):
+                chunk = data.iloc[positions[start:start + self.write_chunk_rows]]
+                if rank_by == 'weightedRating':
+                    chunk = chunk.assign(weightedRating=values[start:start + self.write_chunk_rows])
+                yield chunk
+
+        empty = data.iloc[0:0]
+        if rank_by == 'weightedRating':
+            empty = empty.assign(weightedRating=values[:0])
+        self.save_csv_chunks(chunks(), filename, empty)
+        return len(positions)
+
+    def save_top_records_external(self, chunks, top_level, filename, sorter, rank_by='averageRating', empty=None):
+        """
+        ТОП-выборка для данных, которые читаются порциями и не помещаются в память:
+        порции сортируются внешней сортировкой, порог считается по одной колонке рейтингов,
+        а результат слияния сразу уходит в файл.
+        """
+        ratings = []
+
+        def tap(chunks):
+            for chunk in chunks:
+                ratings.append(chunk[rank_by].to_numpy(dtype=np.float64))
+                yield chunk
+
+        runs, spilled_empty = sorter.spill_runs(tap(chunks), by=rank_by)
+        # Схема для заголовка пустого результата: из первой порции или переданная вызывающим
+        empty = spilled_empty if spilled_empty is not None else empty
+        values = np.concatenate(ratings) if ratings else np.array([], dtype=np.float64)
+        total = len(values)
+        values = np.sort(values[~np.isnan(values)])
+        threshold = values[self._top_threshold_start(values, top_level, total):][:1]
+
+        def top_chunks():
+            for chunk in sorter.merge(runs, by=rank_by):
+                if len(threshold):
+                    chunk = chunk[chunk[rank_by] >= threshold[0]]
+                    if len(chunk):
+                        yield chunk
+                # Без порога (пустая выборка) слияние все равно доводится до конца, чтобы удалить серии
+
+        self.save_csv_chunks(top_chunks(), filename, empty)
+        return int((values >= threshold[0]).sum()) if len(threshold) else 0
+
+    def save_csv_chunks(self, chunks, filename, empty=None):
+        if self.output_format == "arrow":
+            from .ipc import write_ipc_file
+
+            write_ipc_file(chunks, self.output_path(filename), empty)
+        else:
+            self._write_csv_chunks(chunks, self.output_path(filename), empty)
+        print("Результаты сохранены")
+
+    @staticmethod
+    def _write_csv_chunks(chunks, output_file, empty=None):
+        header = True
+        with open(output_file, "w", encoding="utf-8", newline="") as output:
+            for chunk in chunks:
+                restore_titles(chunk).to_csv(output, index=False, header=header)
+                header = False
+            if header and empty is not None:
+                restore_titles(empty).to_csv(output, index=False)
+
+    def _group_codes(self, data, keys):
+        # Строки, попадающие в группы, и коды групп. Для жанров строка повторяется для каждого своего жанра
+        rows = np.arange(len(data))
+        key_values = {}
+        if 'genre' in keys:
+            genre_index = self._get_genre_index(data)
+            shifts = np.arange(len(genre_index.genres), dtype=np.uint64)
+            bit_matrix = (genre_index.masks_for(data)[:, None] >> shifts) & np.uint64(1)
+            rows, genre_codes = np.nonzero(bit_matrix)
+            key_values['genre'] = np.asarray(genre_index.genres, dtype=object)[genre_codes]
+
+        combined = np.zeros(len(rows), dtype=np.int64)
+        valid = np.ones(len(rows), dtype=bool)
+        for key in keys:
+            if key == 'titleType':
+                values = data['titleType'].to_numpy()[rows]
+            elif key == 'decade':
+                years = pd.to_numeric(data['startYear'], errors='coerce').to_numpy()[rows]
+                values = pd.array(years // 10 * 10, dtype='Int64')
+            elif key == 'genre':
+                values = key_values['genre']
+            else:
+                raise ValueError(f"Неизвестный ключ группировки: {key}. Доступны: {', '.join(self.GROUP_KEYS)}")
+            codes, uniques = pd.factorize(values)
+            valid &= codes >= 0
+            combined = combined * max(len(uniques), 1) + codes
+            key_values[key] = values
+
+        return rows[valid], combined[valid], {key: np.asarray(values, dtype=object)[valid] for key, values in key_values.items()}
+
+    def get_grouped_top(self, data, by, top_n=None, top_level=None, rank_by='weightedRating', min_votes=None):
+        """
+        ТОП-N или ТОП-процент внутри каждой группы (titleType, genre, decade или их сочетание)
+        за один проход: одна сортировка по (группа, рейтинг, голоса) и срез по рангу внутри группы.
+        """
+        if (top_n is None) == (top_level is None):
+            raise ValueError("Нужно указать ровно один параметр: top_n или top_level.")
+        keys = [by] if isinstance(by, str) else list(by)
+
+        if rank_by == 'weightedRating':
+            data = data.assign(weightedRating=self.weighted_rating(data, min_votes))
+        rows, groups, key_values = self._group_codes(data, keys)
+        scores = data[rank_by].to_numpy(dtype=np.float64)[rows]
+        votes = data['numVotes'].to_numpy(dtype=np.float64)[rows]
+
+        order = np.lexsort((-votes, -scores, groups))
+        sorted_groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])[:len(order)]
+        sizes = np.diff(np.r_[starts, len(order)])
+        ranks = np.arange(len(order)) - np.repeat(starts, sizes)
+        if top_n is not None:
+            limits = np.full(len(order), top_n)
+        else:
+            limits = np.repeat((sizes * top_level / 100).astype(np.int64), sizes)
+
+        selected = order[ranks < limits]
+        result = data.iloc[rows[selected]].assign(rank=ranks[ranks < limits] + 1)
+        for key in keys:
+            if key == 'decade':
+                result[key] = key_values[key][selected].astype(np.int64)
+            elif key == 'genre':
+                result[key] = key_values[key][selected]
+        return restore_titles(result)
+
+    def output_name(self, filename):
+        # Имя выгрузки с учетом формата: в режиме arrow расширение .csv заменяется на .arrow
+        if self.output_format == "arrow":
+            return os.path.splitext(filename)[0] + ".arrow"
+        return filename
+
+    def output_path(self, filename):
+        return os.path.join(self.result_folder, self.output_name(filename))
+
+    def iter_chunks(self, data):
+        # Данные порциями DataFrame и пустой кадр со схемой: для выгрузок потоком (Arrow IPC)
+        if isinstance(data, DISK_DATASETS):
+            return data.iter_chunks(), data.empty()
+        if self._native(data):
+            return self.engine.iter_frames(data, self.write_chunk_rows), self.engine.to_pandas(data.slice(0, 0))
+        step = self.write_chunk_rows
+        return (data.iloc[start:start + step] for start in range(0, len(data), step)), data.iloc[0:0]
+
+    def write_output(self, data, output_file):
+        if self.output_format == "arrow":
+            from .ipc import write_ipc_file
+
+            chunks, empty = self.iter_chunks(data)
+            write_ipc_file(chunks, output_file, empty)
+        else:
+            self.write_csv(data, output_file)
+
+    def save_to_csv(self, data, filename):
+        output_file = self.output_path(filename)
+        if self.writer is not None:
+            # Запись в фоне (AsyncWriter): обработка продолжается, файл появляется целиком
+            self.writer.submit(output_file, lambda temp_path: self.write_output(data, temp_path),
+                               f"Результаты сохранены: {self.output_name(filename)}")
+            return
+        self.write_output(data, output_file)
+        print("Результаты сохранены")
+        #print(f"Результаты сохранены в {output_file}.")
+
+    def write_csv(self, data, output_file):
+        if isinstance(data, DISK_DATASETS):
+            self._write_csv_chunks(data.iter_chunks(), output_file, data.empty())
+        elif self._native(data):
+            self._write_csv_chunks(self.engine.iter_frames(data, self.write_chunk_rows), output_file,
+                                   self.engine.to_pandas(data.slice(0, 0)))
+        elif self.csv_writer is not None and self.csv_writer.accepts(data):
+            self.csv_writer.write(data, output_file)
+        elif ORIGINAL_DIFF in data.columns:
+            # Компактные названия восстанавливаются порциями, без полной копии колонки в памяти
+            chunks = (data.iloc[start:start + self.write_chunk_rows]
+                      for start in range(0, len(data), self.write_chunk_rows))
+            self._write_csv_chunks(chunks, output_file, data.iloc[0:0])
+        else:
+            data.to_csv(output_file, index=False)
+
+    def wait_writes(self):
+        # Барьер фоновых записей: перед выходом и перед удалением исходных файлов
+        if self.writer is not None:
+            self.writer.wait()
@@ -0,0 +1,375 @@
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .external import ExternalJoiner
+from .memory import MemoryBudget
+from .shared import process_context
+from .titles import compact_titles, restore_titles
+
+
+# Колонки файлов IMDb, которые всегда читаются как текст (в них встречается '\\N'):
+# задаются явно, чтобы порции одного файла разбирались с общей схемой
+IMDB_TEXT_COLUMNS = ("tconst", "titleType", "primaryTitle", "originalTitle", "startYear", "endYear",
+                     "runtimeMinutes", "genres")
+
+
+def unify_frames(frames):
+    # Приведение порций, разобранных по отдельности, к общей схеме: числовые типы расширяются
+    # до общего, а колонка, текстовая хотя бы в одной порции, становится текстовой во всех
+    if not frames:
+        return frames
+    for name in frames[0].columns:
+        dtypes = [frame[name].dtype for frame in frames]
+        if all(dtype == dtypes[0] for dtype in dtypes):
+            continue
+        if all(pd.api.types.is_numeric_dtype(dtype) for dtype in dtypes):
+            common = np.result_type(*dtypes)
+            for frame in frames:
+                frame[name] = frame[name].astype(common)
+        else:
+            text_dtype = next(dtype for dtype in dtypes if not pd.api.types.is_numeric_dtype(dtype))
+            for frame in frames:
+                if pd.api.types.is_numeric_dtype(frame[name].dtype):
+                    frame[name] = frame[name].astype(str).astype(text_dtype)
+    return frames
+
+
+class DataReader:
+    """
+    Класс для чтения и объединения данных.
+    """
+
+    @staticmethod
+    def load_data(raw_folder, workers=None, budget=None, engine=None, progress=None):
+        # budget (MemoryBudget): если данные не помещаются в бюджет, возвращается ChunkedDataset;
+        # engine (engines.get_engine): другой движок разбора и вычислений;
+        # progress(num_bytes, total_bytes): разобрана очередная часть исходных файлов (только движок pandas)
+        ratings_file = os.path.join(raw_folder, "title_ratings.tsv")
+        basics_file = os.path.join(raw_folder, "title_basics.tsv")
+        if budget is not None and not budget.fits(budget.estimate_load([ratings_file, basics_file])):
+            print(f"Данные не помещаются в бюджет {budget.limit_mb:.0f} MB: чтение порциями с выгрузкой на диск.")
+            return DataReader.spill_data(raw_folder, budget.chunk_rows(basics_file))
+        if engine is not None and engine.name != "pandas":
+            return engine.load(raw_folder)
+
+        reader = ParallelTSVReader(workers)
+        if budget is not None:
+            # Разобранные диапазоны процессов пула тоже занимают память: диапазоны ограничены порцией,
+            # а процессов запускается столько, сколько помещается в бюджет рядом с загружаемыми данными
+            reader.max_shard_bytes = budget.shard_bytes()
+            reader.workers = budget.pool_workers(reader.workers, reader.max_shard_bytes,
+                                                 budget.estimate_load([ratings_file, basics_file]))
+        total_bytes = os.path.getsize(ratings_file) + os.path.getsize(basics_file)
+
+        def shard_progress(num_bytes):
+            if progress is not None:
+                progress(num_bytes, total_bytes)
+
+        ratings_df = reader.read(ratings_file, progress=shard_progress)
+        basics_df = reader.read(basics_file, progress=shard_progress)
+        if budget is not None:
+            budget.record_pool(reader.pool_size, reader.worker_peak_rss)
+
+        merged_df = pd.merge(basics_df, ratings_df, on='tconst', how='inner')
+        return compact_titles(merged_df, diff=False)
+
+    @staticmethod
+    def load_top_records(raw_folder, top_level, title_type=None):
+        """
+        ТОП-выборка с поздней материализацией: победители выбираются по узкой проекции
+        (tconst, titleType и рейтинги), и только их строки title.basics разбираются целиком.
+        Результат совпадает с DataProcessor.get_top_records по данным load_data (и filter_by_type).
+        """
+        ratings_file = os.path.join(raw_folder, "title_ratings.tsv")
+        basics_file = os.path.join(raw_folder, "title_basics.tsv")
+
+        keys = pd.read_csv(basics_file, sep='\t', quoting=csv.QUOTE_NONE, usecols=['tconst', 'titleType'],
+                           dtype=str)
+        keys['row'] = np.arange(len(keys))
+        ratings_df = ParallelTSVReader().read(ratings_file)
+        # Порядок и позиции строк те же, что у объединенных данных load_data
+        merged = pd.merge(keys, ratings_df, on='tconst', how='inner')
+        if title_type is not None:
+            merged = merged[merged['titleType'] == title_type]
+
+        values = merged['averageRating'].to_numpy(dtype=np.float64)
+        known = values[~np.isnan(values)]
+        num_top_records = min(int((len(merged) * top_level) / 100), len(known))
+        if num_top_records <= 0:
+            winners = np.zeros(len(merged), dtype=bool)
+        else:
+            # Частичная сортировка: порог - n-е по величине значение, ничьи на пороге входят в выборку
+            threshold = np.partition(known, len(known) - num_top_records)[len(known) - num_top_records]
+            winners = values >= threshold
+        top_keys = merged[winners]
+
+        text_columns = {name: str for name in IMDB_TEXT_COLUMNS}
+        top_records = read_tsv_rows(basics_file, top_keys['row'].to_numpy(), dtype=text_columns)
+        if top_records.empty:
+            # У пустой выборки типы не выводятся: схема берется по первой строке данных (isAdult - число)
+            top_records = top_records.astype(read_tsv_rows(basics_file, [0], dtype=text_columns).dtypes)
+        top_records.index = top_keys.index
+        for name in ratings_df.columns.drop('tconst'):
+            top_records[name] = top_keys[name]
+        order = np.argsort(values[winners], kind='stable')
+        return compact_titles(top_records.iloc[order], diff=False)
+
+    @staticmethod
+    def iter_data(raw_folder, chunksize=200_000):
+        # Те же объединенные данные, что и load_data, но порциями: рейтинги (узкая таблица) в памяти,
+        # title.basics читается потоком
+        ratings_file = os.path.join(raw_folder, "title_ratings.tsv")
+        basics_file = os.path.join(raw_folder, "title_basics.tsv")
+
+        ratings_df = ParallelTSVReader().read(ratings_file)
+        text_columns = {name: str for name in IMDB_TEXT_COLUMNS}
+        for basics_chunk in pd.read_csv(basics_file, sep='\t', quoting=csv.QUOTE_NONE, dtype=text_columns,
+                                        chunksize=chunksize):
+            yield pd.merge(basics_chunk, ratings_df, on='tconst', how='inner')
+
+    @staticmethod
+    def spill_data(raw_folder, chunksize=200_000):
+        # Объединенные данные один раз записываются на диск, дальше читаются порциями
+        spill_folder = os.path.join(raw_folder, "spill")
+        if not os.path.exists(spill_folder):
+            os.makedirs(spill_folder)
+        path = os.path.join(spill_folder, "merged.csv")
+        header = True
+        rows = 0
+        with open(path, "w", encoding="utf-8", newline="") as output:
+            for chunk in DataReader.iter_data(raw_folder, chunksize):
+                chunk.to_csv(output, index=False, header=header)
+                header = False
+                rows += len(chunk)
+        return ChunkedDataset(path, chunksize, rows=rows)
+
+    @staticmethod
+    def load_data_pipelined(urls, raw_folder):
+        # Загрузка, распаковка и разбор одновременно (см. streaming.PipelinedLoader)
+        from .streaming import load_data_pipelined
+
+        return load_data_pipelined(urls, raw_folder)
+
+    @staticmethod
+    def join_principals(raw_folder, titles, output_path, memory_budget_mb=1024):
+        """
+        Состав (title.principals) с данными фильмов и именами (name.basics).
+        Сначала principals потоково соединяются с titles (помещаются в память),
+        затем результат соединяется с name.basics секционированным соединением на диске.
+        """
+        joiner = ExternalJoiner(os.path.join(raw_folder, "spill"), memory_budget_mb)
+        principals_file = os.path.join(raw_folder, "title_principals.tsv")
+        names_file = os.path.join(raw_folder, "name_basics.tsv")
+        titled_file = os.path.join(joiner.temp_folder, "title_principals_titles.csv")
+
+        joiner.check_or_create_temp_folder()
+        try:
+            joiner.join(principals_file, DataReader._titles_source(titles), on='tconst', output_path=titled_file)
+            joiner.join(titled_file, names_file, on='nconst', output_path=output_path, how='left')
+        finally:
+            if os.path.exists(titled_file):
+                os.remove(titled_file)
+        return output_path
+
+    @staticmethod
+    def join_akas(raw_folder, titles, output_path, memory_budget_mb=1024):
+        # Альтернативные названия (title.akas) с данными фильмов
+        joiner = ExternalJoiner(os.path.join(raw_folder, "spill"), memory_budget_mb)
+        akas_file = os.path.join(raw_folder, "title_akas.tsv")
+        joiner.join(akas_file, DataReader._titles_source(titles), on='titleId', right_on='tconst', output_path=output_path)
+        return output_path
+
+    @staticmethod
+    def _titles_source(titles):
+        # ChunkedDataset соединяется прямо из файла на диске
+        if isinstance(titles, ChunkedDataset):
+            if titles.conditions:
+                raise ValueError("Соединение поддерживается только для полного набора данных.")
+            return titles.path
+        return restore_titles(titles)
+
+
+class ChunkedDataset:
+    """
+    Объединенные данные, которые не помещаются в бюджет памяти: лежат на диске в CSV и читаются
+    порциями. Отбор по значению колонки (where) не копирует данные, а применяется при каждом проходе.
+    """
+
+    def __init__(self, path, chunksize=200_000, conditions=(), rows=None):
+        self.path = path
+        self.chunksize = chunksize
+        self.conditions = conditions
+        # Число строк: известно при выгрузке на диск, для отбора where считается один раз при первом запросе
+        self.rows = rows
+
+    def where(self, column, value):
+        return ChunkedDataset(self.path, self.chunksize, self.conditions + ((column, value),))
+
+    def _dtype(self, columns):
+        return {name: str for name in IMDB_TEXT_COLUMNS if columns is None or name in columns}
+
+    def iter_chunks(self, columns=None):
+        usecols = None
+        if columns is not None:
+            usecols = list(dict.fromkeys(list(columns) + [column for column, _ in self.conditions]))
+        for chunk in pd.read_csv(self.path, dtype=self._dtype(usecols), usecols=usecols, chunksize=self.chunksize):
+            for column, value in self.conditions:
+                chunk = chunk[chunk[column] == value]
+            yield chunk if columns is None else chunk[list(columns)]
+
+    def empty(self):
+        # Пустой кадр со схемой данных: заголовок для пустого результата
+        return pd.read_csv(self.path, dtype=self._dtype(None), nrows=0)
+
+    def read(self, columns=None):
+        frames = list(self.iter_chunks(columns))
+        if not frames:
+            return self.empty() if columns is None else self.empty()[list(columns)]
+        return pd.concat(frames, ignore_index=True)
+
+    def unique(self, column):
+        return pd.unique(self.read([column])[column])
+
+    def __len__(self):
+        if self.rows is None:
+            self.rows = sum(len(chunk) for chunk in self.iter_chunks(["tconst"]))
+        return self.rows
+
+
+def read_tsv_rows(path, rows, dtype=None, block_size=64 * 1024 * 1024):
+    # Разбор только выбранных строк данных TSV (номера по возрастанию, без заголовка): границы строк
+    # ищутся векторно по блокам файла, в парсер попадают лишь нужные строки
+    rows = np.asarray(rows, dtype=np.int64)
+    selected = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        first_row, tail = 0, b""
+        while block := f.read(block_size):
+            data = tail + block
+            ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+            starts = np.concatenate(([0], ends[:-1] + 1))
+            low, high = np.searchsorted(rows, [first_row, first_row + len(ends)])
+            selected.extend(data[starts[row]:ends[row] + 1] for row in rows[low:high] - first_row)
+            first_row += len(ends)
+            tail = data[ends[-1] + 1:] if len(ends) else data
+        # Последняя строка без перевода строки
+        if tail and first_row in rows:
+            selected.append(tail + b"\n")
+    return pd.read_csv(io.BytesIO(header + b"".join(selected)), sep='\t', quoting=csv.QUOTE_NONE, dtype=dtype,
+                       low_memory=False)
+
+
+def _parse_tsv_range(path, start, end, names, dtype):
+    # Разбор одного диапазона байт файла в процессе пула
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return pd.read_csv(io.BytesIO(data), sep='\t', header=None, names=names, quoting=csv.QUOTE_NONE,
+                       dtype=dtype, low_memory=False)
+
+
+def _parse_tsv_range_measured(path, start, end, names, dtype):
+    # То же, что _parse_tsv_range, и пик памяти процесса пула после разбора
+    frame = _parse_tsv_range(path, start, end, names, dtype)
+    return frame, MemoryBudget.peak_rss()[0] or 0
+
+
+class ParallelTSVReader:
+    """
+    Параллельное чтение больших TSV файлов IMDb: файл делится на диапазоны байт по границам строк,
+    диапазоны разбираются в пуле процессов и склеиваются в исходном порядке.
+    Схема общая для всех частей: при расхождении выведенных типов колонка приводится к общему типу.
+    Кавычки в файлах IMDb не экранируют значения, поэтому quoting отключен.
+    """
+
+    MIN_SHARD_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, workers=None, max_shard_bytes=None):
+        self.workers = workers or os.cpu_count() or 1
+        # Наибольший диапазон байт одной части (бюджет памяти); None - файл делится по числу процессов
+        self.max_shard_bytes = max_shard_bytes
+        # Наибольшее число процессов пула и пик памяти (RSS) самого большого из них за все чтения
+        self.pool_size = 0
+        self.worker_peak_rss = 0
+
+    def shard_ranges(self, path):
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            names = f.readline().decode("utf-8").rstrip("\r\n").split("\t")
+            data_start = f.tell()
+            num_shards = max(1, min(self.workers, (size - data_start) // self.MIN_SHARD_BYTES))
+            if self.max_shard_bytes:
+                num_shards = max(num_shards, -(-(size - data_start) // self.max_shard_bytes))
+            bounds = [data_start]
+            for i in range(1, num_shards):
+                # Граница сдвигается на начало следующей строки
+                f.seek(data_start + (size - data_start) * i // num_shards)
+                f.readline()
+                if bounds[-1] < f.tell() < size:
+                    bounds.append(f.tell())
+            bounds.append(size)
+        return names, list(zip(bounds[:-1], bounds[1:]))
+
+    def read(self, path, dtype=None, progress=None):
+        # progress(num_bytes) вызывается после разбора каждого диапазона
+        names, ranges = self.shard_ranges(path)
+        if len(ranges) == 1 or self.workers == 1:
+            # Разбор в этом процессе, по одному диапазону за раз
+            frames = []
+            for start, end in ranges:
+                frames.append(_parse_tsv_range(path, start, end, names, dtype))
+                if progress is not None:
+                    progress(end - start)
+            if len(frames) == 1:
+                return frames[0]
+            if dtype is None:
+                frames = self._unify_schema(map, path, ranges, names, frames)
+            return pd.concat(frames, ignore_index=True)
+
+        workers = min(self.workers, len(ranges))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+            futures = {pool.submit(_parse_tsv_range_measured, path, start, end, names, dtype): end - start
+                       for start, end in ranges}
+            if progress is not None:
+                for future in as_completed(futures):
+                    progress(futures[future])
+            frames = []
+            for future in futures:
+                frame, peak_rss = future.result()
+                frames.append(frame)
+                self.worker_peak_rss = max(self.worker_peak_rss, peak_rss)
+            self.pool_size = max(self.pool_size, workers)
+            if dtype is None:
+                frames = self._unify_schema(pool.map, path, ranges, names, frames)
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _unify_schema(map_ranges, path, ranges, names, frames):
+        def differs(name):
+            return any(frame[name].dtype != frames[0][name].dtype for frame in frames)
+
+        # Часть, где текстовая колонка случайно выведена как число, разбирается заново
+        # с этой колонкой как строкой, чтобы сохранить исходный текст значений
+        text_columns = [name for name in names if differs(name) and not all(
+            pd.api.types.is_numeric_dtype(frame[name].dtype) for frame in frames)]
+        reparse = [i for i, frame in enumerate(frames)
+                   if any(pd.api.types.is_numeric_dtype(frame[name].dtype) for name in text_columns)]
+        if reparse:
+            dtype = {name: str for name in text_columns}
+            reparsed = map_ranges(_parse_tsv_range, *zip(*[(path, ranges[i][0], ranges[i][1], names, dtype)
+                                                         for i in reparse]))
+            for i, frame in zip(reparse, reparsed):
+                frames[i] = frame
+
+        # Числовые колонки с разными типами (int64 и float64) приводятся к общему типу
+        for name in names:
+            if differs(name) and all(pd.api.types.is_numeric_dtype(frame[name].dtype) for frame in frames):
+                common = np.result_type(*[frame[name].dtype for frame in frames])
+                for frame in frames:
+                    frame[name] = frame[name].astype(common)
+        return frames
@@ -0,0 +1,211 @@
+import bisect
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .files import FileManager
+from .titles import ORIGINAL_DIFF
+
+# Слово названия: буквы и цифры любого алфавита; регистр не учитывается
+TOKEN_PATTERN = r"\w+"
+INDEX_VERSION = 1
+
+
+def tokenize(text):
+    return re.findall(TOKEN_PATTERN, text.casefold())
+
+
+def _pack_strings(values):
+    # Строки одним буфером UTF-8 и массивом смещений: такой формат читается через mmap без разбора
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+class _PackedStrings:
+    # Последовательность bytes поверх буфера и смещений; пригодна для bisect
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]])
+
+
+class TitleSearchIndex:
+    """
+    Постоянный инвертированный индекс слов primaryTitle и originalTitle.
+    Словарь отсортирован по байтам UTF-8, для каждого слова хранится список строк (postings);
+    все массивы лежат в .npy файлах и открываются через mmap при первом поиске.
+    Поиск: названия, где есть все слова запроса, последнее - как префикс (поиск по мере ввода).
+    Ранжирование: точное совпадение названия, более короткое название, число голосов.
+    """
+
+    ARRAYS = ("vocab_offsets", "vocab_data", "posting_offsets", "postings", "in_primary", "token_counts",
+              "tconst_offsets", "tconst_data", "title_offsets", "title_data", "type_codes",
+              "start_year", "average_rating", "num_votes")
+
+    def __init__(self, folder, meta):
+        self.folder = folder
+        self.meta = meta
+        self._arrays = None
+
+    @staticmethod
+    def source_files(raw_folder):
+        return [os.path.join(raw_folder, "title_basics.tsv"), os.path.join(raw_folder, "title_ratings.tsv")]
+
+    @classmethod
+    def open(cls, folder):
+        # Читается только meta.json; None, если индекса нет
+        try:
+            with open(os.path.join(folder, "meta.json"), encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+        return cls(folder, meta) if meta.get("version") == INDEX_VERSION else None
+
+    @classmethod
+    def open_or_build(cls, raw_folder, data=None, folder_name="title_index"):
+        # Индекс пересобирается, если исходные файлы изменились после его построения
+        folder = os.path.join(raw_folder, folder_name)
+        fingerprint = FileManager.fingerprint(cls.source_files(raw_folder))
+        index = cls.open(folder)
+        if index is not None and index.meta["fingerprint"] == fingerprint:
+            return index
+        if data is None:
+            from .reader import DataReader
+
+            data = DataReader.load_data(raw_folder)
+        return cls.build(data, folder, fingerprint)
+
+    @classmethod
+    def build(cls, data, folder, fingerprint=None):
+        positions = np.arange(len(data))
+        primary = pd.Series(data['primaryTitle'].fillna("").astype(str).to_numpy(), index=positions)
+        if ORIGINAL_DIFF in data.columns:
+            original = pd.Series(data[ORIGINAL_DIFF].to_numpy(dtype=object), index=positions).dropna()
+        else:
+            original = pd.Series(data['originalTitle'].to_numpy(dtype=object), index=positions).dropna()
+            original = original[original != primary[original.index]]
+
+        # Пары (слово, строка) без повторов; слова originalTitle добавляются только там, где оно отличается.
+        # in_primary отмечает слова primaryTitle: по ним определяется точное совпадение названия
+        primary_tokens = primary.str.casefold().str.findall(TOKEN_PATTERN).explode().dropna()
+        original_tokens = original.astype(str).str.casefold().str.findall(TOKEN_PATTERN).explode().dropna()
+        pairs = pd.DataFrame({'row': np.concatenate([primary_tokens.index, original_tokens.index]),
+                              'token': np.concatenate([primary_tokens.to_numpy(dtype=object),
+                                                       original_tokens.to_numpy(dtype=object)]),
+                              'in_primary': np.arange(len(primary_tokens) + len(original_tokens)) < len(
+                                  primary_tokens)})
+        pairs = pairs.groupby(['token', 'row'], sort=False)['in_primary'].any().reset_index()
+        token_counts = primary_tokens.groupby(level=0).nunique().reindex(positions, fill_value=0)
+
+        # Порядок кодовых точек совпадает с порядком байт UTF-8, поэтому bisect по bytes корректен
+        codes, vocabulary = pd.factorize(pairs['token'], sort=True)
+        rows = pairs['row'].to_numpy(dtype=np.int32)
+        order = np.lexsort((rows, codes))
+        posting_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(vocabulary)), out=posting_offsets[1:])
+
+        type_codes, types = pd.factorize(data['titleType'])
+        arrays = {
+            'postings': rows[order],
+            'in_primary': pairs['in_primary'].to_numpy(dtype=bool)[order],
+            'posting_offsets': posting_offsets,
+            'token_counts': token_counts.to_numpy(dtype=np.int16),
+            'type_codes': type_codes.astype(np.int16),
+            'start_year': pd.to_numeric(data['startYear'], errors='coerce').fillna(0).to_numpy(dtype=np.int16),
+            'average_rating': data['averageRating'].to_numpy(dtype=np.float32),
+            'num_votes': data['numVotes'].to_numpy(dtype=np.int64),
+        }
+        arrays['vocab_offsets'], arrays['vocab_data'] = _pack_strings(vocabulary)
+        arrays['tconst_offsets'], arrays['tconst_data'] = _pack_strings(data['tconst'].astype(str))
+        arrays['title_offsets'], arrays['title_data'] = _pack_strings(primary)
+
+        # Сборка во временной папке и замена целиком: читатель не увидит наполовину записанный индекс
+        temp_folder = f"{folder}.tmp"
+        shutil.rmtree(temp_folder, ignore_errors=True)
+        os.makedirs(temp_folder)
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_folder, f"{name}.npy"), array)
+        meta = {'version': INDEX_VERSION, 'fingerprint': fingerprint, 'rows': len(data),
+                'tokens': len(vocabulary), 'types': [str(title_type) for title_type in types]}
+        with open(os.path.join(temp_folder, "meta.json"), "w", encoding="utf-8") as meta_file:
+            json.dump(meta, meta_file)
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(temp_folder, folder)
+        print(f"Поисковый индекс построен: {len(vocabulary)} слов, {len(data)} названий.")
+        return cls(folder, meta)
+
+    @property
+    def arrays(self):
+        if self._arrays is None:
+            self._arrays = {name: np.load(os.path.join(self.folder, f"{name}.npy"), mmap_mode='r')
+                            for name in self.ARRAYS}
+            self.vocabulary = _PackedStrings(self._arrays['vocab_offsets'], self._arrays['vocab_data'])
+        return self._arrays
+
+    def _postings(self, token, prefix=False):
+        arrays = self.arrays
+        key = token.encode("utf-8")
+        first = bisect.bisect_left(self.vocabulary, key)
+        if prefix:
+            # 0xFF не встречается в UTF-8, поэтому все слова с префиксом меньше key + b"\xff"
+            last = bisect.bisect_left(self.vocabulary, key + b"\xff", first)
+        else:
+            last = first + 1 if first < len(self.vocabulary) and self.vocabulary[first] == key else first
+        span = slice(arrays['posting_offsets'][first], arrays['posting_offsets'][last])
+        postings, in_primary = np.asarray(arrays['postings'][span]), np.asarray(arrays['in_primary'][span])
+        if prefix and last - first > 1:
+            # Несколько слов с префиксом: строка считается один раз, в primaryTitle - если хотя бы одно там
+            order = np.lexsort((~in_primary, postings))
+            postings, in_primary = postings[order], in_primary[order]
+            first_of_row = np.r_[True, postings[1:] != postings[:-1]]
+            return postings[first_of_row], in_primary[first_of_row]
+        return postings, in_primary
+
+    def search(self, query, limit=10):
+        tokens = list(dict.fromkeys(tokenize(query)))
+        columns = ['tconst', 'primaryTitle', 'titleType', 'startYear', 'averageRating', 'numVotes']
+        if not tokens or limit <= 0:
+            return pd.DataFrame(columns=columns)
+
+        arrays = self.arrays
+        # Строки, где встретились слова запроса, и число совпавших слов для каждой
+        matches = [self._postings(token, prefix=i == len(tokens) - 1) for i, token in enumerate(tokens)]
+        all_rows = np.concatenate([postings for postings, _ in matches])
+        rows, inverse, matched = np.unique(all_rows, return_inverse=True, return_counts=True)
+        matched_primary = np.bincount(inverse, weights=np.concatenate([flags for _, flags in matches]),
+                                      minlength=len(rows))
+        # Остаются строки, где совпали все слова запроса
+        complete = matched == len(tokens)
+        rows, matched_primary = rows[complete], matched_primary[complete]
+        if not len(rows):
+            return pd.DataFrame(columns=columns)
+
+        token_counts = arrays['token_counts'][rows]
+        num_votes = arrays['num_votes'][rows]
+        # Точное совпадение: все слова запроса найдены в primaryTitle и других слов в нем нет
+        exact = (matched_primary == len(tokens)) & (token_counts == len(tokens))
+        order = np.lexsort((-num_votes, token_counts, ~exact))[:limit]
+        rows = rows[order]
+
+        tconsts = _PackedStrings(arrays['tconst_offsets'], arrays['tconst_data'])
+        titles = _PackedStrings(arrays['title_offsets'], arrays['title_data'])
+        start_year = arrays['start_year'][rows]
+        return pd.DataFrame({
+            'tconst': [tconsts[row].decode("utf-8") for row in rows],
+            'primaryTitle': [titles[row].decode("utf-8") for row in rows],
+            'titleType': [self.meta['types'][code] if code >= 0 else None for code in arrays['type_codes'][rows]],
+            'startYear': pd.Series(start_year, dtype="Int64").mask(start_year <= 0),
+            'averageRating': arrays['average_rating'][rows].astype(np.float64).round(1),
+            'numVotes': num_votes[order],
+        })
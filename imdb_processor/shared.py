@@ -0,0 +1,309 @@
+import atexit
+import multiprocessing
+import os
+import secrets
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: сегменты не лежат в /dev/shm, очистка оставшихся сегментов не нужна
+    fcntl = None
+
+
+def process_context():
+    """
+    Способ запуска процессов пулов. Пулы создаются и из фоновых потоков (BackgroundLoader, AsyncWriter):
+    fork многопоточного процесса копирует блокировки, захваченные другими потоками, и дочерний
+    процесс может зависнуть. forkserver (spawn там, где его нет) запускает процессы из чистого процесса.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Сервер один раз импортирует pandas и модули задач, процессы пулов получают их готовыми
+    context.set_forkserver_preload(["imdb_processor.reader", "imdb_processor.writer"])
+    return context
+
+
+def _release_segments(segments, unlink):
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            # На сегмент еще ссылаются массивы numpy; отображение освободится вместе с ними
+            pass
+        if unlink:
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedFrame:
+    """
+    Колонки DataFrame в разделяемой памяти (multiprocessing.shared_memory) для процессов пула.
+    Без копирования подключаются только числовые колонки (выборка rows копирует выбранные значения).
+    Категориальные колонки (коды) и строки (смещения + байты UTF-8) передаются без сериализации,
+    но в процессе пула значения собираются заново в объекты Python построчно, только для выбранных строк.
+    Процессам передается только небольшое описание (descriptor) с именами сегментов.
+
+    Сегменты удаляет создатель: close() / контекстный менеджер / сборщик мусора / выход интерпретатора.
+    При аварийном завершении сегменты освобождает resource_tracker multiprocessing,
+    а cleanup_stale() удаляет оставшиеся сегменты завершившихся запусков. Имена сегментов содержат
+    метку запуска, а запуск, пока жив, держит блокировку файла метки imdb_<метка>.lock. Блокировка
+    видна и из других пространств PID (контейнеры с общим /dev/shm), в отличие от проверки PID.
+    """
+
+    PREFIX = "imdb"
+    SHM_FOLDER = "/dev/shm"
+    _token = None
+    _lock = None
+
+    def __init__(self, descriptor, segments, owner):
+        self.descriptor = descriptor
+        self.owner = owner
+        self._segments = segments
+        self._finalizer = weakref.finalize(self, _release_segments, list(segments.values()), owner)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.descriptor['length']
+
+    @property
+    def columns(self):
+        return [spec['name'] for spec in self.descriptor['columns']]
+
+    def close(self):
+        self._finalizer()
+
+    @classmethod
+    def from_frame(cls, data):
+        cls.cleanup_stale()
+        descriptor = {'length': len(data), 'columns': []}
+        segments = {}
+        try:
+            for name in data.columns:
+                spec, arrays = cls._encode(data[name])
+                spec['name'] = name
+                spec['buffers'] = {}
+                for role, array in arrays.items():
+                    segment = shared_memory.SharedMemory(
+                        name=f"{cls.PREFIX}_{cls._run_token()}_{secrets.token_hex(4)}", create=True,
+                        size=max(1, array.nbytes))
+                    segments[segment.name] = segment
+                    np.ndarray(array.shape, array.dtype, buffer=segment.buf)[:] = array
+                    spec['buffers'][role] = (segment.name, array.dtype.str, array.shape)
+                descriptor['columns'].append(spec)
+        except BaseException:
+            _release_segments(segments.values(), unlink=True)
+            raise
+        return cls(descriptor, segments, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor):
+        segments = {}
+        for spec in descriptor['columns']:
+            for segment_name, _, _ in spec['buffers'].values():
+                try:
+                    # Python 3.13+: подключившийся процесс не регистрирует сегмент в resource_tracker
+                    segments[segment_name] = shared_memory.SharedMemory(name=segment_name, track=False)
+                except TypeError:
+                    segments[segment_name] = shared_memory.SharedMemory(name=segment_name)
+        return cls(descriptor, segments, owner=False)
+
+    @classmethod
+    def _lock_path(cls, token):
+        return os.path.join(cls.SHM_FOLDER, f"{cls.PREFIX}_{token}.lock")
+
+    @classmethod
+    def _run_token(cls):
+        # Метка запуска для имен сегментов; файл метки заблокирован, пока процесс жив
+        if cls._token is None:
+            token = secrets.token_hex(6)
+            if fcntl is not None and os.path.isdir(cls.SHM_FOLDER):
+                cls._lock = cls._hold_lock(cls._lock_path(token))
+                atexit.register(cls._release_lock, cls._lock_path(token), os.getpid())
+            cls._token = token
+        return cls._token
+
+    @staticmethod
+    def _hold_lock(path):
+        while True:
+            lock = open(path, "a+b")
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Файл мог удалить cleanup_stale другого процесса, пока блокировка ожидалась
+                if os.path.samestat(os.fstat(lock.fileno()), os.stat(path)):
+                    return lock
+            except FileNotFoundError:
+                pass
+            lock.close()
+
+    @classmethod
+    def _release_lock(cls, path, pid):
+        # Только в создавшем процессе: дочерние процессы наследуют обработчики atexit
+        if os.getpid() == pid and os.path.exists(path):
+            os.remove(path)
+
+    @classmethod
+    def cleanup_stale(cls):
+        # Сегменты запусков, которые завершились аварийно: их файл метки никто не блокирует
+        if fcntl is None or not os.path.isdir(cls.SHM_FOLDER):
+            return
+        for name in os.listdir(cls.SHM_FOLDER):
+            if not name.startswith(f"{cls.PREFIX}_") or not name.endswith(".lock"):
+                continue
+            token = name[len(cls.PREFIX) + 1:-len(".lock")]
+            if token == cls._token:
+                continue
+            try:
+                lock = open(os.path.join(cls.SHM_FOLDER, name), "rb")
+            except FileNotFoundError:
+                continue
+            with lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Запуск жив (в этом или другом пространстве PID)
+                    continue
+                prefix = f"{cls.PREFIX}_{token}_"
+                for segment_name in os.listdir(cls.SHM_FOLDER):
+                    if segment_name.startswith(prefix):
+                        try:
+                            os.remove(os.path.join(cls.SHM_FOLDER, segment_name))
+                        except OSError:
+                            pass
+                os.remove(lock.name)
+
+    @staticmethod
+    def _encode(series):
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+            return {'kind': 'numeric'}, {'values': series.to_numpy()}
+
+        values = series.to_numpy(dtype=object)
+        codes, categories = pd.factorize(values)
+        spec = {'dtype': str(dtype)}
+        if len(categories) <= max(1, len(values) // 2):
+            # Мало уникальных значений (titleType, genres): достаточно кодов и словаря
+            spec.update(kind='category', categories=list(categories))
+            return spec, {'codes': codes.astype(np.int32)}
+
+        missing = pd.isna(values)
+        encoded = [SharedFrame._encode_text(value) if not is_missing else b""
+                   for value, is_missing in zip(values, missing)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        spec['kind'] = 'string'
+        return spec, {'offsets': offsets, 'data': data, 'missing': missing.astype(np.bool_)}
+
+    @staticmethod
+    def _encode_text(value):
+        # Строковая колонка передается байтами UTF-8; смешанные типы (числа, bytes) так не восстановить
+        if not isinstance(value, str):
+            raise TypeError(f"Строковая колонка содержит значение типа {type(value).__name__}")
+        return value.encode("utf-8")
+
+    def _array(self, spec, role):
+        segment_name, dtype, shape = spec['buffers'][role]
+        array = np.ndarray(shape, np.dtype(dtype), buffer=self._segments[segment_name].buf)
+        array.flags.writeable = False
+        return array
+
+    def _spec(self, name):
+        for spec in self.descriptor['columns']:
+            if spec['name'] == name:
+                return spec
+        raise KeyError(name)
+
+    def rows_where(self, name, value):
+        # Номера строк, где колонка равна значению; для категорий сравниваются только коды
+        spec = self._spec(name)
+        if spec['kind'] == 'category':
+            if value not in spec['categories']:
+                return np.array([], dtype=np.int64)
+            return np.flatnonzero(self._array(spec, 'codes') == spec['categories'].index(value))
+        return np.flatnonzero(self.column(name).to_numpy() == value)
+
+    def column(self, name, rows=None):
+        spec = self._spec(name)
+        if spec['kind'] == 'numeric':
+            values = self._array(spec, 'values')
+            return pd.Series(values if rows is None else values[rows], name=name, copy=False)
+
+        if spec['kind'] == 'category':
+            codes = self._array(spec, 'codes')
+            categories = np.empty(len(spec['categories']) + 1, dtype=object)
+            categories[:-1] = spec['categories']
+            categories[-1] = np.nan
+            values = categories[codes if rows is None else codes[rows]]
+        else:
+            offsets = self._array(spec, 'offsets')
+            missing = self._array(spec, 'missing')
+            data = memoryview(self._array(spec, 'data'))
+            rows = range(len(self)) if rows is None else rows
+            values = np.array([np.nan if missing[i] else str(data[offsets[i]:offsets[i + 1]], "utf-8")
+                               for i in rows], dtype=object)
+        series = pd.Series(values, name=name, dtype=object)
+        return series if spec['dtype'] == 'object' else series.astype(spec['dtype'])
+
+    def to_frame(self, columns=None, rows=None):
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({name: self.column(name, rows) for name in columns}, copy=False)
+
+
+# Кадр в разделяемой памяти, подключенный в процессе пула (см. map_shared_frame)
+_worker_shared_frame = None
+
+
+def _attach_worker_shared_frame(descriptor):
+    global _worker_shared_frame
+    _worker_shared_frame = SharedFrame.attach(descriptor)
+
+
+def _call_with_shared_frame(func, task):
+    return func(_worker_shared_frame, task)
+
+
+def map_shared_frame(data, func, tasks, workers=None):
+    """
+    Выполняет func(shared_frame, task) для каждой задачи в пуле процессов.
+    Данные один раз копируются в разделяемую память, процессы подключаются к ним без сериализации.
+    func должна быть функцией уровня модуля.
+    """
+    with SharedFrame.from_frame(data) as shared:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context(),
+                                 initializer=_attach_worker_shared_frame, initargs=(shared.descriptor,)) as pool:
+            return list(pool.map(partial(_call_with_shared_frame, func), tasks))
+
+
+def imap_shared_frame(data, func, tasks, workers=None, window=None):
+    """
+    Как map_shared_frame, но результаты выдаются по порядку задач по мере готовности.
+    Одновременно в работе не больше window задач, поэтому готовые результаты не накапливаются в памяти.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or 2 * workers
+    with SharedFrame.from_frame(data) as shared:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context(),
+                                 initializer=_attach_worker_shared_frame, initargs=(shared.descriptor,)) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_call_with_shared_frame, func, task))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -0,0 +1,262 @@
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+
+
+def _tconst_keys(tconsts):
+    # Ключ титула - 64-битный хэш текста tconst
+    return pd.util.hash_array(np.asarray(tconsts, dtype=object))
+
+
+def _line_tconsts(lines):
+    return np.array([line[:line.find(b"\t")] for line in lines], dtype=object)
+
+
+def _select_lines(path, rows, chunk_bytes):
+    # Строки сжатого файла изменений с номерами rows (по возрастанию), чтение порциями
+    selected, first_row = [], 0
+    with gzip.open(path, "rb") as source:
+        while lines := source.readlines(chunk_bytes):
+            low, high = np.searchsorted(rows, [first_row, first_row + len(lines)])
+            selected.extend(lines[row] for row in rows[low:high] - first_row)
+            first_row += len(lines)
+    return selected
+
+
+class SnapshotStore:
+    """
+    Версии исходных файлов IMDb по датам без полных копий. Каждый файл (группа колонок:
+    title_basics, title_ratings) хранится как изменения относительно предыдущего снимка:
+    строки, которых не было или у которых изменился хэш строки (upserts), и ключи удаленных
+    титулов (deletes). Ключ - хэш tconst. Первый снимок содержит все строки; строки хранятся
+    в исходном тексте, сжатыми gzip, поэтому состояние на дату восстанавливается без потерь.
+    """
+
+    GROUPS = ("title_basics", "title_ratings")
+    CHUNK_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, folder):
+        self.folder = folder
+        try:
+            with open(os.path.join(folder, "snapshots.json"), encoding="utf-8") as meta_file:
+                self.meta = json.load(meta_file)
+        except (OSError, ValueError):
+            self.meta = {"version": SNAPSHOT_VERSION, "snapshots": []}
+        if self.meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия хранилища снимков в {folder}.")
+
+    def dates(self):
+        return [snapshot["date"] for snapshot in self.meta["snapshots"]]
+
+    def _save_meta(self):
+        temp_path = os.path.join(self.folder, "snapshots.json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as meta_file:
+            json.dump(self.meta, meta_file, ensure_ascii=False, indent=1)
+        os.replace(temp_path, os.path.join(self.folder, "snapshots.json"))
+
+    def _path(self, snapshot_date, group, kind):
+        return os.path.join(self.folder, snapshot_date, f"{group}.{kind}")
+
+    def add(self, raw_folder, snapshot_date=None):
+        """
+        Добавляет снимок файлов из raw_folder на дату snapshot_date (ISO, по умолчанию сегодня).
+        Снимки добавляются по возрастанию дат.
+        """
+        snapshot_date = date.fromisoformat(snapshot_date or date.today().isoformat()).isoformat()
+        dates = self.dates()
+        if dates and snapshot_date <= dates[-1]:
+            raise ValueError(f"Снимок {snapshot_date} должен быть позже последнего ({dates[-1]}).")
+        previous = dates[-1] if dates else None
+
+        folder = os.path.join(self.folder, snapshot_date)
+        temp_folder = folder + ".tmp"
+        shutil.rmtree(temp_folder, ignore_errors=True)
+        os.makedirs(temp_folder)
+        snapshot = {"date": snapshot_date, "groups": {}}
+        try:
+            for group in self.GROUPS:
+                snapshot["groups"][group] = self._add_group(os.path.join(raw_folder, f"{group}.tsv"), temp_folder,
+                                                            group, previous)
+        except BaseException:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+            raise
+        os.replace(temp_folder, folder)
+        self.meta["snapshots"].append(snapshot)
+        self._save_meta()
+        # Хэши строк нужны только последнему снимку: с ним сравнивается следующий
+        if previous is not None:
+            for group in self.GROUPS:
+                for kind in ("head_keys.npy", "head_rows.npy"):
+                    os.remove(self._path(previous, group, kind))
+        return snapshot
+
+    def _add_group(self, path, folder, group, previous):
+        if previous is None:
+            head_keys = head_rows = np.array([], dtype=np.uint64)
+        else:
+            head_keys = np.load(self._path(previous, group, "head_keys.npy"))
+            head_rows = np.load(self._path(previous, group, "head_rows.npy"))
+
+        all_keys, all_rows, upsert_keys = [], [], []
+        ordered, last = True, None
+        with open(path, "rb") as source, \
+                gzip.open(os.path.join(folder, f"{group}.upserts.tsv.gz"), "wb", compresslevel=6) as upserts:
+            header = source.readline()
+            while lines := source.readlines(self.CHUNK_BYTES):
+                if not lines[-1].endswith(b"\n"):
+                    lines[-1] += b"\n"
+                tconsts = _line_tconsts(lines)
+                keys = _tconst_keys(tconsts)
+                rows = pd.util.hash_array(np.array(lines, dtype=object))
+
+                positions = np.searchsorted(head_keys, keys).clip(0, max(len(head_keys) - 1, 0))
+                known = (head_keys[positions] == keys) if len(head_keys) else np.zeros(len(keys), dtype=bool)
+                changed = ~known
+                changed[known] = head_rows[positions[known]] != rows[known]
+                upserts.write(b"".join(lines[i] for i in np.flatnonzero(changed)))
+
+                all_keys.append(keys)
+                all_rows.append(rows)
+                upsert_keys.append(keys[changed])
+                if ordered:
+                    sequence = tconsts if last is None else np.concatenate(([last], tconsts))
+                    ordered = bool(np.all(self._in_order(sequence)))
+                last = tconsts[-1]
+
+        keys = np.concatenate(all_keys) if all_keys else np.array([], dtype=np.uint64)
+        rows = np.concatenate(all_rows) if all_rows else np.array([], dtype=np.uint64)
+        order = np.argsort(keys, kind='stable')
+        keys, rows = keys[order], rows[order]
+        if np.any(keys[1:] == keys[:-1]):
+            raise ValueError(f"{path}: повторяющиеся tconst.")
+        deletes = np.setdiff1d(head_keys, keys, assume_unique=True)
+        upsert_keys = np.concatenate(upsert_keys) if upsert_keys else np.array([], dtype=np.uint64)
+
+        np.save(os.path.join(folder, f"{group}.head_keys.npy"), keys)
+        np.save(os.path.join(folder, f"{group}.head_rows.npy"), rows)
+        if not ordered:
+            # Порядок строк отличается от порядка tconst: он сохраняется, чтобы восстановить файл как был
+            np.save(os.path.join(folder, f"{group}.order_keys.npy"), np.concatenate(all_keys))
+        np.save(os.path.join(folder, f"{group}.upsert_keys.npy"), upsert_keys)
+        np.save(os.path.join(folder, f"{group}.delete_keys.npy"), deletes)
+        return {"header": header.decode("utf-8"), "rows": int(len(keys)), "upserts": int(len(upsert_keys)),
+                "deletes": int(len(deletes)), "source_bytes": os.path.getsize(path), "ordered": ordered}
+
+    @staticmethod
+    def _in_order(tconsts):
+        # Порядок tconst как в файлах IMDb: по длине, затем по тексту (tt9999999 < tt10000000)
+        lengths = np.fromiter(map(len, tconsts), dtype=np.int64, count=len(tconsts))
+        return (lengths[:-1] < lengths[1:]) | ((lengths[:-1] == lengths[1:]) & (tconsts[:-1] < tconsts[1:]))
+
+    def _snapshots_until(self, snapshot_date):
+        snapshot_date = date.fromisoformat(snapshot_date).isoformat()
+        snapshots = [snapshot for snapshot in self.meta["snapshots"] if snapshot["date"] <= snapshot_date]
+        if not snapshots:
+            raise ValueError(f"Нет снимков на дату {snapshot_date}.")
+        return snapshots
+
+    def _lines_as_of(self, snapshots, group, keys=None):
+        # Для каждого ключа берется последнее событие до даты; титул жив, если это upsert
+        event_keys, event_snapshots, event_lines = [], [], []
+        for i, snapshot in enumerate(snapshots):
+            upserted = np.load(self._path(snapshot["date"], group, "upsert_keys.npy"))
+            deleted = np.load(self._path(snapshot["date"], group, "delete_keys.npy"))
+            event_keys += [upserted, deleted]
+            event_snapshots.append(np.full(len(upserted) + len(deleted), i))
+            event_lines += [np.arange(len(upserted)), np.full(len(deleted), -1)]
+        event_keys = np.concatenate(event_keys)
+        event_snapshots = np.concatenate(event_snapshots)
+        event_lines = np.concatenate(event_lines)
+        if keys is not None:
+            wanted = np.isin(event_keys, keys)
+            event_keys, event_snapshots, event_lines = event_keys[wanted], event_snapshots[wanted], event_lines[wanted]
+
+        order = np.lexsort((event_snapshots, event_keys))
+        last = order[np.append(event_keys[order][1:] != event_keys[order][:-1], True)] if len(order) else order
+        live = last[event_lines[last] >= 0]
+
+        lines = []
+        for i, snapshot in enumerate(snapshots):
+            rows = np.sort(event_lines[live[event_snapshots[live] == i]])
+            if len(rows):
+                lines += _select_lines(self._path(snapshot["date"], group, "upserts.tsv.gz"), rows, self.CHUNK_BYTES)
+        if not lines:
+            return lines
+        tconsts = _line_tconsts(lines)
+        if snapshots[-1]["groups"][group]["ordered"]:
+            lengths = np.fromiter(map(len, tconsts), dtype=np.int64, count=len(tconsts))
+            order = np.lexsort((np.array(tconsts, dtype=bytes), lengths))
+        else:
+            order_keys = np.load(self._path(snapshots[-1]["date"], group, "order_keys.npy"))
+            sorter = np.argsort(order_keys)
+            order = np.argsort(sorter[np.searchsorted(order_keys, _tconst_keys(tconsts), sorter=sorter)])
+        return [lines[i] for i in order]
+
+    def as_of(self, snapshot_date, group="title_ratings", tconsts=None):
+        """
+        Файл group в состоянии на дату snapshot_date (последний снимок не позже даты),
+        разобранный так же, как исходный TSV. tconsts - только эти титулы.
+        Строки идут в том же порядке, что и в исходном файле снимка.
+        """
+        snapshots = self._snapshots_until(snapshot_date)
+        keys = None if tconsts is None else _tconst_keys([tconst.encode("utf-8") for tconst in tconsts])
+        return self._read(snapshots[-1], group, self._lines_as_of(snapshots, group, keys))
+
+    @staticmethod
+    def _read(snapshot, group, lines):
+        header = snapshot["groups"][group]["header"].encode("utf-8")
+        return pd.read_csv(io.BytesIO(header + b"".join(lines)), sep='\t', quoting=csv.QUOTE_NONE, low_memory=False)
+
+    def restore(self, snapshot_date, raw_folder):
+        # Исходные файлы на дату snapshot_date в raw_folder: с ними работает обычная обработка
+        snapshots = self._snapshots_until(snapshot_date)
+        if not os.path.exists(raw_folder):
+            os.makedirs(raw_folder)
+        paths = []
+        for group in self.GROUPS:
+            path = os.path.join(raw_folder, f"{group}.tsv")
+            with open(path + ".tmp", "wb") as output:
+                output.write(snapshots[-1]["groups"][group]["header"].encode("utf-8"))
+                output.writelines(self._lines_as_of(snapshots, group))
+            os.replace(path + ".tmp", path)
+            paths.append(path)
+        return paths
+
+    def rating_changes(self, first, second):
+        """
+        Изменения рейтинга и числа голосов по титулам между снимками на даты first и second.
+        Читаются только строки титулов, измененных между снимками. Титул, которого нет в одном
+        из снимков, получает пропуски с этой стороны.
+        """
+        group = "title_ratings"
+        old_snapshots, new_snapshots = self._snapshots_until(first), self._snapshots_until(second)
+        between = [snapshot for snapshot in new_snapshots if snapshot["date"] > old_snapshots[-1]["date"]]
+        keys = np.unique(np.concatenate(
+            [np.load(self._path(snapshot["date"], group, kind))
+             for snapshot in between for kind in ("upsert_keys.npy", "delete_keys.npy")]
+            or [np.array([], dtype=np.uint64)]))
+
+        old = self._read(old_snapshots[-1], group, self._lines_as_of(old_snapshots, group, keys))
+        new = self._read(new_snapshots[-1], group, self._lines_as_of(new_snapshots, group, keys))
+        changes = pd.merge(old, new, on='tconst', how='outer', suffixes=('_old', '_new'))
+        changes['ratingDelta'] = changes['averageRating_new'] - changes['averageRating_old']
+        changes['votesDelta'] = changes['numVotes_new'] - changes['numVotes_old']
+        changed = ((changes['ratingDelta'] != 0) | (changes['votesDelta'] != 0)
+                   | changes[['averageRating_old', 'averageRating_new']].isna().any(axis=1))
+        return changes[changed].sort_values('votesDelta', ascending=False, kind='stable').reset_index(drop=True)
+
+    def storage(self):
+        # Размер снимков на диске против полных несжатых копий исходных файлов
+        stored = sum(os.path.getsize(os.path.join(root, name))
+                     for root, _, names in os.walk(self.folder) for name in names)
+        full = sum(group["source_bytes"] for snapshot in self.meta["snapshots"] for group in snapshot["groups"].values())
+        return stored, full
@@ -0,0 +1,186 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import pandas as pd
+
+from .files import FileManager
+from .titles import restore_titles
+
+SQLITE_VERSION = 1
+# Индекс по titleType составной: отбор по типу сразу отдает строки в порядке рейтинга для ТОП-выборки
+INDEXES = (("tconst",), ("titleType", "averageRating"), ("startYear",), ("averageRating",))
+
+
+def _connect_readonly(path):
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def _sql_type(dtype):
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+class SQLiteDataset:
+    """
+    Объединенные данные в локальной базе SQLite (Raw/imdb.sqlite) с индексами по tconst, titleType,
+    startYear и averageRating. Интерфейс тот же, что у ChunkedDataset (where, iter_chunks, read, unique),
+    поэтому DataProcessor работает с базой без загрузки данных в память: отбор и ТОП выполняются запросами.
+    Строки хранятся в порядке исходных данных (rowid), типы колонок pandas - в таблице meta.
+    """
+
+    TABLE = "titles"
+    BATCH_ROWS = 50_000
+
+    def __init__(self, path, chunksize=200_000, conditions=(), order="rowid", meta=None):
+        self.path = path
+        self.chunksize = chunksize
+        self.conditions = conditions
+        self.order = order
+        self.meta = meta if meta is not None else self._read_meta(path)
+
+    @staticmethod
+    def _read_meta(path):
+        with closing(_connect_readonly(path)) as connection:
+            return {key: json.loads(value) for key, value in connection.execute("SELECT key, value FROM meta")}
+
+    @classmethod
+    def open(cls, path):
+        try:
+            dataset = cls(path)
+        except sqlite3.Error:
+            return None
+        return dataset if dataset.meta.get("version") == SQLITE_VERSION else None
+
+    @classmethod
+    def open_or_build(cls, raw_folder, data=None, filename="imdb.sqlite"):
+        # База пересобирается, если исходные файлы изменились после ее построения
+        path = os.path.join(raw_folder, filename)
+        fingerprint = FileManager.fingerprint([os.path.join(raw_folder, "title_basics.tsv"),
+                                               os.path.join(raw_folder, "title_ratings.tsv")])
+        dataset = cls.open(path) if os.path.exists(path) else None
+        if dataset is not None and dataset.meta["fingerprint"] == fingerprint:
+            return dataset
+        if data is None:
+            from .reader import DataReader
+
+            data = DataReader.load_data(raw_folder)
+        dataset = cls.build(data, path, fingerprint)
+        print(f"База SQLite построена за {dataset.meta['load_seconds']:.2f} с: {path}")
+        return dataset
+
+    @classmethod
+    def build(cls, data, path, fingerprint=None):
+        """
+        Загрузка данных в базу пакетами executemany в одной транзакции; индексы строятся после вставки.
+        База собирается во временном файле и заменяет прежнюю целиком.
+        """
+        start = time.perf_counter()
+        data = restore_titles(data)
+        columns = list(data.columns)
+        temp_path = path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        with closing(sqlite3.connect(temp_path, isolation_level=None)) as connection:
+            # Файл временный: журнал и синхронизация на время загрузки не нужны
+            connection.execute("PRAGMA journal_mode=OFF")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute("BEGIN")
+            definitions = ", ".join(f'"{name}" {_sql_type(data[name].dtype)}' for name in columns)
+            connection.execute(f"CREATE TABLE {cls.TABLE} ({definitions})")
+            insert = f"INSERT INTO {cls.TABLE} VALUES ({', '.join('?' * len(columns))})"
+            for offset in range(0, len(data), cls.BATCH_ROWS):
+                batch = data.iloc[offset:offset + cls.BATCH_ROWS].astype(object)
+                connection.executemany(insert, batch.where(batch.notna(), None).itertuples(index=False, name=None))
+            for index in INDEXES:
+                if set(index) <= set(columns):
+                    names = ", ".join(f'"{name}"' for name in index)
+                    connection.execute(f'CREATE INDEX "idx_{"_".join(index)}" ON {cls.TABLE} ({names})')
+            meta = {"version": SQLITE_VERSION, "fingerprint": fingerprint,
+                    "dtypes": {name: str(data[name].dtype) for name in columns},
+                    "load_seconds": time.perf_counter() - start}
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", [(key, json.dumps(value))
+                                                                      for key, value in meta.items()])
+            connection.execute("COMMIT")
+        os.replace(temp_path, path)
+        return cls(path, meta=meta)
+
+    def _derive(self, conditions=None, order=None):
+        return SQLiteDataset(self.path, self.chunksize, self.conditions if conditions is None else conditions,
+                             order or self.order, self.meta)
+
+    def where(self, column, value):
+        return self.filter(f'"{column}" = ?', value)
+
+    def filter(self, condition, *params):
+        # Произвольное условие SQL, например filter('"startYear" BETWEEN ? AND ?', '1990', '1999')
+        return self._derive(self.conditions + ((condition, params),))
+
+    def _where_sql(self):
+        if not self.conditions:
+            return "", ()
+        return (" WHERE " + " AND ".join(f"({condition})" for condition, _ in self.conditions),
+                tuple(param for _, params in self.conditions for param in params))
+
+    def _select(self, columns, suffix=""):
+        where, params = self._where_sql()
+        names = "*" if columns is None else ", ".join(f'"{name}"' for name in columns)
+        return f"SELECT {names} FROM {self.TABLE}{where}{suffix}", params
+
+    def _typed(self, frame):
+        # Типы колонок те же, что у данных до загрузки: записанные CSV совпадают побайтно
+        return frame.astype({name: self.meta["dtypes"][name] for name in frame.columns})
+
+    def query(self, sql, params=()):
+        with closing(_connect_readonly(self.path)) as connection:
+            return pd.read_sql_query(sql, connection, params=params)
+
+    def _scalar(self, sql, params):
+        with closing(_connect_readonly(self.path)) as connection:
+            return connection.execute(sql, params).fetchone()[0]
+
+    def iter_chunks(self, columns=None):
+        sql, params = self._select(columns, f" ORDER BY {self.order}")
+        with closing(_connect_readonly(self.path)) as connection:
+            for chunk in pd.read_sql_query(sql, connection, params=params, chunksize=self.chunksize):
+                yield self._typed(chunk)
+
+    def empty(self):
+        return self._typed(pd.DataFrame(columns=list(self.meta["dtypes"])))
+
+    def read(self, columns=None):
+        frames = list(self.iter_chunks(columns))
+        if not frames:
+            return self.empty() if columns is None else self.empty()[list(columns)]
+        return pd.concat(frames, ignore_index=True)
+
+    def unique(self, column):
+        # В порядке первого появления, как pd.unique
+        sql, params = self._select([column], f' GROUP BY "{column}" ORDER BY MIN(rowid)')
+        return self.query(sql, params)[column].to_numpy()
+
+    def __len__(self):
+        where, params = self._where_sql()
+        return self._scalar(f"SELECT COUNT(*) FROM {self.TABLE}{where}", params)
+
+    def top(self, top_level):
+        """
+        ТОП-выборка как DataProcessor.get_top_records: порог - n-е по величине значение averageRating
+        (по индексу), ничьи на пороге входят, строки по возрастанию рейтинга и в исходном порядке.
+        """
+        where, params = self._where_sql()
+        known_where = (where + " AND" if where else " WHERE") + ' "averageRating" IS NOT NULL'
+        known = self._scalar(f"SELECT COUNT(*) FROM {self.TABLE}{known_where}", params)
+        num_top_records = min(int((len(self) * top_level) / 100), known)
+        if num_top_records <= 0:
+            return self.filter("0")
+        threshold = self._scalar(f'SELECT "averageRating" FROM {self.TABLE}{known_where} '
+                                 f'ORDER BY "averageRating" DESC LIMIT 1 OFFSET ?', params + (num_top_records - 1,))
+        top_records = self.filter('"averageRating" >= ?', threshold)
+        return top_records._derive(order='"averageRating", rowid')
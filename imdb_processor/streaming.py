@@ -0,0 +1,154 @@
+import csv
+import io
+import os
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .reader import IMDB_TEXT_COLUMNS, unify_frames
+from .titles import compact_titles
+
+# Маркер конца потока в очередях конвейера
+_END = None
+
+
+class QueueReader(io.RawIOBase):
+    """
+    Файлоподобный объект поверх очереди блоков байт: pandas читает из него, пока блоки еще приходят.
+    Исключение, положенное в очередь предыдущей стадией, поднимается у читателя.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.block = memoryview(b"")
+        self.finished = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not len(self.block) and not self.finished:
+            item = self.blocks.get()
+            if item is _END:
+                self.finished = True
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                self.block = memoryview(item)
+        size = min(len(buffer), len(self.block))
+        buffer[:size] = self.block[:size]
+        self.block = self.block[size:]
+        return size
+
+
+class PipelinedLoader:
+    """
+    Конвейер загрузки одного файла: HTTP поток -> поток распаковки -> разбор порциями.
+    Стадии связаны ограниченными очередями, поэтому разбор начинается, пока байты еще приходят,
+    а память не растет, если одна из стадий медленнее остальных.
+    Распакованный файл параллельно пишется на диск, чтобы следующие запуски читали его из Raw/.
+    """
+
+    def __init__(self, queue_size=16, block_size=1024 * 1024, chunksize=200_000):
+        self.queue_size = queue_size
+        self.block_size = block_size
+        self.chunksize = chunksize
+
+    def load(self, url, dest_path=None):
+        compressed = queue.Queue(self.queue_size)
+        extracted = queue.Queue(self.queue_size)
+        stop = threading.Event()
+
+        stages = [
+            threading.Thread(target=self._download, args=(url, compressed, stop), daemon=True),
+            threading.Thread(target=self._decompress, args=(compressed, extracted, dest_path, stop), daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+        try:
+            stream = io.BufferedReader(QueueReader(extracted), self.block_size)
+            chunks = list(pd.read_csv(stream, sep='\t', quoting=csv.QUOTE_NONE, chunksize=self.chunksize,
+                                      dtype={name: str for name in IMDB_TEXT_COLUMNS}))
+        finally:
+            # При ошибке разбора останавливаем загрузку и распаковку
+            stop.set()
+            for stage in stages:
+                stage.join()
+        return pd.concat(unify_frames(chunks), ignore_index=True)
+
+    def _put(self, blocks, item, stop):
+        while not stop.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _download(self, url, compressed, stop):
+        import requests
+
+        try:
+            with requests.get(url, stream=True) as response:
+                if response.status_code != 200:
+                    raise Exception(f"Ошибка загрузки файла: {url}, код ответа {response.status_code}")
+                for block in response.iter_content(self.block_size):
+                    if not self._put(compressed, block, stop):
+                        return
+            self._put(compressed, _END, stop)
+        except BaseException as e:
+            self._put(compressed, e, stop)
+
+    def _decompress(self, compressed, extracted, dest_path, stop):
+        partial_path = f"{dest_path}.part" if dest_path else None
+        output = open(partial_path, "wb") if partial_path else None
+        try:
+            # 16 + MAX_WBITS - формат gzip; архив может состоять из нескольких gzip-членов подряд
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            while True:
+                block = compressed.get()
+                if isinstance(block, BaseException):
+                    raise block
+                if block is _END:
+                    break
+                data = decompressor.decompress(block)
+                while decompressor.eof and decompressor.unused_data:
+                    rest = decompressor.unused_data
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    data += decompressor.decompress(rest)
+                if data:
+                    if output:
+                        output.write(data)
+                    if not self._put(extracted, data, stop):
+                        return
+            if not decompressor.eof:
+                raise EOFError("Архив оборвался до конца gzip потока.")
+            if output:
+                output.close()
+                os.replace(partial_path, dest_path)
+                output = None
+            self._put(extracted, _END, stop)
+        except BaseException as e:
+            self._put(extracted, e, stop)
+        finally:
+            if output:
+                output.close()
+                os.remove(partial_path)
+
+
+def load_data_pipelined(urls, raw_folder, loader=None):
+    """
+    Загрузка, распаковка и разбор title.basics и title.ratings одновременно:
+    общее время стремится к max(сеть, разбор), а не к их сумме.
+    """
+    loader = loader or PipelinedLoader()
+    names = ["title_basics", "title_ratings"]
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        futures = {name: pool.submit(loader.load, urls[name], os.path.join(raw_folder, f"{name}.tsv"))
+                   for name in names}
+        frames = {name: future.result() for name, future in futures.items()}
+    return compact_titles(pd.merge(frames["title_basics"], frames["title_ratings"], on='tconst', how='inner'),
+                          diff=False)
@@ -0,0 +1,37 @@
+import importlib.util
+
+
+# Строки в Arrow (один буфер данных и смещения) вместо Python-объектов, если установлен pyarrow
+TITLE_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else object
+# originalTitle хранится только там, где отличается от primaryTitle
+ORIGINAL_DIFF = "originalTitle_diff"
+
+
+def compact_titles(frame, diff=True):
+    """
+    Компактное хранение названий: primaryTitle и originalTitle переводятся в Arrow-строки,
+    а originalTitle заменяется колонкой originalTitle_diff, пустой там, где названия совпадают.
+    Полная колонка восстанавливается restore_titles. diff=False - только Arrow-строки, колонка
+    originalTitle остается: так кадры отдаются наружу (load_data, движки), а originalTitle_diff
+    используют только те, кто сам хранит данные и пишет их через DataProcessor (меню, сервер).
+    """
+    if "primaryTitle" not in frame.columns or "originalTitle" not in frame.columns:
+        return frame
+    primary = frame["primaryTitle"].astype(TITLE_DTYPE)
+    original = frame["originalTitle"].astype(TITLE_DTYPE)
+    compacted = frame.assign(primaryTitle=primary, originalTitle=original)
+    if not diff or (original.isna() & primary.notna()).any():
+        # Пропуск в originalTitle при заполненном primaryTitle нельзя отличить от совпадения
+        return compacted
+    same = (original == primary).fillna(False).to_numpy(dtype=bool) | original.isna().to_numpy()
+    compacted["originalTitle"] = original.mask(same)
+    return compacted.rename(columns={"originalTitle": ORIGINAL_DIFF})
+
+
+def restore_titles(frame):
+    # Обратное преобразование для записи и сортировки; кадр без compact_titles возвращается как есть
+    if ORIGINAL_DIFF not in frame.columns:
+        return frame
+    restored = frame.rename(columns={ORIGINAL_DIFF: "originalTitle"})
+    restored["originalTitle"] = restored["originalTitle"].fillna(restored["primaryTitle"])
+    return restored
@@ -0,0 +1,133 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .shared import imap_shared_frame
+from .titles import restore_titles
+
+
+class AsyncWriter:
+    """
+    Фоновая запись независимых файлов результатов в ограниченном пуле потоков.
+    Файл пишется во временный файл рядом с целевым и переименовывается os.replace, поэтому
+    по целевому пути никогда не виден недописанный файл. submit блокируется, если в очереди
+    уже max_pending записей (данные не накапливаются в памяти); wait - барьер завершения,
+    на котором поднимается первая ошибка записи. deferred=True - сообщения о готовых файлах
+    не печатаются из потоков записи, а копятся до print_messages (например, между вопросами меню).
+    """
+
+    def __init__(self, workers=2, max_pending=4, deferred=False):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imdb-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+        # (путь, ошибка) неудачных записей, собранные последним wait
+        self.failures = []
+        self.deferred = deferred
+        self._messages = queue.SimpleQueue()
+
+    def submit(self, path, write, message=None):
+        # write(temp_path) записывает файл; message печатается, когда файл уже на месте
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._write, path, write, message)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._futures.append((path, future))
+        return future
+
+    def _write(self, path, write, message):
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            self._slots.release()
+        if message:
+            if self.deferred:
+                self._messages.put(message)
+            else:
+                print(message)
+        return path
+
+    def print_messages(self):
+        while True:
+            try:
+                print(self._messages.get_nowait())
+            except queue.Empty:
+                return
+
+    def wait(self):
+        # Барьер: дожидается всех отправленных записей, затем поднимает первую ошибку;
+        # все неудачные записи с путями остаются в failures
+        futures, self._futures = self._futures, []
+        errors = [future.exception() for _, future in futures]
+        self.print_messages()
+        self.failures = [(path, error) for (path, _), error in zip(futures, errors) if error is not None]
+        if self.failures:
+            raise self.failures[0][1]
+        return [future.result() for _, future in futures]
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Ошибка вычислений важнее ошибки записи: дожидаемся записей, но поднимаем исходную
+            try:
+                self.close()
+            except Exception:
+                pass
+
+
+class ParallelCSVWriter:
+    """
+    Запись CSV, побайтно совпадающая с DataFrame.to_csv(index=False) (для компактных названий -
+    с restore_titles): порции строк форматируются в пуле процессов, которые читают данные
+    из разделяемой памяти, а готовый текст порций пишется в файл строго по порядку.
+    Небольшие кадры пишутся обычным to_csv: запуск пула дороже самой записи.
+    """
+
+    def __init__(self, workers=None, chunk_rows=100_000, min_rows=200_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self.min_rows = min_rows
+
+    def accepts(self, data):
+        return self.workers > 1 and len(data) >= max(1, self.min_rows)
+
+    def write(self, data, output_file):
+        if not self.accepts(data):
+            restore_titles(data).to_csv(output_file, index=False)
+            return
+        tasks = [(start, min(start + self.chunk_rows, len(data)), start == 0)
+                 for start in range(0, len(data), self.chunk_rows)]
+        try:
+            with open(output_file, "w", encoding="utf-8", newline="") as output:
+                for text in imap_shared_frame(data, _format_csv_rows, tasks, self.workers):
+                    output.write(text)
+        except (TypeError, ValueError, OSError) as e:
+            # Колонку нельзя передать через разделяемую память (например, смешанные типы) - обычная запись
+            print(f"Параллельная запись CSV не удалась ({e}), используется to_csv.")
+            restore_titles(data).to_csv(output_file, index=False)
+
+
+def _format_csv_rows(shared, task):
+    start, end, header = task
+    frame = shared.to_frame(rows=np.arange(start, end))
+    return restore_titles(frame).to_csv(index=False, header=header)
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.cli import main
+
+
+@pytest.fixture(scope='module')
+def raw(tmp_path_factory):
+    return make_synthetic_dumps(str(tmp_path_factory.mktemp('raw')), rows=3_000)
+
+
+def test_grouped(raw, tmp_path, capsys):
+    assert main(['grouped', 'titleType', 'decade', '--top-n', '3', '--raw', raw, '--result', str(tmp_path)]) == 0
+    result = pd.read_csv(tmp_path / 'grouped_top_3_by_titleType_decade.csv')
+    assert result.groupby(['titleType', 'decade'])['rank'].max().le(3).all()
+    assert f"записей: {len(result)}" in capsys.readouterr().out
+
+
+def test_genres(raw, tmp_path):
+    assert main(['genres', 'Drama', 'Comedy', '--mode', 'all', '--type', 'movie', '--raw', raw,
+                 '--result', str(tmp_path)]) == 0
+    result = pd.read_csv(tmp_path / 'genre_all_Drama_Comedy_movie.csv')
+    assert len(result) and (result['titleType'] == 'movie').all()
+    assert result['genres'].str.contains('Drama').all() and result['genres'].str.contains('Comedy').all()
+    assert main(['genres', 'Drama', '--top', '4', '--raw', raw, '--result', str(tmp_path)]) == 0
+    assert len(pd.read_csv(tmp_path / 'genre_top_4_Drama_all_types.csv')) == 4
+
+
+def test_years(raw, tmp_path, capsys):
+    assert main(['years', '--from', '1990', '--to', '1999', '--type', 'movie', '--raw', raw,
+                 '--result', str(tmp_path)]) == 0
+    result = pd.read_csv(tmp_path / 'years_1990-1999_movie.csv')
+    assert len(result) and result['startYear'].between(1990, 1999).all()
+    assert main(['years', '--rollup', 'decade', '--raw', raw]) == 0
+    assert 'averageRating' in capsys.readouterr().out
+
+
+def _episodes(raw):
+    basics = pd.read_csv(f'{raw}/title_basics.tsv', sep='\t', quoting=3, dtype=str)
+    series = basics.loc[basics['titleType'] == 'tvSeries', 'tconst'].head(20).tolist()
+    episodes = basics.loc[basics['titleType'] == 'tvEpisode', ['tconst']].reset_index(drop=True)
+    episodes['parentTconst'] = [series[i % len(series)] for i in range(len(episodes))]
+    episodes['seasonNumber'] = [str(i % 3 + 1) if i % 5 else '\\N' for i in range(len(episodes))]
+    episodes['episodeNumber'] = [str(i % 10 + 1) for i in range(len(episodes))]
+    episodes.to_csv(f'{raw}/title_episode.tsv', sep='\t', index=False)
+
+
+def test_subcommands_smoke(raw, tmp_path, monkeypatch, capsys):
+    raw = shutil.copytree(raw, tmp_path / 'raw')
+    _episodes(raw)
+    bronze = tmp_path / 'bronze'
+    bronze.mkdir()
+    for name in ('basics', 'ratings'):
+        shutil.copy(raw / f'title_{name}.tsv', bronze / f'title.{name}.tsv')
+    result, snapshots = tmp_path / 'result', tmp_path / 'snapshots'
+    monkeypatch.chdir(tmp_path)
+    commands = [
+        (['datasets', '--raw', raw], []),
+        (['search', 'love', 'nig', '--raw', raw], []),
+        (['cube', '--by', 'decade', '--type', 'movie', '--genre', 'Drama', 'Comedy', '--raw', raw], []),
+        (['episodes', '--raw', raw, '--result', result, '--min-votes', '10'],
+         ['series_rollup.csv', 'season_rollup.csv']),
+        (['top', '5', '--type', 'movie', '--raw', raw, '--result', result], ['top_5.0_percent_movie.csv']),
+        (['sql', 'SELECT titleType, COUNT(*) AS n FROM titles GROUP BY titleType', '--raw', raw], []),
+        (['silver', '--bronze', bronze, '--silver', tmp_path / 'silver'], []),
+        (['transform', '--bronze', bronze, '--result', tmp_path / 'transform', '--min-votes', '10'], []),
+        (['snapshot', '--snapshots', snapshots, 'add', '--raw', raw, '--date', '2024-01-01'], []),
+        (['snapshot', '--snapshots', snapshots, 'add', '--raw', raw, '--date', '2024-02-01'], []),
+        (['snapshot', '--snapshots', snapshots, 'list'], []),
+        (['snapshot', '--snapshots', snapshots, 'diff', '2024-01-01', '2024-02-01'], []),
+        (['snapshot', '--snapshots', snapshots, 'restore', '2024-01-01', '--to', tmp_path / 'restored'], []),
+    ]
+    for argv, outputs in commands:
+        assert main([str(arg) for arg in argv]) == 0, argv
+        for filename in outputs:
+            assert (result / filename).exists(), filename
+    output = capsys.readouterr().out
+    assert 'title_basics' in output and 'Изменились рейтинг или голоса у 0 титулов.' in output
+    assert list((tmp_path / 'silver').glob('*.csv')) and list((tmp_path / 'transform').glob('*.csv'))
+    assert (tmp_path / 'restored' / 'title_ratings.tsv').read_bytes() == (raw / 'title_ratings.tsv').read_bytes()
+    assert main(['top', '100', '--raw', str(raw)]) == 2
+
+
+def test_serve_and_fetch(raw, capsys):
+    folder = tempfile.mkdtemp(prefix='cli', dir='/tmp')
+    address = os.path.join(folder, 'server.sock')
+    try:
+        server = threading.Thread(target=main, args=(['serve', '--raw', raw, '--address', address,
+                                                      '--max-requests', '1'],), daemon=True)
+        server.start()
+        # Сокет принимает соединения после загрузки данных сервером
+        for _ in range(200):
+            try:
+                assert main(['fetch', 'top:10:movie', '--address', address, '--limit', '3']) == 0
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                time.sleep(0.05)
+        server.join(10)
+        assert not server.is_alive()
+        assert ' строк, ' in capsys.readouterr().out
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+@pytest.mark.parametrize('command', ['run', 'update', 'silver', 'transform', 'search', 'cube', 'episodes', 'top',
+                                     'grouped', 'genres', 'years', 'sql', 'serve', 'fetch', 'snapshot',
+                                     'datasets', 'bench'])
+def test_subcommand_help(command, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([command, '--help'])
+    assert exit_info.value.code == 0
+    assert 'usage:' in capsys.readouterr().out
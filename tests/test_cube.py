@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.cube import AggregateCube
+from imdb_processor.reader import DataReader
+
+MIN_VOTES = 100
+
+
+def _reference(rows, by, mean_rating):
+    rows = rows.assign(product=rows['averageRating'] * rows['numVotes'])
+    grouped = rows.groupby(by, dropna=False) if by else rows.groupby(np.zeros(len(rows)))
+    totals = grouped.agg(count=('averageRating', 'size'), rating_sum=('averageRating', 'sum'),
+                         votes_sum=('numVotes', 'sum'), product_sum=('product', 'sum'))
+    result = pd.DataFrame({
+        'count': totals['count'],
+        'averageRating': totals['rating_sum'] / totals['count'],
+        'numVotes': totals['votes_sum'],
+        'voteWeightedRating': totals['product_sum'] / totals['votes_sum'],
+        'weightedRating': (totals['product_sum'] + MIN_VOTES * mean_rating) / (totals['votes_sum'] + MIN_VOTES),
+    })
+    return result.reset_index(drop=not by)
+
+
+@pytest.fixture(scope="module")
+def cube(tmp_path_factory):
+    raw = make_synthetic_dumps(str(tmp_path_factory.mktemp("cube") / "raw"), rows=20_000)
+    data = DataReader.load_data(raw)
+    years = pd.to_numeric(data['startYear'], errors='coerce').astype('Int64')
+    rows = data.assign(startYear=years, decade=years // 10 * 10)
+    return AggregateCube.open_or_build(raw, data), rows
+
+
+@pytest.mark.parametrize("by, where", [
+    (['titleType'], None),
+    (['decade'], {'titleType': 'movie'}),
+    (['titleType', 'startYear'], {'startYear': (1990, 1999)}),
+    (['genre'], {'titleType': ['movie', 'short']}),
+    ([], {'genre': 'Drama', 'decade': 2000}),
+    ([], None),
+])
+def test_query_matches_groupby(cube, by, where):
+    cube, rows = cube
+    mean_rating = rows['averageRating'].mean()
+    where = dict(where or {})
+    if 'genre' in by or 'genre' in where:
+        rows = rows.assign(genre=rows['genres'].str.split(',')).explode('genre')
+        rows = rows[rows['genre'] != '\\N']
+    for name, value in where.items():
+        if isinstance(value, tuple):
+            rows = rows[rows[name].between(*value).fillna(False)]
+        elif isinstance(value, list):
+            rows = rows[rows[name].isin(value)]
+        else:
+            rows = rows[(rows[name] == value).fillna(False)]
+
+    result = cube.query(by, where, MIN_VOTES)
+    expected = _reference(rows, by, mean_rating)
+    if by:
+        result = result.sort_values(by, ignore_index=True)
+        expected = expected.sort_values(by, ignore_index=True)
+        for name in by:
+            assert result[name].astype(object).tolist() == expected[name].astype(object).tolist()
+    assert result['count'].tolist() == expected['count'].tolist()
+    assert result['numVotes'].tolist() == expected['numVotes'].tolist()
+    for name in ('averageRating', 'voteWeightedRating', 'weightedRating'):
+        assert np.allclose(result[name], expected[name], equal_nan=True)
+
+
+def test_query_rejects_double_counting(cube):
+    cube, _ = cube
+    with pytest.raises(ValueError, match='genre'):
+        cube.query([], {'genre': ['Drama', 'Comedy']})
+    with pytest.raises(ValueError, match='Неизвестные измерения'):
+        cube.query(['runtimeMinutes'])
@@ -0,0 +1,22 @@
+import gzip
+import os
+
+from imdb_processor.decompress import ParallelGzipDecompressor
+
+
+def _payload():
+    return b"".join(f"tt{i:07d}\tmovie\tTitle {i}\t\\N\n".encode() for i in range(50_000))
+
+
+def test_single_and_multi_member_archives(tmp_path):
+    payload = _payload()
+    single = tmp_path / "single.gz"
+    single.write_bytes(gzip.compress(payload, mtime=0))
+    members = tmp_path / "members.gz"
+    members.write_bytes(b"".join(gzip.compress(payload[start:start + 100_000], mtime=0)
+                                 for start in range(0, len(payload), 100_000)))
+    for archive in (single, members):
+        output = tmp_path / "out.tsv"
+        ParallelGzipDecompressor(threads=4, block_size=64 * 1024).extract(str(archive), str(output))
+        assert output.read_bytes() == payload
+        os.remove(output)
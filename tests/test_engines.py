@@ -0,0 +1,38 @@
+import pytest
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.engines import ENGINES, get_engine
+from imdb_processor.processor import DataProcessor
+
+
+def _exports(raw, folder, name):
+    processor = DataProcessor(str(folder))
+    processor.engine = get_engine(name)
+    folder.mkdir()
+    data = processor.engine.load(raw)
+    processor.save_to_csv(data, "all.csv")
+    for title_type in ("movie", "tvSeries"):
+        processor.save_to_csv(processor.filter_by_type(data, title_type), f"{title_type}.csv")
+        for top_level in (0.5, 10.0, 100.0):
+            processor.save_top_records(processor.filter_by_type(data, title_type), top_level,
+                                       f"top_{top_level}_{title_type}.csv")
+    processor.save_top_records(data, 10.0, "top_10.0_all.csv")
+    return {path.name: path.read_bytes() for path in folder.iterdir()}
+
+
+@pytest.fixture(scope="module")
+def raw(tmp_path_factory):
+    return make_synthetic_dumps(str(tmp_path_factory.mktemp("engines") / "raw"), rows=20_000)
+
+
+@pytest.fixture(scope="module")
+def expected(raw, tmp_path_factory):
+    return _exports(raw, tmp_path_factory.mktemp("engines") / "pandas", "pandas")
+
+
+@pytest.mark.parametrize("name", [name for name in ENGINES if name != "pandas"])
+def test_engine_exports_match_pandas(raw, expected, tmp_path, name):
+    result = _exports(raw, tmp_path / name, name)
+    assert sorted(result) == sorted(expected)
+    for filename, content in expected.items():
+        assert result[filename] == content, filename
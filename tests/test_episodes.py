@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from imdb_processor.episodes import EpisodeRollup
+
+
+def _data(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = 4_000
+    data = pd.DataFrame({
+        'tconst': [f'tt{i:07d}' for i in range(1, rows + 1)],
+        'primaryTitle': [f'Title {i}' for i in range(1, rows + 1)],
+        'averageRating': rng.integers(10, 100, rows) / 10,
+        # Мало разных значений: ничьи по рейтингу и голосам внутри групп
+        'numVotes': rng.integers(0, 20, rows),
+    })
+    # Эпизоды из данных и эпизоды без рейтинга; сериалы с названием и без строки в данных
+    episode_ids = np.concatenate([np.arange(200, rows + 1), np.arange(9_000_000, 9_000_500)])
+    parents = np.concatenate([np.arange(1, 120), np.arange(8_000_000, 8_000_030)])
+    episodes = pd.DataFrame({
+        'tconst': [f'tt{i:07d}' for i in episode_ids],
+        'parentTconst': [f'tt{i:07d}' for i in rng.choice(parents, len(episode_ids))],
+        'seasonNumber': pd.array(rng.integers(1, 6, len(episode_ids)), dtype='Int64'),
+        'episodeNumber': pd.array(rng.integers(1, 30, len(episode_ids)), dtype='Int64'),
+    })
+    episodes.loc[rng.random(len(episodes)) < 0.1, 'seasonNumber'] = pd.NA
+    episodes.loc[rng.random(len(episodes)) < 0.02, 'parentTconst'] = None
+    return episodes, data
+
+
+def _reference(episodes, data, keys, min_votes):
+    joined = episodes[episodes['parentTconst'].notna()].merge(
+        data[['tconst', 'averageRating', 'numVotes']], on='tconst', how='left')
+    mean_rating = joined['averageRating'].mean()
+    rows = []
+    for key, group in joined.groupby(keys, sort=False, dropna=False):
+        rated = group[group['averageRating'].notna()]
+        product = (rated['averageRating'] * rated['numVotes']).sum()
+        best = rated.sort_values(['averageRating', 'numVotes'], kind='stable').tail(1)
+        worst = rated.sort_values(['averageRating', 'numVotes'], ascending=[True, False], kind='stable').head(1)
+        rows.append({
+            **dict(zip(keys, key if isinstance(key, tuple) else (key,))),
+            'episodes': len(group),
+            'ratedEpisodes': len(rated),
+            'averageRating': rated['averageRating'].mean(),
+            'numVotes': int(rated['numVotes'].sum()),
+            # Все голоса нулевые: 0 / 0 - пропуск, как в EpisodeRollup
+            'voteWeightedRating': product / rated['numVotes'].sum() if rated['numVotes'].sum() else np.nan,
+            'weightedRating': ((product + min_votes * mean_rating) / (rated['numVotes'].sum() + min_votes)
+                               if len(rated) else np.nan),
+            'bestEpisode': best['tconst'].iloc[0] if len(rated) else None,
+            'bestRating': best['averageRating'].iloc[0] if len(rated) else np.nan,
+            'worstEpisode': worst['tconst'].iloc[0] if len(rated) else None,
+            'worstRating': worst['averageRating'].iloc[0] if len(rated) else np.nan,
+        })
+    return pd.DataFrame(rows), joined
+
+
+def _sorted(frame, keys):
+    return frame.sort_values(keys, na_position='first', ignore_index=True)
+
+
+def test_rollups_match_groupby():
+    episodes, data = _data()
+    min_votes = 10
+    series, seasons = EpisodeRollup.build(episodes, data, min_votes)
+
+    expected, joined = _reference(episodes, data, ['parentTconst'], min_votes)
+    titles = data.set_index('tconst')['primaryTitle']
+    expected.insert(1, 'seriesTitle', expected['parentTconst'].map(titles))
+    expected.insert(2, 'seasons', expected['parentTconst'].map(
+        joined.groupby('parentTconst')['seasonNumber'].nunique()))
+    result = _sorted(series, ['parentTconst'])
+    expected = _sorted(expected, ['parentTconst'])
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    expected, _ = _reference(episodes, data, ['parentTconst', 'seasonNumber'], min_votes)
+    expected['seasonNumber'] = expected['seasonNumber'].astype('Int64')
+    pd.testing.assert_frame_equal(_sorted(seasons, ['parentTconst', 'seasonNumber']),
+                                  _sorted(expected, ['parentTconst', 'seasonNumber']), check_dtype=False)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from imdb_processor.external import ExternalJoiner, ExternalSorter
+
+
+def test_merge_keeps_input_order_of_ties(tmp_path):
+    # Много серий и мелкие блоки: равные ключи попадают на границы блоков разных серий
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"key": rng.integers(0, 20, 200_000) / 2, "position": np.arange(200_000)})
+    data.loc[rng.integers(0, len(data), 500), "key"] = np.nan
+    for ascending in (True, False):
+        sorter = ExternalSorter(str(tmp_path), memory_budget_mb=1)
+        sorter.MAX_FAN_IN = 3
+        chunks = (data.iloc[start:start + 7_000] for start in range(0, len(data), 7_000))
+        result = pd.concat(list(sorter.sort(chunks, "key", ascending)))
+        expected = data.sort_values("key", ascending=ascending, kind="stable")
+        assert result["position"].tolist() == expected["position"].tolist()
+
+
+def test_abandoned_merge_removes_runs(tmp_path):
+    data = pd.DataFrame({"key": np.arange(100_000)[::-1], "position": np.arange(100_000)})
+    chunks = (data.iloc[start:start + 5_000] for start in range(0, len(data), 5_000))
+    with ExternalSorter(str(tmp_path), memory_budget_mb=1) as sorter:
+        merged = sorter.sort(chunks, "key")
+        next(merged)
+        assert len(list(tmp_path.iterdir())) > 1
+    assert not list(tmp_path.iterdir())
+
+
+def test_partitioned_join_matches_merge(tmp_path):
+    rng = np.random.default_rng(1)
+    left = pd.DataFrame({"tconst": [f"tt{key:05d}" for key in rng.integers(0, 6_000, 30_000)],
+                         "ordering": np.arange(30_000).astype(str)})
+    right = pd.DataFrame({"tconst": [f"tt{key:05d}" for key in range(0, 5_000)],
+                          "title": [f"Title {key}" for key in range(5_000)]})
+    # Перекос: один ключ занимает большую часть правой стороны и разбивается повторно
+    right = pd.concat([right, pd.DataFrame({"tconst": "tt00007", "title": [f"Alt {i}" for i in range(5_000)]})],
+                      ignore_index=True)
+    left_path, right_path = tmp_path / "left.tsv", tmp_path / "right.tsv"
+    left.to_csv(left_path, sep="\t", index=False)
+    right.to_csv(right_path, sep="\t", index=False)
+    # Бюджет ~50 KB: правая сторона не помещается и соединяется по секциям
+    joiner = ExternalJoiner(str(tmp_path / "spill"), memory_budget_mb=0.05)
+    assert joiner.estimate_size(str(right_path)) > joiner.memory_budget / 2
+    columns = ["tconst", "ordering", "title"]
+    for how in ("inner", "left"):
+        output = tmp_path / f"{how}.csv"
+        joiner.join(str(left_path), str(right_path), on="tconst", output_path=str(output), how=how)
+        result = pd.read_csv(output, dtype=str).sort_values(columns, na_position="first", ignore_index=True)
+        expected = left.merge(right, on="tconst", how=how).sort_values(columns, na_position="first",
+                                                                         ignore_index=True)
+        assert result.equals(expected)
+    assert not list((tmp_path / "spill").iterdir())
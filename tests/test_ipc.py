@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from imdb_processor.ipc import ArrowIPCClient, ArrowIPCServer, write_ipc_file
+from imdb_processor.processor import DataProcessor
+
+
+def _frame(rows=300_000):
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        'tconst': [f'tt{i:07d}' for i in range(rows)],
+        'titleType': np.array(['movie', 'short', 'tvSeries'], dtype=object)[rng.integers(0, 3, rows)],
+        'primaryTitle': [f'Title {i}' for i in range(rows)],
+        'averageRating': np.round(rng.uniform(1, 10, rows), 1),
+        'numVotes': rng.integers(0, 10**6, rows),
+    })
+
+
+@pytest.fixture
+def address():
+    # Путь сокета Unix ограничен ~100 символами, поэтому папка короткая
+    folder = tempfile.mkdtemp(prefix="ipc", dir="/tmp")
+    yield os.path.join(folder, "server.sock")
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_server_survives_early_disconnect(address):
+    data = _frame()
+    processor = DataProcessor(os.path.dirname(address))
+    processor.write_chunk_rows = 10_000
+    server = ArrowIPCServer(data, processor, address)
+    ready = threading.Event()
+    served = []
+    thread = threading.Thread(target=lambda: served.append(server.serve(3, ready.set)), daemon=True)
+    thread.start()
+    assert ready.wait(10)
+
+    client = ArrowIPCClient(address)
+    batches = client.iter_batches('type:movie')
+    next(batches)
+    # Клиент закрывает соединение, не дочитав поток
+    batches.close()
+
+    expected = processor.filter_by_type(data, 'movie').reset_index(drop=True)
+    assert client.fetch('type:movie').to_pandas().equals(expected)
+    with pytest.raises(ValueError, match='Неизвестный запрос'):
+        client.fetch('nothing')
+    thread.join(10)
+    assert served == [3]
+
+
+def test_file_round_trip(tmp_path):
+    data = _frame(rows=1_000)
+    path = str(tmp_path / 'data.arrow')
+    chunks = (data.iloc[start:start + 300] for start in range(0, len(data), 300))
+    assert write_ipc_file(chunks, path) == len(data)
+    assert ArrowIPCClient.read_file(path).to_pandas().equals(data)
@@ -0,0 +1,31 @@
+import builtins
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.pipeline import IMDBDataPipeline
+from imdb_processor.processor import DataProcessor
+
+
+def _answer(monkeypatch, answers):
+    answers = iter(answers)
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': next(answers))
+
+
+def test_failed_background_write_is_reported(tmp_path, monkeypatch, capsys):
+    raw = make_synthetic_dumps(str(tmp_path / 'raw'), rows=2_000)
+    result = tmp_path / 'result'
+
+    def broken_write(self, data, output_file):
+        with open(output_file, 'w') as output:
+            output.write('tconst\n')
+        raise OSError('диск заполнен')
+
+    monkeypatch.setattr(DataProcessor, 'write_csv', broken_write)
+    # Файл всех типов, затем завершение и отказ от удаления исходных файлов
+    _answer(monkeypatch, ['1', '0', '0'])
+    IMDBDataPipeline(raw, str(result), {}).run()
+
+    output = capsys.readouterr().out
+    assert f"Файл не записан: {result / 'all_types_filtered.csv'} (диск заполнен)" in output
+    # Барьер записей не прервал завершение: вопрос об исходных файлах задан
+    assert 'Формирование 0 файлов завершено.' in output
+    assert not list(result.iterdir())
@@ -0,0 +1,52 @@
+import pytest
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.preview import SamplePreview
+from imdb_processor.processor import DataProcessor
+from imdb_processor.reader import DataReader
+
+
+@pytest.fixture(scope="module")
+def loaded(tmp_path_factory):
+    raw = make_synthetic_dumps(str(tmp_path_factory.mktemp("preview") / "raw"), rows=60_000)
+    return raw, DataReader.load_data(raw)
+
+
+def test_small_file_estimates_are_exact(loaded):
+    raw, data = loaded
+    preview = SamplePreview(raw, sample_mb=16).load()
+    assert preview.exact and preview.sampled_share == 1.0
+    counts = preview.counts().set_index('titleType')
+    assert counts.loc['все типы', 'estimate'] == len(data)
+    expected = data['titleType'].value_counts()
+    assert counts['estimate'].drop('все типы').sort_index().tolist() == expected.sort_index().tolist()
+    assert (counts['low'] == counts['estimate']).all() and (counts['high'] == counts['estimate']).all()
+
+    processor = DataProcessor('.')
+    for title_type in (None, 'movie', 'tvSeries'):
+        target = data if title_type is None else processor.filter_by_type(data, title_type)
+        for top_level in (0.5, 10.0, 50.0):
+            top = preview.top(top_level, title_type)
+            expected = processor.get_top_records(target, top_level)
+            assert top['count'] == len(expected)
+            assert top['threshold'] == expected['averageRating'].min()
+
+
+def test_sample_matches_data_and_intervals_cover_truth(loaded):
+    raw, data = loaded
+    preview = SamplePreview(raw, sample_mb=0.5, blocks=64, seed=0).load()
+    assert not preview.exact and preview.sampled_share < 0.5
+    # Строки выборки - те же строки объединенных данных
+    sample = preview.sample.merge(data[['tconst', 'titleType', 'averageRating']], on='tconst',
+                                  suffixes=('', '_data'))
+    assert len(sample) == len(preview.sample) == preview.sample['tconst'].nunique()
+    assert sample['titleType'].equals(sample['titleType_data'])
+    assert sample['averageRating'].equals(sample['averageRating_data'])
+
+    counts = preview.counts().set_index('titleType')
+    assert counts.loc['все типы', 'low'] <= len(data) <= counts.loc['все типы', 'high']
+    movies = (data['titleType'] == 'movie').sum()
+    assert counts.loc['movie', 'low'] <= movies <= counts.loc['movie', 'high']
+    top = preview.top(10.0)
+    expected = DataProcessor('.').get_top_records(data, 10.0)
+    assert top['threshold_low'] <= expected['averageRating'].min() <= top['threshold_high']
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from imdb_processor.processor import DataProcessor
+
+GENRES = ['Action', 'Comedy', 'Drama', 'Romance', 'Sci-Fi']
+
+
+def _titles(rows=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    genres = [','.join(sorted(rng.choice(GENRES, rng.integers(1, 4), replace=False))) for _ in range(rows)]
+    starts = rng.integers(1950, 2024, rows).astype(str).astype(object)
+    starts[rng.random(rows) < 0.05] = '\\N'
+    ends = np.full(rows, '\\N', dtype=object)
+    series = rng.random(rows) < 0.2
+    ends[series & (rng.random(rows) < 0.5)] = '2020'
+    data = pd.DataFrame({
+        'tconst': [f'tt{seed}{i:07d}' for i in range(rows)],
+        'titleType': np.where(series, 'tvSeries', np.array(['movie', 'short'])[rng.integers(0, 2, rows)]),
+        'primaryTitle': [f'Title {i}' for i in range(rows)],
+        'startYear': starts,
+        'endYear': ends,
+        'genres': genres,
+        'averageRating': np.round(rng.uniform(1, 10, rows), 1),
+        'numVotes': rng.integers(0, 10**5, rows),
+    })
+    data.loc[rng.random(rows) < 0.05, 'genres'] = '\\N'
+    return data
+
+
+def _has_genre(data, genre):
+    return data['genres'].str.split(',').apply(lambda genres: genre in genres)
+
+
+def test_genre_index_follows_the_data():
+    processor = DataProcessor('.')
+    first, second = _titles(seed=1), _titles(seed=2)
+    for data in (first, second, processor.filter_by_type(first, 'movie'), first):
+        result = processor.filter_by_genre(data, 'Drama')
+        assert result.equals(data[_has_genre(data, 'Drama')])
+
+
+def test_year_index_follows_the_data():
+    processor = DataProcessor('.')
+    first, second = _titles(seed=1), _titles(seed=2)
+    for data in (first, second, processor.filter_by_type(first, 'movie'), first):
+        years = pd.to_numeric(data['startYear'], errors='coerce')
+        assert processor.filter_by_years(data, 1990, 1999).equals(data[years.between(1990, 1999)])
+
+
+def test_budgeted_top_export_matches_in_memory(tmp_path):
+    data = _titles(rows=20_000)
+    data.loc[::50, 'averageRating'] = np.nan
+    in_memory = DataProcessor(str(tmp_path / 'memory'))
+    external = DataProcessor(str(tmp_path / 'external'), memory_budget_mb=1)
+    external.sort_folder = str(tmp_path / 'sort')
+    for processor in (in_memory, external):
+        processor.write_chunk_rows = 3_000
+        (tmp_path / processor.result_folder).mkdir()
+    for rank_by in ('averageRating', 'weightedRating'):
+        for top_level in (0.1, 30.0, 99.9):
+            for target in (data, in_memory.filter_by_type(data, 'movie'), data.iloc[0:0]):
+                filename = f'top_{rank_by}_{top_level}_{len(target)}.csv'
+                count = in_memory.save_top_records(target, top_level, filename, rank_by)
+                assert external.save_top_records(target, top_level, filename, rank_by) == count
+                assert ((tmp_path / 'external' / filename).read_bytes()
+                        == (tmp_path / 'memory' / filename).read_bytes())
+    assert not list((tmp_path / 'sort').iterdir())
+
+
+def _grouped_reference(data, key, rank_by, top_n=None, top_level=None):
+    # groupby().apply(nlargest): порядок внутри группы - рейтинг, затем голоса (ничьи в исходном порядке)
+    def take(group):
+        n = top_n if top_n is not None else int(len(group) * top_level / 100)
+        return group.nlargest(n, [rank_by, 'numVotes']).assign(rank=np.arange(1, n + 1)[:len(group)])
+
+    frames = [take(group.drop(columns=key)).assign(**{key: value}) for value, group in data.groupby(key)]
+    return pd.concat(frames)
+
+
+def test_grouped_top_matches_groupby_nlargest():
+    data = _titles(rows=5_000)
+    data['averageRating'] = np.round(data['averageRating'])
+    data['numVotes'] = data['numVotes'] // 10_000
+    processor = DataProcessor('.', min_votes=100)
+    genres = data.assign(genre=data['genres'].str.split(',')).explode('genre')
+    genres = genres[genres['genre'] != '\\N']
+    cases = [('titleType', data, 'averageRating'), ('genre', genres, 'averageRating'),
+             ('titleType', data, 'weightedRating')]
+    for key, source, rank_by in cases:
+        if rank_by == 'weightedRating':
+            source = source.assign(weightedRating=processor.weighted_rating(data))
+        for limits in ({'top_n': 7}, {'top_level': 12.5}):
+            result = processor.get_grouped_top(data, key, rank_by=rank_by, **limits)
+            expected = _grouped_reference(source, key, rank_by, **limits)
+            columns = [key, 'rank', 'tconst']
+            assert (result[columns].sort_values(columns).reset_index(drop=True)
+                    .equals(expected[columns].sort_values(columns).reset_index(drop=True)))
+
+
+def test_filter_by_genre_any_and_all():
+    data = _titles()
+    processor = DataProcessor('.')
+    drama, romance = _has_genre(data, 'Drama'), _has_genre(data, 'Romance')
+    # Совпадение с str.contains по строке жанров (жанры не являются подстроками друг друга)
+    assert drama.equals(data['genres'].str.contains('Drama'))
+    assert processor.filter_by_genre(data, ['Drama', 'Romance'], 'any').equals(data[drama | romance])
+    assert processor.filter_by_genre(data, ['Drama', 'Romance'], 'all').equals(data[drama & romance])
+
+
+def test_top_by_genre_matches_sorting():
+    data = _titles()
+    result = DataProcessor('.').get_top_by_genre(data, 5, ['Comedy', 'Sci-Fi'])
+    for genre in ('Comedy', 'Sci-Fi'):
+        expected = data[_has_genre(data, genre)].sort_values(['averageRating', 'numVotes'], ascending=False,
+                                                             kind='stable').head(5)
+        assert result[result['genre'] == genre].drop(columns='genre').equals(expected)
+
+
+def test_year_range_and_rollup():
+    data = _titles()
+    processor = DataProcessor('.')
+    starts = pd.to_numeric(data['startYear'], errors='coerce')
+    ends = pd.to_numeric(data['endYear'], errors='coerce')
+    series = data['titleType'] == 'tvSeries'
+    ends = ends.fillna(pd.Series(np.where(series, np.inf, starts), index=data.index))
+    assert processor.filter_by_years(data, last=1960).equals(data[starts <= 1960])
+    assert processor.filter_by_years(data, 2000).equals(data[starts >= 2000])
+    running = processor.filter_by_years(data, 2010, 2012, running=True)
+    assert running.equals(data[(starts <= 2012) & (ends >= 2010)])
+
+    known = data[starts.notna()].assign(decade=starts // 10 * 10)
+    expected = known.groupby(['titleType', 'decade'], as_index=False).agg(
+        count=('averageRating', 'size'), averageRating=('averageRating', 'mean'))
+    rollup = processor.year_rollup(data)
+    assert rollup['count'].tolist() == expected['count'].tolist()
+    assert rollup['decade'].tolist() == expected['decade'].astype(int).tolist()
+    assert np.allclose(rollup['averageRating'], expected['averageRating'])
+    movies = processor.year_rollup(data, 'year', 'movie')
+    assert movies['count'].sum() == ((data['titleType'] == 'movie') & starts.notna()).sum()
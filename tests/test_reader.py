@@ -0,0 +1,96 @@
+import csv
+
+import pandas as pd
+import pytest
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.memory import MemoryBudget
+from imdb_processor.processor import DataProcessor
+from imdb_processor.reader import ChunkedDataset, DataReader, ParallelTSVReader
+
+
+def _read_tsv(path):
+    return pd.read_csv(path, sep='\t', quoting=csv.QUOTE_NONE, low_memory=False)
+
+
+def test_small_shards_match_single_read(tmp_path):
+    raw = make_synthetic_dumps(str(tmp_path / "raw"), rows=20_000)
+    path = f"{raw}/title_basics.tsv"
+    expected = _read_tsv(path)
+    for workers in (1, 2):
+        reader = ParallelTSVReader(workers, max_shard_bytes=64 * 1024)
+        assert len(reader.shard_ranges(path)[1]) > 2
+        assert reader.read(path).equals(expected)
+    # Процессы пула сообщают свой пик памяти
+    assert reader.pool_size == 2 and reader.worker_peak_rss > 0
+
+
+def test_shard_schemas_are_unified(tmp_path):
+    # kind - число везде, кроме последней части ('\\N'), votes - целое в начале и дробное в конце;
+    # последняя строка без перевода строки
+    rows = [[f"tt{i:07d}", str(i % 7), str(i), f'"q{i}'] for i in range(60_000)]
+    rows[-2][1] = "\\N"
+    rows[-3][2] = "1.5"
+    path = tmp_path / "mixed.tsv"
+    path.write_text("tconst\tkind\tvotes\ttitle\n" + "\n".join("\t".join(row) for row in rows), encoding="utf-8")
+    expected = _read_tsv(path)
+    assert expected['kind'].dtype != 'int64' and expected['votes'].dtype == 'float64'
+    for workers in (1, 3):
+        reader = ParallelTSVReader(workers, max_shard_bytes=128 * 1024)
+        assert len(reader.shard_ranges(str(path))[1]) > 3
+        result = reader.read(str(path))
+        assert result.dtypes.equals(expected.dtypes)
+        assert result.equals(expected)
+
+
+def test_budgeted_load_records_pool_memory(tmp_path, monkeypatch):
+    raw = make_synthetic_dumps(str(tmp_path / "raw"), rows=20_000)
+    budget = MemoryBudget.parse("4G")
+    # Диапазоны мельче файла, чтобы разбор шел в пуле
+    monkeypatch.setattr(budget, "shard_bytes", lambda: 256 * 1024)
+    data = DataReader.load_data(raw, workers=2, budget=budget)
+    assert data.equals(DataReader.load_data(raw, workers=1))
+    # Два процесса пула, в каждом интерпретатор с pandas
+    assert budget.pool_peak_bytes > 2 * 32 * 1024 ** 2
+    # Отчет складывает пик основного процесса и процессов пула
+    tight = MemoryBudget(MemoryBudget.peak_rss()[0] + budget.pool_peak_bytes // 2)
+    tight.record_pool(2, budget.pool_peak_bytes // 2)
+    assert not tight.report()
+    # В тесный бюджет процессы пула не помещаются: разбор в основном процессе
+    assert MemoryBudget.parse("64M").pool_workers(4, 1024 * 1024, 0) == 1
+
+
+def test_spilled_length_is_cached(tmp_path, monkeypatch):
+    raw = make_synthetic_dumps(str(tmp_path / "raw"), rows=5_000)
+    dataset = DataReader.spill_data(raw, chunksize=1_000)
+    expected = DataReader.load_data(raw)
+    movies = dataset.where('titleType', 'movie')
+    assert len(movies) == (expected['titleType'] == 'movie').sum()
+
+    def scan(*args, **kwargs):
+        raise AssertionError("файл выгрузки не должен читаться заново")
+
+    monkeypatch.setattr(ChunkedDataset, "iter_chunks", scan)
+    assert len(dataset) == len(expected)
+    assert len(movies) == (expected['titleType'] == 'movie').sum()
+
+
+@pytest.fixture(scope="module")
+def loaded(tmp_path_factory):
+    raw = make_synthetic_dumps(str(tmp_path_factory.mktemp("reader") / "raw"), rows=20_000)
+    return raw, DataReader.load_data(raw)
+
+
+@pytest.mark.parametrize("title_type", [None, "movie", "tvSeries"])
+@pytest.mark.parametrize("top_level", [0.01, 1.0, 33.3, 100.0])
+def test_late_materialized_top_matches_get_top_records(loaded, tmp_path, top_level, title_type):
+    # Рейтинги синтетических данных - 91 значение, поэтому на пороге почти всегда ничьи
+    raw, data = loaded
+    processor = DataProcessor(str(tmp_path))
+    target = data if title_type is None else processor.filter_by_type(data, title_type)
+    expected = processor.get_top_records(target, top_level)
+    result = DataReader.load_top_records(raw, top_level, title_type)
+    assert result.equals(expected)
+    processor.save_to_csv(expected, "expected.csv")
+    processor.save_to_csv(result, "result.csv")
+    assert (tmp_path / "result.csv").read_bytes() == (tmp_path / "expected.csv").read_bytes()
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from imdb_processor.search import TitleSearchIndex
+
+
+def _titles():
+    return pd.DataFrame({
+        'tconst': ['tt01', 'tt02', 'tt03', 'tt04'],
+        'titleType': ['movie', 'movie', 'short', 'movie'],
+        'primaryTitle': ['The City', 'The Night', 'Night City', 'Love Night'],
+        'originalTitle': ['The City', 'Die Nacht', 'Night City', 'Love Night'],
+        'startYear': ['1990', '2000', '\\N', '2010'],
+        'averageRating': [7.0, 8.0, 6.0, 9.0],
+        'numVotes': [100, 200, 300, 400],
+    })
+
+
+def test_all_query_words_must_match(tmp_path):
+    index = TitleSearchIndex.build(_titles(), str(tmp_path / "index"))
+    assert index.search('the xqzvw').empty
+    assert index.search('night ci')['tconst'].tolist() == ['tt03']
+    assert set(index.search('the')['tconst']) == {'tt01', 'tt02'}
+    # Слово originalTitle тоже находит название
+    assert index.search('nacht')['tconst'].tolist() == ['tt02']
@@ -0,0 +1,32 @@
+import fcntl
+
+import numpy as np
+import pandas as pd
+
+from imdb_processor.shared import SharedFrame
+
+
+def test_cleanup_removes_only_unlocked_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(SharedFrame, 'SHM_FOLDER', str(tmp_path))
+    for token in ('live', 'dead'):
+        (tmp_path / f'imdb_{token}.lock').touch()
+        (tmp_path / f'imdb_{token}_0001').write_bytes(b'x')
+    # Старое имя по PID и чужие файлы не трогаются
+    (tmp_path / 'imdb_1_0001').write_bytes(b'x')
+    (tmp_path / 'other.lock').touch()
+    # Живой запуск держит блокировку своего файла метки (возможно, из другого пространства PID)
+    with open(tmp_path / 'imdb_live.lock', 'rb') as live:
+        fcntl.flock(live, fcntl.LOCK_EX)
+        SharedFrame.cleanup_stale()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'imdb_1_0001', 'imdb_live.lock', 'imdb_live_0001', 'other.lock']
+
+
+def test_segments_carry_locked_run_token():
+    data = pd.DataFrame({'tconst': ['tt1', 'tt2'], 'numVotes': np.array([5, 7])})
+    with SharedFrame.from_frame(data) as shared:
+        names = [name for spec in shared.descriptor['columns'] for name, _, _ in spec['buffers'].values()]
+        assert all(name.startswith(f'imdb_{SharedFrame._token}_') for name in names)
+        # Собственные сегменты переживают очистку
+        SharedFrame.cleanup_stale()
+        assert SharedFrame.attach(shared.descriptor).to_frame().equals(data)
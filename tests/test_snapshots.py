@@ -0,0 +1,95 @@
+import csv
+import random
+
+import numpy as np
+import pandas as pd
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.snapshots import SnapshotStore
+
+DATES = ("2024-01-01", "2024-02-01", "2024-03-01")
+
+
+def _lines(path):
+    with open(path, "rb") as f:
+        return f.readline(), f.readlines()
+
+
+def _write(path, header, lines):
+    with open(path, "wb") as f:
+        f.write(header + b"".join(lines))
+
+
+def _read(path):
+    return pd.read_csv(path, sep='\t', quoting=csv.QUOTE_NONE, low_memory=False)
+
+
+def _dumps(tmp_path):
+    # Три версии файлов: изменения рейтингов, удаления и новые титулы, затем другой порядок строк
+    rnd = random.Random(3)
+    first = make_synthetic_dumps(str(tmp_path / DATES[0]), rows=5_000)
+    folders = [first]
+    for snapshot_date in DATES[1:]:
+        folder = tmp_path / snapshot_date
+        folder.mkdir()
+        for group in SnapshotStore.GROUPS:
+            header, lines = _lines(f"{folders[-1]}/{group}.tsv")
+            lines = [line for line in lines if rnd.random() > 0.05]
+            if group == "title_ratings":
+                lines = [line if rnd.random() > 0.1 else
+                         line.split(b"\t")[0] + f"\t{rnd.randint(10, 100) / 10}\t{rnd.randint(0, 999)}\n".encode()
+                         for line in lines]
+            start = 10_000 * DATES.index(snapshot_date)
+            lines += [f"tt{start + i:07d}\tmovie\tNew {i}\tNew {i}\t0\t2024\t\\N\t90\tDrama\n".encode()
+                      if group == "title_basics" else f"tt{start + i:07d}\t7.5\t{i}\n".encode() for i in range(50)]
+            if snapshot_date == DATES[-1] and group == "title_basics":
+                rnd.shuffle(lines)
+            _write(folder / f"{group}.tsv", header, lines)
+        folders.append(str(folder))
+    return folders
+
+
+def test_restore_and_as_of_round_trip(tmp_path):
+    folders = _dumps(tmp_path)
+    store = SnapshotStore(str(tmp_path / "store"))
+    for folder, snapshot_date in zip(folders, DATES):
+        store.add(folder, snapshot_date)
+    assert store.dates() == list(DATES)
+
+    for folder, snapshot_date in zip(folders, DATES):
+        restored = tmp_path / f"restored_{snapshot_date}"
+        store.restore(snapshot_date, str(restored))
+        for group in SnapshotStore.GROUPS:
+            assert (restored / f"{group}.tsv").read_bytes() == open(f"{folder}/{group}.tsv", "rb").read()
+            assert store.as_of(snapshot_date, group).equals(_read(f"{folder}/{group}.tsv"))
+        # Дата между снимками - состояние последнего снимка до нее
+        assert store.as_of(snapshot_date[:8] + "15").equals(
+            _read(f"{folder}/title_ratings.tsv"))
+
+    ratings = _read(f"{folders[1]}/title_ratings.tsv")
+    subset = ratings['tconst'].iloc[::97].tolist() + ["tt9999999"]
+    expected = ratings[ratings['tconst'].isin(subset)].reset_index(drop=True)
+    assert store.as_of(DATES[1], tconsts=subset).equals(expected)
+
+
+def test_rating_changes_match_merge(tmp_path):
+    folders = _dumps(tmp_path)
+    store = SnapshotStore(str(tmp_path / "store"))
+    for folder, snapshot_date in zip(folders, DATES):
+        store.add(folder, snapshot_date)
+
+    for first, second in ((0, 1), (0, 2), (1, 2)):
+        old, new = _read(f"{folders[first]}/title_ratings.tsv"), _read(f"{folders[second]}/title_ratings.tsv")
+        expected = pd.merge(old, new, on='tconst', how='outer', suffixes=('_old', '_new'))
+        expected['ratingDelta'] = expected['averageRating_new'] - expected['averageRating_old']
+        expected['votesDelta'] = expected['numVotes_new'] - expected['numVotes_old']
+        changed = ((expected['ratingDelta'] != 0) | (expected['votesDelta'] != 0)
+                   | expected[['averageRating_old', 'averageRating_new']].isna().any(axis=1))
+        expected = expected[changed].sort_values('tconst', ignore_index=True)
+
+        result = store.rating_changes(DATES[first], DATES[second])
+        assert result['votesDelta'].dropna().is_monotonic_decreasing
+        assert result.sort_values('tconst', ignore_index=True).equals(expected)
+        # И удаленные, и новые титулы попадают в изменения с пропусками с другой стороны
+        assert result['numVotes_new'].isna().any() and result['numVotes_old'].isna().any()
+        assert np.array_equal(result['tconst'].isin(new['tconst']), result['numVotes_new'].notna())
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.processor import DataProcessor
+from imdb_processor.reader import DataReader
+from imdb_processor.sqlstore import SQLiteDataset
+
+
+def test_queries_match_pandas(tmp_path):
+    data = DataReader.load_data(make_synthetic_dumps(str(tmp_path / "raw"), rows=5_000))
+    data.loc[data.index[::40], 'averageRating'] = np.nan
+    dataset = SQLiteDataset.build(data, str(tmp_path / "imdb.sqlite"))
+    dataset.chunksize = 700
+    processor = DataProcessor(str(tmp_path))
+
+    assert dataset.read().equals(data.reset_index(drop=True))
+    assert len(dataset) == len(data)
+    assert list(dataset.unique('titleType')) == list(pd.unique(data['titleType']))
+    assert dataset.read(['tconst', 'numVotes']).equals(data[['tconst', 'numVotes']].reset_index(drop=True))
+    assert dataset.empty().dtypes.equals(data.dtypes)
+
+    movies = data[data['titleType'] == 'movie']
+    assert dataset.where('titleType', 'movie').read().equals(movies.reset_index(drop=True))
+    nineties = dataset.filter('"startYear" BETWEEN ? AND ?', '1990', '1999')
+    assert nineties.read().equals(data[data['startYear'].between('1990', '1999')].reset_index(drop=True))
+    for target, source in ((dataset, data), (dataset.where('titleType', 'movie'), movies)):
+        for top_level in (0.0, 1.0, 25.0, 100.0):
+            expected = processor.get_top_records(source, top_level).reset_index(drop=True)
+            assert target.top(top_level).read().equals(expected)
+
+
+def test_database_is_rebuilt_when_sources_change(tmp_path):
+    raw = make_synthetic_dumps(str(tmp_path / "raw"), rows=2_000)
+    first = SQLiteDataset.open_or_build(raw)
+    assert SQLiteDataset.open_or_build(raw).meta == first.meta
+    make_synthetic_dumps(raw, rows=3_000, seed=1)
+    rebuilt = SQLiteDataset.open_or_build(raw)
+    assert rebuilt.read().equals(DataReader.load_data(raw))
@@ -0,0 +1,58 @@
+import filecmp
+import time
+
+from imdb_processor import streaming
+from imdb_processor.bench import make_synthetic_dumps, serve_throttled
+from imdb_processor.files import FileManager
+from imdb_processor.reader import DataReader
+from imdb_processor.streaming import PipelinedLoader, load_data_pipelined
+
+NAMES = ("title_basics", "title_ratings")
+
+
+class _TimedLoader(PipelinedLoader):
+    # Время окончания загрузки каждого файла
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.downloaded = {}
+
+    def _download(self, url, compressed, stop):
+        super()._download(url, compressed, stop)
+        self.downloaded[url] = time.perf_counter()
+
+
+def test_pipelined_load_matches_sequential(tmp_path, monkeypatch):
+    source = make_synthetic_dumps(str(tmp_path / "source"), rows=20_000, compress=True)
+    # ~300 KB архива title_basics при 256 KB/s - загрузка идет больше секунды
+    server = serve_throttled(source, 256 * 1024)
+    urls = {name: f"http://127.0.0.1:{server.server_address[1]}/{name}.tsv.gz" for name in NAMES}
+    sequential_folder, pipelined_folder = tmp_path / "sequential", tmp_path / "pipelined"
+    sequential_folder.mkdir()
+    pipelined_folder.mkdir()
+    try:
+        for name, url in urls.items():
+            compressed = str(sequential_folder / f"{name}.tsv.gz")
+            FileManager.download_file(url, compressed)
+            FileManager.extract_gzip(compressed, str(sequential_folder / f"{name}.tsv"))
+        sequential = DataReader.load_data(str(sequential_folder))
+
+        # Время первой разобранной порции каждого файла
+        parsed = []
+        read_csv = streaming.pd.read_csv
+
+        def timed_read_csv(*args, **kwargs):
+            for chunk in read_csv(*args, **kwargs):
+                parsed.append(time.perf_counter())
+                yield chunk
+
+        monkeypatch.setattr(streaming.pd, "read_csv", timed_read_csv)
+        loader = _TimedLoader(block_size=16 * 1024, chunksize=2_000)
+        pipelined = load_data_pipelined(urls, str(pipelined_folder), loader)
+    finally:
+        server.shutdown()
+
+    assert sequential.equals(pipelined)
+    for name in NAMES:
+        assert filecmp.cmp(sequential_folder / f"{name}.tsv", pipelined_folder / f"{name}.tsv", shallow=False)
+    # Разбор начался, пока файлы еще загружались
+    assert min(parsed) < max(loader.downloaded.values())
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from imdb_processor.bench import make_synthetic_dumps
+from imdb_processor.engines import get_engine
+from imdb_processor.processor import DataProcessor
+from imdb_processor.reader import DataReader
+from imdb_processor.titles import ORIGINAL_DIFF, compact_titles, restore_titles
+
+
+def test_loaded_frames_keep_original_title(tmp_path):
+    raw = make_synthetic_dumps(str(tmp_path / "raw"), rows=5_000)
+    basics = pd.read_csv(f"{raw}/title_basics.tsv", sep='\t', quoting=3, dtype=str)
+    for data in (DataReader.load_data(raw), get_engine("pyarrow").load(raw)):
+        assert ORIGINAL_DIFF not in data.columns
+        expected = basics.set_index('tconst').loc[data['tconst'], 'originalTitle']
+        assert data['originalTitle'].astype(object).tolist() == expected.tolist()
+
+
+def test_compact_frame_writes_same_csv(tmp_path):
+    data = DataReader.load_data(make_synthetic_dumps(str(tmp_path / "raw"), rows=5_000))
+    compacted = compact_titles(data)
+    assert ORIGINAL_DIFF in compacted.columns
+    assert restore_titles(compacted).equals(data)
+    processor = DataProcessor(str(tmp_path))
+    processor.save_to_csv(data, "full.csv")
+    processor.save_to_csv(compacted, "compact.csv")
+    assert (tmp_path / "full.csv").read_bytes() == (tmp_path / "compact.csv").read_bytes()
+
+
+def test_compact_frame_results_keep_original_title(tmp_path):
+    data = DataReader.load_data(make_synthetic_dumps(str(tmp_path / "raw"), rows=5_000))
+    compacted = compact_titles(data)
+    processor = DataProcessor('.')
+    cases = [
+        lambda frame: processor.filter_by_type(frame, 'movie'),
+        lambda frame: processor.get_top_records(frame, 10),
+        lambda frame: processor.get_top_records(frame, 10, 'weightedRating'),
+        lambda frame: processor.filter_by_genre(frame, 'Drama'),
+        lambda frame: processor.filter_by_years(frame, 1990, 1999),
+        lambda frame: processor.get_top_by_genre(frame, 5, ['Comedy']),
+        lambda frame: processor.get_grouped_top(frame, 'titleType', top_n=5),
+    ]
+    for case in cases:
+        result = case(compacted)
+        assert ORIGINAL_DIFF not in result.columns
+        assert result.equals(case(data))
+    # Для записи через DataProcessor компактный вид можно сохранить
+    assert ORIGINAL_DIFF in processor.filter_by_type(compacted, 'movie', compact=True).columns
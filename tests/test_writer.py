@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from imdb_processor.processor import DataProcessor
+from imdb_processor.titles import compact_titles
+from imdb_processor.writer import AsyncWriter, ParallelCSVWriter
+
+
+def _frame(rows=1000, seed=3):
+    rng = np.random.default_rng(seed)
+    titles = np.array(['Plain', 'With, comma', 'With "quotes"', 'Line\nbreak', 'Юникод', ''], dtype=object)
+    primary = titles[rng.integers(0, len(titles), rows)]
+    original = np.where(rng.random(rows) < 0.3, 'Original ' + primary.astype(str), primary).astype(object)
+    primary[rng.random(rows) < 0.05] = None
+    original[pd.isna(primary)] = None
+    ratings = np.round(rng.uniform(1, 10, rows), 1)
+    ratings[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        'tconst': [f'tt{i:07d}' for i in range(rows)],
+        'titleType': np.array(['movie', 'short', 'tvSeries'], dtype=object)[rng.integers(0, 3, rows)],
+        'primaryTitle': primary,
+        'originalTitle': original,
+        'averageRating': ratings,
+        'weightedRating': rng.normal(6, 2, rows) / 3,
+        'numVotes': rng.integers(0, 10**6, rows),
+    })
+
+
+def _reference(tmp_path, data, name):
+    DataProcessor(str(tmp_path)).save_to_csv(data, name)
+    return (tmp_path / name).read_bytes()
+
+
+def test_parallel_writer_matches_to_csv(tmp_path, capsys):
+    writer = ParallelCSVWriter(workers=2, chunk_rows=97, min_rows=1)
+    for name, data in (('plain.csv', _frame()), ('compact.csv', compact_titles(_frame()))):
+        assert writer.accepts(data)
+        writer.write(data, str(tmp_path / f'parallel_{name}'))
+        assert (tmp_path / f'parallel_{name}').read_bytes() == _reference(tmp_path, data, name)
+    # Запись шла через пул процессов, а не через запасной to_csv
+    assert 'не удалась' not in capsys.readouterr().out
+
+
+def test_parallel_writer_falls_back_on_mixed_column(tmp_path):
+    data = _frame(rows=300)
+    # Уникальные значения - колонка передается как строки, а не коды категорий
+    data['primaryTitle'] = pd.Series([f'Title, {i}' for i in range(len(data))], dtype=object)
+    data.loc[::7, 'primaryTitle'] = 1.5
+    ParallelCSVWriter(workers=2, chunk_rows=50, min_rows=1).write(data, str(tmp_path / 'parallel.csv'))
+    assert (tmp_path / 'parallel.csv').read_bytes() == _reference(tmp_path, data, 'mixed.csv')
+
+
+def test_deferred_messages_wait_for_print_messages(tmp_path, capsys):
+    with AsyncWriter(deferred=True) as writer:
+        future = writer.submit(str(tmp_path / 'a.csv'), lambda path: open(path, 'w').close(), 'готово: a.csv')
+        future.result()
+        assert capsys.readouterr().out == ''
+        writer.print_messages()
+        assert capsys.readouterr().out == 'готово: a.csv\n'